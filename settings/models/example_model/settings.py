@@ -44,6 +44,25 @@ PCA_VARIANCE = 0.95
 # "compressed" はPCAで次元削減された軽量形式、"full" は元の特徴量をそのまま保存。
 SAVE_FORMAT = "compressed"
 
+# 異常スコアの計算方式（"mean" または "knn"、省略時は "mean"）
+# "mean" はメモリバンクの平均との距離、"knn" はメモリバンク内の最近傍パッチとの距離（PatchCore 本来の方式）。
+# "knn" は微小な異常を捉えやすいが計算量が増える（faiss をインストールすると高速化）。
+# "knn" の場合、メモリバンクは全パッチから貪欲法で選んだコアセット（約1%）になる。
+# 変更した場合はモデルの再作成が必要（Zスコアの統計量が計算方式に依存するため）。
+SCORING_METHOD = "mean"
+
+# スコアマップを画像サイズに拡大する補間方式（"bicubic" または "bilinear"、省略時は "bicubic"）
+# "bilinear" の方が高速で、滑らかなスコアマップでは結果の差はほぼない。
+# 変更した場合はモデルの再作成が必要（Zスコアの統計量が補間方式に依存するため）。
+# 既存のモデルは "bicubic" で作成されているため、ここでは既定値のままにしている。
+# SCORE_UPSAMPLE_MODE = "bilinear"
+
+# 特徴抽出モデルを int8 に量子化するか（True / False、省略時は False）
+# True の場合、学習画像で量子化の範囲を調整した int8 モデルを作成し、学習・推論ともに CPU で実行する
+# （USE_GPU の設定より優先）。CPU のみの環境で推論が 2〜3 倍程度速くなる。
+# 変更した場合はモデルの再作成が必要（メモリバンクと Zスコアの統計量を量子化モデルで作り直すため）。
+QUANTIZE_INT8 = False
+
 # -----実行環境設定（環境変数でオーバーライド可能）-----
 # これらの設定は .env ファイルで上書きできます
 # 以下はデフォルト値で、環境変数が設定されている場合はそちらが優先されます
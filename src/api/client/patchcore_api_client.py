@@ -4,18 +4,70 @@ PatchCore API クライアントモジュール
 PatchCore APIサーバーとHTTP通信するためのクライアントクラスを提供します。
 """
 
+import base64
+import json
+import socket
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # 任意依存: あれば JSON デコードを高速化
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 from src.api.utils.api_util import (
     ApiUrlBuilder,
-    convert_image_to_png_bytes,
     convert_png_bytes_to_ndarray,
+    encode_image_for_upload,
+    iter_multipart_file,
+)
+
+# 冪等な GET のみ、プロキシ/ゲートウェイ由来の一時エラーで再試行する
+# （503 は「モデル未ロード」を意味するため対象外。接続エラーは wait_for_server に任せる）
+RETRY_POLICY = Retry(
+    total=3,
+    connect=0,
+    backoff_factor=0.3,
+    status_forcelist=(502, 504),
+    allowed_methods=frozenset(["GET"]),
+    raise_on_status=False,
 )
 
+# 接続に設定するソケットオプション（Nagle 無効化 + TCP keep-alive）
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+# 接続プールサイズ（並列リクエスト数以上にしておく）
+POOL_SIZE = 32
+
+# fetch_image のクライアント側キャッシュ上限（バイト）
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# fetch_image でレスポンスを読み込む単位（バイト）
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+# wait_for_server のポーリング設定（秒）
+WAIT_INITIAL_DELAY = 0.05
+WAIT_MAX_DELAY = 1.0
+WAIT_BACKOFF_FACTOR = 1.5
+WAIT_PROBE_TIMEOUT = 0.3
+
+
+class _LowLatencyAdapter(HTTPAdapter):
+    """SOCKET_OPTIONS を接続プールに設定する HTTPAdapter"""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
 
 class PatchCoreApiClient:
     """
@@ -25,9 +77,15 @@ class PatchCoreApiClient:
         base_url: APIサーバーのベースURL
         session: HTTPセッション（接続プーリング用）
         timeout: リクエストのタイムアウト時間（秒）
+        image_cache_max_bytes: fetch_image のキャッシュ上限（バイト、0 で無効）
     """
 
-    def __init__(self, base_url: Optional[str] = None, timeout: int = 5) -> None:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: int = 5,
+        image_cache_max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+    ) -> None:
         if base_url is None:
             from src.config import env_loader
             base_url = f"http://{env_loader.API_CLIENT_HOST}:{env_loader.API_CLIENT_PORT}"
@@ -35,20 +93,84 @@ class PatchCoreApiClient:
         self.base_url = base_url.rstrip("/")
         self.url_builder = ApiUrlBuilder(self.base_url)
         self.session = requests.Session()
+        # デフォルト（10 接続）だと並列リクエスト時に接続が破棄されるため拡張する
+        adapter = _LowLatencyAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            pool_block=False,
+            max_retries=RETRY_POLICY,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        # サーバーの GZip 圧縮を受け取る（requests が透過的に展開する）
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
         self.timeout = timeout
 
+        # 取得済み画像の LRU キャッシュ（画像 ID はサーバー側で一意なので内容は不変）
+        self.image_cache_max_bytes = image_cache_max_bytes
+        self._image_cache: OrderedDict[Tuple[str, str, str, int], np.ndarray] = (
+            OrderedDict()
+        )
+        self._image_cache_bytes = 0
+        self._image_cache_lock = threading.Lock()
+
     def wait_for_server(self, max_wait: int = 30) -> bool:
-        """サーバーの起動を待機する"""
-        url = self.url_builder.make("/system_info")
-        for _ in range(max_wait * 2):
+        """
+        サーバーの起動を待機する
+
+        短い間隔から指数バックオフ（上限 WAIT_MAX_DELAY 秒）でポーリングし、
+        起動直後のサーバーには素早く応答しつつ、待機時間は max_wait 秒で打ち切ります。
+        プローブは同じセッションで行うため、確立した keep-alive 接続はプールに残り、
+        最初の推論リクエストで再利用されます。
+        """
+        url = self.url_builder.make("/health")
+        delay = WAIT_INITIAL_DELAY
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline:
             try:
-                response = self.session.get(url, timeout=0.5)
+                response = self.session.get(url, timeout=WAIT_PROBE_TIMEOUT)
                 if response.status_code == 200:
                     return True
             except requests.exceptions.RequestException:
-                time.sleep(0.5)
+                pass
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * WAIT_BACKOFF_FACTOR, WAIT_MAX_DELAY)
         return False
 
+    def _request_json(
+        self,
+        method: str,
+        endpoint: str,
+        label: str,
+        errors_as_dict: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        リクエストを送信して JSON を返す共通処理
+
+        Args:
+            method: HTTP メソッド
+            endpoint: エンドポイント
+            label: エラー出力時の呼び出し元名
+            errors_as_dict: True の場合、エラー時に {"error": メッセージ} を返す（False なら None）
+
+        Returns:
+            レスポンスの JSON。エラー時は None または {"error": ...}
+        """
+        url = self.url_builder.make(endpoint)
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            response.raise_for_status()
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            if errors_as_dict:
+                return {"error": str(e)}
+            print(f"{label}: {e}")
+            return None
+
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         url = self.url_builder.make(endpoint)
         return self.session.get(url, timeout=self.timeout, **kwargs)
@@ -65,108 +187,142 @@ class PatchCoreApiClient:
 
     def list_models(self) -> Optional[Dict[str, Any]]:
         """全モデルの一覧とロード状態を取得する"""
-        try:
-            response = self.get("/models")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"list_models: {e}")
-            return None
+        return self._request_json(  # type: ignore[no-any-return]
+            "GET", "/models", "list_models"
+        )
 
     def load_model(self, model_name: str) -> Optional[Dict[str, Any]]:
         """モデルをメモリにロードする"""
-        try:
-            response = self.post(f"/models/{model_name}/load")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"load_model: {e}")
-            return None
+        return self._request_json(  # type: ignore[no-any-return]
+            "POST", f"/models/{model_name}/load", "load_model"
+        )
 
     def unload_model(self, model_name: str) -> Optional[Dict[str, Any]]:
         """モデルをメモリからアンロードする"""
-        try:
-            response = self.delete(f"/models/{model_name}/unload")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"unload_model: {e}")
-            return None
+        self._drop_cached_images(model_name)
+        return self._request_json(  # type: ignore[no-any-return]
+            "DELETE", f"/models/{model_name}/unload", "unload_model"
+        )
 
     def model_status(self, model_name: str) -> Optional[Dict[str, Any]]:
         """特定モデルのステータスを取得する"""
-        try:
-            response = self.get(f"/models/{model_name}/status")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"model_status: {e}")
-            return None
+        return self._request_json(  # type: ignore[no-any-return]
+            "GET", f"/models/{model_name}/status", "model_status"
+        )
 
     # ===== 推論（ジョブキュー） =====
 
     def submit_predict(
         self,
         model_name: str,
-        image: np.ndarray,
+        image: Union[np.ndarray, bytes],
         detail_level: str = "basic",
+        wire_format: str = "png",
     ) -> Optional[str]:
         """
         推論ジョブをキューに投入し job_id を返す。
 
         結果取得は `poll_job()` でポーリングしてください。
+
+        Args:
+            image: 入力画像（BGR NumPy配列）、または画像ファイルのバイト列（再エンコードせず送信）
+            wire_format: 転送フォーマット。"png"（デフォルト）/ "webp"（ロスレス、エンコード高速）/
+                "raw"（無圧縮、LAN 向け。エンコード・デコード不要だが転送量増）。
+                image がバイト列の場合は無視される
         """
-        image_bytes = convert_image_to_png_bytes(image)
-        files = {"file": ("image.png", image_bytes, "image/png")}
-        params = {"detail_level": detail_level}
-        try:
-            response = self.post(
-                f"/models/{model_name}/predict", files=files, params=params
-            )
-            response.raise_for_status()
-            return response.json().get("job_id")  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"submit_predict: {e}")
-            return None
+        # エンコード結果をコピーせずにそのままストリーム送信する
+        body, content_type = iter_multipart_file(
+            "file", *encode_image_for_upload(image, wire_format)
+        )
+        job = self._request_json(
+            "POST",
+            f"/models/{model_name}/predict",
+            "submit_predict",
+            data=body,
+            headers={"Content-Type": content_type},
+            params={"detail_level": detail_level},
+        )
+        return job.get("job_id") if job is not None else None
+
+    def submit_predict_batch(
+        self,
+        model_name: str,
+        images: List[Union[np.ndarray, bytes]],
+        detail_level: str = "basic",
+        wire_format: str = "png",
+    ) -> Optional[List[str]]:
+        """
+        複数画像の推論ジョブを 1 回の POST でまとめて投入し job_id のリストを返す。
 
-    def poll_job(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """ジョブの状態と結果を取得する"""
-        try:
-            response = self.get(f"/jobs/{job_id}")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"poll_job: {e}")
+        job_id は images と同じ順序で返ります。
+        """
+        files = [("files", encode_image_for_upload(im, wire_format)) for im in images]
+        jobs = self._request_json(
+            "POST",
+            f"/models/{model_name}/predict_batch",
+            "submit_predict_batch",
+            files=files,
+            params={"detail_level": detail_level},
+        )
+        return jobs.get("job_ids") if jobs is not None else None
+
+    def poll_job(
+        self, job_id: str, return_images: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ジョブの状態と結果を取得する
+
+        return_images=True の場合、完了ジョブの result["images"] に
+        {"original": ndarray, "overlay": ndarray} を格納して返します。
+        """
+        params = {"return_images": "true"} if return_images else None
+        job = self._request_json("GET", f"/jobs/{job_id}", "poll_job", params=params)
+        if job is None:
             return None
 
+        result = job.get("result")
+        if return_images and result and "images" in result:
+            result["images"] = {
+                key: (
+                    convert_png_bytes_to_ndarray(base64.b64decode(b64)) if b64 else None
+                )
+                for key, b64 in result["images"].items()
+            }
+        return job  # type: ignore[no-any-return]
+
     def predict(
         self,
         model_name: str,
-        image: np.ndarray,
+        image: Union[np.ndarray, bytes],
         detail_level: str = "basic",
         poll_interval: float = 0.2,
         poll_timeout: float = 60.0,
+        wire_format: str = "png",
+        return_images: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """
         推論を実行し結果が出るまでポーリングして返す（同期ラッパー）。
 
         Args:
             model_name: 推論に使うモデル名
-            image: 入力画像（BGR NumPy配列）
+            image: 入力画像（BGR NumPy配列、または画像ファイルのバイト列。バイト列は再エンコードせず送信）
             detail_level: "basic" または "full"
             poll_interval: ポーリング間隔（秒）
             poll_timeout: タイムアウト（秒）
+            wire_format: 転送フォーマット（"png" / "webp" / "raw"）
+            return_images: True の場合、結果画像を result["images"] に同梱して取得する
+                （fetch_image() の往復が不要になる）
 
         Returns:
             推論結果の辞書。エラー時は None
         """
-        job_id = self.submit_predict(model_name, image, detail_level)
+        job_id = self.submit_predict(model_name, image, detail_level, wire_format)
         if job_id is None:
             return None
 
         deadline = time.monotonic() + poll_timeout
         while time.monotonic() < deadline:
-            job = self.poll_job(job_id)
+            job = self.poll_job(job_id, return_images)
             if job is None:
                 return None
             status = job.get("status")
@@ -180,6 +336,60 @@ class PatchCoreApiClient:
         print(f"predict timeout after {poll_timeout}s")
         return None
 
+    def predict_batch(
+        self,
+        model_name: str,
+        images: List[Union[np.ndarray, bytes]],
+        detail_level: str = "basic",
+        poll_interval: float = 0.2,
+        poll_timeout: float = 60.0,
+        wire_format: str = "png",
+        return_images: bool = False,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        複数画像をまとめて推論し、全ジョブの結果が出るまでポーリングして返す。
+
+        Args:
+            model_name: 推論に使うモデル名
+            images: 入力画像（BGR NumPy配列、または画像ファイルのバイト列）のリスト
+            detail_level: "basic" または "full"
+            poll_interval: ポーリング間隔（秒）
+            poll_timeout: タイムアウト（秒）
+            wire_format: 転送フォーマット（"png" / "webp" / "raw"）
+            return_images: True の場合、結果画像を result["images"] に同梱して取得する
+
+        Returns:
+            images と同じ順序の推論結果リスト。失敗・タイムアウトした要素は None
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        job_ids = self.submit_predict_batch(
+            model_name, images, detail_level, wire_format
+        )
+        if job_ids is None:
+            return results
+
+        pending = dict(enumerate(job_ids))
+        deadline = time.monotonic() + poll_timeout
+        while pending and time.monotonic() < deadline:
+            for idx, job_id in list(pending.items()):
+                job = self.poll_job(job_id, return_images)
+                if job is None:
+                    del pending[idx]
+                    continue
+                status = job.get("status")
+                if status == "completed":
+                    results[idx] = job.get("result")
+                    del pending[idx]
+                elif status == "failed":
+                    print(f"predict_batch failed: {job.get('error')}")
+                    del pending[idx]
+            if pending:
+                time.sleep(poll_interval)
+
+        if pending:
+            print(f"predict_batch timeout after {poll_timeout}s ({len(pending)} jobs)")
+        return results
+
     def list_jobs(
         self,
         model_name: Optional[str] = None,
@@ -192,13 +402,8 @@ class PatchCoreApiClient:
             params["model_name"] = model_name
         if status:
             params["status"] = status
-        try:
-            response = self.get("/jobs", params=params)
-            response.raise_for_status()
-            return response.json().get("jobs")  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"list_jobs: {e}")
-            return None
+        jobs = self._request_json("GET", "/jobs", "list_jobs", params=params)
+        return jobs.get("jobs") if jobs is not None else None
 
     # ===== 画像キャッシュ =====
 
@@ -216,51 +421,96 @@ class PatchCoreApiClient:
             params["prefix"] = prefix
         if label:
             params["label"] = label
-        try:
-            response = self.get(f"/models/{model_name}/images", params=params)
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except requests.exceptions.RequestException as e:
-            print(f"fetch_image_list: {e}")
-            return None
+        return self._request_json(  # type: ignore[no-any-return]
+            "GET", f"/models/{model_name}/images", "fetch_image_list", params=params
+        )
+
+    def fetch_image(
+        self,
+        model_name: str,
+        image_id: str,
+        fmt: str = "png",
+        quality: int = 90,
+    ) -> Optional[np.ndarray]:
+        """
+        キャッシュされた画像を取得する
+
+        一度取得した画像はクライアント側の LRU キャッシュから返します（呼び出し側で
+        書き換えても影響しないようコピーを返す）。
+
+        Args:
+            model_name: モデル名
+            image_id: 画像ID
+            fmt: 転送フォーマット（"png" / "webp" / "jpeg"）。表示用途なら非可逆の方が高速
+            quality: 非可逆フォーマットの品質（1〜100）
+        """
+        key = (model_name, image_id, fmt, quality)
+        with self._image_cache_lock:
+            cached = self._image_cache.get(key)
+            if cached is not None:
+                self._image_cache.move_to_end(key)
+                return cached.copy()
 
-    def fetch_image(self, model_name: str, image_id: str) -> Optional[np.ndarray]:
-        """キャッシュされた画像を取得する"""
         try:
-            response = self.get(f"/models/{model_name}/images/{image_id}")
-            response.raise_for_status()
-            return convert_png_bytes_to_ndarray(response.content)
+            # レスポンスを bytearray に直接読み込み、bytes への結合コピーを省く
+            params = None if fmt == "png" else {"fmt": fmt, "quality": quality}
+            with self.get(
+                f"/models/{model_name}/images/{image_id}", params=params, stream=True
+            ) as response:
+                response.raise_for_status()
+                buf = bytearray()
+                for chunk in response.iter_content(IMAGE_CHUNK_SIZE):
+                    buf += chunk
+            image = convert_png_bytes_to_ndarray(buf)
         except requests.exceptions.RequestException as e:
             print(f"fetch_image: {e}")
             return None
 
+        self._cache_image(key, image.copy())
+        return image
+
+    def _cache_image(self, key: Tuple[str, str, str, int], image: np.ndarray) -> None:
+        """画像をキャッシュに追加し、上限を超えた分を古い順に削除する"""
+        if image.nbytes > self.image_cache_max_bytes:
+            return
+        with self._image_cache_lock:
+            old = self._image_cache.pop(key, None)
+            if old is not None:
+                self._image_cache_bytes -= old.nbytes
+            self._image_cache[key] = image
+            self._image_cache_bytes += image.nbytes
+            while self._image_cache_bytes > self.image_cache_max_bytes:
+                _, evicted = self._image_cache.popitem(last=False)
+                self._image_cache_bytes -= evicted.nbytes
+
+    def _drop_cached_images(self, model_name: str) -> None:
+        """指定モデルの画像をクライアント側キャッシュから削除する"""
+        with self._image_cache_lock:
+            for key in [k for k in self._image_cache if k[0] == model_name]:
+                self._image_cache_bytes -= self._image_cache.pop(key).nbytes
+
     def clear_image_cache(self, model_name: str, execute: bool = False) -> Dict[str, Any]:
-        """モデルの画像キャッシュをクリアする"""
-        try:
-            response = self.post(
-                f"/models/{model_name}/images/clear", params={"execute": execute}
-            )
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except Exception as e:
-            return {"error": str(e)}
+        """モデルの画像キャッシュをクリアする（execute=True の場合はクライアント側キャッシュも破棄）"""
+        if execute:
+            self._drop_cached_images(model_name)
+        return self._request_json(  # type: ignore[no-any-return]
+            "POST",
+            f"/models/{model_name}/images/clear",
+            "clear_image_cache",
+            errors_as_dict=True,
+            params={"execute": execute},
+        )
 
     # ===== システム情報 =====
 
     def fetch_gpu_info(self) -> Dict[str, Any]:
         """GPU 情報を取得する"""
-        try:
-            response = self.get("/gpu_info")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except Exception as e:
-            return {"error": str(e)}
+        return self._request_json(  # type: ignore[no-any-return]
+            "GET", "/gpu_info", "fetch_gpu_info", errors_as_dict=True
+        )
 
     def fetch_system_info(self) -> Dict[str, Any]:
         """システム情報を取得する"""
-        try:
-            response = self.get("/system_info")
-            response.raise_for_status()
-            return response.json()  # type: ignore[no-any-return]
-        except Exception as e:
-            return {"error": str(e)}
+        return self._request_json(  # type: ignore[no-any-return]
+            "GET", "/system_info", "fetch_system_info", errors_as_dict=True
+        )
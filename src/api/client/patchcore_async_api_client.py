@@ -0,0 +1,123 @@
+"""
+PatchCore 非同期 API クライアントモジュール
+
+asyncio から PatchCore API を呼び出すためのクライアントクラスを提供します。
+HTTP 通信は PatchCoreApiClient（requests.Session）をスレッドで実行するため、
+追加の依存パッケージは不要です。
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.api.client.patchcore_api_client import PatchCoreApiClient
+
+# 同時に実行する HTTP リクエストの上限（セッションの接続プールサイズ以下にする）
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class PatchCoreAsyncApiClient:
+    """
+    PatchCore 非同期 API クライアント
+
+    推論と結果画像の取得を並行に発行し、I/O 待ちを重ねて処理時間を短縮します。
+
+    Attributes:
+        client: 内部で使用する同期クライアント
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: int = 5,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self.client = PatchCoreApiClient(base_url=base_url, timeout=timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self) -> "PatchCoreAsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """HTTP セッションを閉じる"""
+        self.client.session.close()
+
+    async def _call(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def wait_for_server(self, max_wait: int = 30) -> bool:
+        """サーバーの起動を待機する"""
+        return await asyncio.to_thread(  # type: ignore[no-any-return]
+            self.client.wait_for_server, max_wait
+        )
+
+    async def predict(
+        self,
+        model_name: str,
+        image: np.ndarray,
+        detail_level: str = "basic",
+        **kwargs: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """推論を実行し結果が出るまで待って返す（PatchCoreApiClient.predict と同じ引数）"""
+        return await self._call(  # type: ignore[no-any-return]
+            self.client.predict, model_name, image, detail_level, **kwargs
+        )
+
+    async def fetch_image(
+        self, model_name: str, image_id: str, **kwargs: Any
+    ) -> Optional[np.ndarray]:
+        """キャッシュされた画像を取得する（PatchCoreApiClient.fetch_image と同じ引数）"""
+        return await self._call(  # type: ignore[no-any-return]
+            self.client.fetch_image, model_name, image_id, **kwargs
+        )
+
+    async def predict_and_fetch(
+        self,
+        model_name: str,
+        image: np.ndarray,
+        detail_level: str = "basic",
+        **kwargs: Any,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        推論を実行し、オーバーレイ画像と元画像を並行に取得する
+
+        Returns:
+            (推論結果, オーバーレイ画像, 元画像)。推論失敗時は (None, None, None)
+        """
+        result = await self.predict(model_name, image, detail_level, **kwargs)
+        if result is None:
+            return None, None, None
+        ovr, org = await asyncio.gather(
+            self.fetch_image(model_name, result["image_id"]["overlay"]),
+            self.fetch_image(model_name, result["image_id"]["original"]),
+        )
+        return result, ovr, org
+
+    async def predict_many(
+        self,
+        model_name: str,
+        images: List[np.ndarray],
+        detail_level: str = "basic",
+        **kwargs: Any,
+    ) -> List[
+        Tuple[Optional[Dict[str, Any]], Optional[np.ndarray], Optional[np.ndarray]]
+    ]:
+        """
+        複数画像の推論と結果画像の取得をまとめて並行実行する
+
+        Returns:
+            images と同じ順序の (推論結果, オーバーレイ画像, 元画像) のリスト
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.predict_and_fetch(model_name, img, detail_level, **kwargs)
+                    for img in images
+                )
+            )
+        )
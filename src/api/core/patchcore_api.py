@@ -8,15 +8,23 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
 from src.api.routers import images, jobs, models, system
+from src.api.services.encoded_image_cache import EncodedImageCache
 from src.api.services.job_queue import JobQueue
 from src.api.services.model_registry import ModelRegistry
+from src.api.utils.responses import ORJSONResponse
 from src.config import env_loader
 from src.utils.logger import setup_logger
 
 logger = setup_logger("patchcore_api", log_dir=env_loader.LOG_DIR + "/api")
 
+# これより小さいレスポンスは圧縮しない（バイト）
+GZIP_MINIMUM_SIZE = 1024
+# 圧縮レベル（1〜9）。推論のレイテンシを優先して中程度にする
+GZIP_COMPRESS_LEVEL = 5
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -34,6 +42,7 @@ async def lifespan(app: FastAPI):
 
     app.state.registry = registry
     app.state.queue = queue
+    app.state.image_cache = EncodedImageCache()
 
     yield
 
@@ -46,6 +55,12 @@ app = FastAPI(
     title=env_loader.APP_NAME,
     version=env_loader.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Accept-Encoding: gzip を送るクライアントには JSON（base64 画像同梱時など）を圧縮して返す
+app.add_middleware(
+    GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL
 )
 
 app.include_router(models.router)
@@ -55,6 +70,13 @@ app.include_router(system.router)
 
 
 if __name__ == "__main__":
+    # ジョブキュー・画像キャッシュはプロセス内に保持するため、ワーカーは 1 固定
+    # （複数プロセスにすると投入したワーカー以外で job_id を参照できない）
+    if env_loader.API_WORKERS > 1:
+        logger.warning(
+            f"API_WORKERS={env_loader.API_WORKERS} is ignored: "
+            "job queue and image caches are per-process, running with 1 worker"
+        )
     uvicorn.run(
         "src.api.core.patchcore_api:app",
         host=env_loader.API_SERVER_HOST,
@@ -0,0 +1,23 @@
+"""
+ルーター共通ヘルパー
+
+lifespan で app.state に登録した共有サービスの取得処理をまとめます。
+"""
+
+from fastapi import Request
+
+from src.api.services.encoded_image_cache import EncodedImageCache
+from src.api.services.job_queue import JobQueue
+from src.api.services.model_registry import ModelRegistry
+
+
+def get_registry(request: Request) -> ModelRegistry:
+    return request.app.state.registry  # type: ignore[no-any-return]
+
+
+def get_queue(request: Request) -> JobQueue:
+    return request.app.state.queue  # type: ignore[no-any-return]
+
+
+def get_image_cache(request: Request) -> EncodedImageCache:
+    return request.app.state.image_cache  # type: ignore[no-any-return]
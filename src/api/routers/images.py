@@ -4,28 +4,57 @@
 モデルスコープでの推論結果画像のキャッシュ一覧・取得・クリアを提供します。
 """
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import cv2
 from fastapi import APIRouter, Query, Request
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 
+from src.api.routers.dependencies import get_image_cache, get_registry
 from src.api.services.model_registry import ModelRegistry
+from src.api.utils.responses import ORJSONResponse
 
 router = APIRouter(prefix="/models", tags=["images"])
 
-
-def _get_registry(request: Request) -> ModelRegistry:
-    return request.app.state.registry  # type: ignore[no-any-return]
+# 返却フォーマット → (拡張子, media_type)
+_IMAGE_FORMATS: Dict[str, Tuple[str, str]] = {
+    "png": (".png", "image/png"),
+    "webp": (".webp", "image/webp"),
+    "jpeg": (".jpg", "image/jpeg"),
+}
+# 非可逆フォーマットの品質パラメータ
+_QUALITY_FLAGS: Dict[str, int] = {
+    "webp": cv2.IMWRITE_WEBP_QUALITY,
+    "jpeg": cv2.IMWRITE_JPEG_QUALITY,
+}
+# 画像IDは uuid4 の全桁を含めて一意に採番され（再利用されない）、内容は生成後に変化しないため、
+# クライアント側で長期キャッシュさせる（採番方式を変える場合は max-age を短くすること）
+_IMAGE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _image_etag(model_name: str, image_id: str, fmt: str, quality: int) -> str:
+    """モデル・画像ID・フォーマットごとの強い ETag（png では quality を含めない）"""
+    tag = f"{model_name}-{image_id}-{fmt}"
+    if fmt in _QUALITY_FLAGS:
+        tag = f"{tag}-{quality}"
+    return f'"{tag}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダーが ETag に一致するか（弱い比較）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in if_none_match.split(","))
 
 
 def _get_loaded_engine(registry: ModelRegistry, model_name: str):
-    """ロード済みエンジンを取得。未ロードなら適切なエラーを raise する"""
+    """ロード済みエンジンを取得。未登録・未ロードなら None を返す"""
     try:
         return registry.get_engine(model_name)
-    except KeyError:
-        return None
-    except RuntimeError:
+    except (KeyError, RuntimeError):
         return None
 
 
@@ -37,47 +66,69 @@ async def list_images(
     prefix: Optional[str] = Query(None, pattern="^(org|ovr)$"),
     label: Optional[str] = Query(None, pattern="^(OK|NG)$"),
     reverse_list: bool = Query(False),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """モデルのキャッシュ画像 ID 一覧を返す"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     engine = _get_loaded_engine(registry, model_name)
 
     if engine is None:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={"error": f"Model '{model_name}' is not loaded"},
         )
 
-    image_list = engine.get_store_image_list()
-
-    if prefix:
-        image_list = [i for i in image_list if i.startswith(prefix)]
-    if label:
-        image_list = [i for i in image_list if label in i]
-    if reverse_list:
-        image_list.reverse()
-
-    return JSONResponse(content={"image_list": image_list[:limit]})
+    image_list = engine.get_store_image_list(
+        prefix=prefix, label=label, limit=limit, oldest_first=reverse_list
+    )
+    return ORJSONResponse(content={"image_list": image_list})
 
 
 @router.get("/{model_name}/images/{image_id}")
-async def get_image(model_name: str, image_id: str, request: Request) -> Response:
-    """キャッシュされた画像を PNG で返す"""
-    registry = _get_registry(request)
+async def get_image(
+    model_name: str,
+    image_id: str,
+    request: Request,
+    fmt: str = Query("png", pattern="^(png|webp|jpeg)$"),
+    quality: int = Query(90, ge=1, le=100),
+) -> Response:
+    """
+    キャッシュされた画像を返す（エンコード結果は LRU キャッシュで再利用）
+
+    fmt=webp / jpeg を指定すると非可逆圧縮で転送量とエンコード時間を削減できます
+    （quality は非可逆フォーマットのみ有効）。デフォルトは可逆の PNG。
+    ETag / Cache-Control を付与し、If-None-Match が一致すれば 304 を返します
+    （モデルがロードされ、画像がキャッシュに残っている場合のみ）。
+    """
+    registry = get_registry(request)
     engine = _get_loaded_engine(registry, model_name)
 
     if engine is None:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={"error": f"Model '{model_name}' is not loaded"},
         )
 
     image = engine.get_image_by_id(image_id)
     if image is None:
-        return JSONResponse(status_code=404, content={"error": "Image not found"})
-
-    _, buffer = cv2.imencode(".png", image)
-    return Response(content=buffer.tobytes(), media_type="image/png")
+        return ORJSONResponse(status_code=404, content={"error": "Image not found"})
+
+    etag = _image_etag(model_name, image_id, fmt, quality)
+    cache_headers = {"ETag": etag, "Cache-Control": _IMAGE_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    ext, media_type = _IMAGE_FORMATS[fmt]
+    params: Tuple[int, ...] = (
+        (_QUALITY_FLAGS[fmt], quality) if fmt in _QUALITY_FLAGS else ()
+    )
+    cache = get_image_cache(request)
+    content = cache.get(cache.make_key(model_name, image_id, ext, params))
+    if content is None:
+        # 未キャッシュ時のエンコードはスレッドで実行し、イベントループを塞がない
+        content = await run_in_threadpool(
+            cache.encode, model_name, image_id, image, ext, params
+        )
+    return Response(content=content, media_type=media_type, headers=cache_headers)
 
 
 @router.post("/{model_name}/images/clear")
@@ -85,18 +136,19 @@ async def clear_images(
     model_name: str,
     request: Request,
     execute: bool = Query(False),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """モデルの画像キャッシュをクリアする（execute=true 必須）"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     engine = _get_loaded_engine(registry, model_name)
 
     if engine is None:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={"error": f"Model '{model_name}' is not loaded"},
         )
 
     if execute:
         engine.clear_store_image()
-        return JSONResponse(content={"status": "cleared"})
-    return JSONResponse(content={"status": "skipped"})
+        get_image_cache(request).drop_model(model_name)
+        return ORJSONResponse(content={"status": "cleared"})
+    return ORJSONResponse(content={"status": "skipped"})
@@ -4,18 +4,103 @@
 推論ジョブの投入・ステータス確認・一覧取得を提供します。
 """
 
-from typing import Optional
+import base64
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, File, Query, Request, UploadFile
-from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from src.api.services.job_queue import JobQueue, JobStatus
+from src.api.routers.dependencies import get_image_cache, get_queue, get_registry
+from src.api.services.encoded_image_cache import EncodedImageCache
+from src.api.services.job_queue import JobStatus
+from src.api.utils.responses import ORJSONResponse
+from src.config import env_loader
+from src.types import DetailLevel
 
 router = APIRouter(tags=["jobs"])
 
+# 1 リクエストで受け付ける最大画像枚数
+MAX_BATCH_FILES = 64
+# アップロード読み込みのチャンクサイズ（バイト）
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-def _get_queue(request: Request) -> JobQueue:
-    return request.app.state.queue  # type: ignore[no-any-return]
+
+def _check_model_ready(request: Request, model_name: str) -> Optional[ORJSONResponse]:
+    """モデルが推論可能か確認し、不可ならエラーレスポンスを返す"""
+    try:
+        get_registry(request).get_engine(model_name)
+    except KeyError:
+        return ORJSONResponse(
+            status_code=404, content={"error": f"Model '{model_name}' not found"}
+        )
+    except RuntimeError:
+        return ORJSONResponse(
+            status_code=503,
+            content={
+                "error": f"Model '{model_name}' is not loaded. "
+                f"POST /models/{model_name}/load first."
+            },
+        )
+    return None
+
+
+async def _read_upload(file: UploadFile, max_bytes: int) -> Optional[bytearray]:
+    """
+    アップロードファイルを上限付きでチャンク読み込みする
+
+    サイズが分かる場合は bytearray を一度だけ確保して memoryview に書き込み、
+    再確保とコピーの連鎖を避けます。
+
+    Returns:
+        読み込んだバイト列（max_bytes を超える場合は None）
+    """
+    size = file.size
+    if size is not None:
+        if size > max_bytes:
+            return None
+        buf = bytearray(size)
+        view = memoryview(buf)
+        offset = 0
+        while offset < size:
+            chunk = await file.read(min(UPLOAD_CHUNK_SIZE, size - offset))
+            if not chunk:
+                break
+            view[offset : offset + len(chunk)] = chunk
+            offset += len(chunk)
+        view.release()
+        if offset < size:
+            del buf[offset:]
+        return buf
+
+    # サイズ不明時は上限を確認しながら追記する
+    buf = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buf += chunk
+        if len(buf) > max_bytes:
+            return None
+    return buf
+
+
+def _upload_too_large() -> ORJSONResponse:
+    return ORJSONResponse(
+        status_code=413,
+        content={"error": f"File too large (max {env_loader.MAX_UPLOAD_BYTES} bytes)"},
+    )
+
+
+def _encode_result_images(
+    cache: EncodedImageCache, model_name: str, engine: Any, image_ids: Dict[str, str]
+) -> Dict[str, Optional[str]]:
+    """結果画像を PNG + base64 文字列に変換（キャッシュから消えた画像は None）"""
+    images: Dict[str, Optional[str]] = {}
+    for key, image_id in image_ids.items():
+        image = engine.get_image_by_id(image_id)
+        if image is None:
+            images[key] = None
+            continue
+        png = cache.encode(model_name, image_id, image)
+        images[key] = base64.b64encode(png).decode("ascii")
+    return images
 
 
 @router.post("/models/{model_name}/predict")
@@ -23,45 +108,91 @@ async def predict(
     model_name: str,
     request: Request,
     file: UploadFile = File(...),
-    detail_level: str = Query("basic", pattern="^(basic|full)$"),
-) -> JSONResponse:
+    detail_level: DetailLevel = Query("basic"),
+) -> ORJSONResponse:
     """
     推論ジョブをキューに投入する。
 
     job_id を即返却するので、`GET /jobs/{job_id}` でポーリングしてください。
     """
-    queue = _get_queue(request)
+    queue = get_queue(request)
 
     # モデルがロード済みか事前確認（早期エラー返却）
-    try:
-        request.app.state.registry.get_engine(model_name)
-    except KeyError:
-        return JSONResponse(
-            status_code=404, content={"error": f"Model '{model_name}' not found"}
-        )
-    except RuntimeError:
-        return JSONResponse(
-            status_code=503,
-            content={"error": f"Model '{model_name}' is not loaded. POST /models/{model_name}/load first."},
-        )
+    error = _check_model_ready(request, model_name)
+    if error is not None:
+        return error
 
-    image_bytes = await file.read()
-    job = await queue.enqueue(model_name, image_bytes, detail_level)
+    image_bytes = await _read_upload(file, env_loader.MAX_UPLOAD_BYTES)
+    if image_bytes is None:
+        return _upload_too_large()
+    job = await queue.enqueue(model_name, image_bytes, detail_level, file.content_type)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=202,
         content={"job_id": job.job_id, "status": job.status},
     )
 
 
+@router.post("/models/{model_name}/predict_batch")
+async def predict_batch(
+    model_name: str,
+    request: Request,
+    files: List[UploadFile] = File(...),
+    detail_level: DetailLevel = Query("basic"),
+) -> ORJSONResponse:
+    """
+    複数画像の推論ジョブを 1 リクエストでまとめて投入する。
+
+    画像ごとにジョブを作成し、アップロード順に job_id のリストを返します。
+    HTTP 往復・multipart 解析のオーバーヘッドを画像枚数分だけ削減できます。
+    """
+    queue = get_queue(request)
+
+    if len(files) > MAX_BATCH_FILES:
+        return ORJSONResponse(
+            status_code=413,
+            content={"error": f"Too many files (max {MAX_BATCH_FILES})"},
+        )
+
+    error = _check_model_ready(request, model_name)
+    if error is not None:
+        return error
+
+    images = []
+    for f in files:
+        data = await _read_upload(f, env_loader.MAX_UPLOAD_BYTES)
+        if data is None:
+            return _upload_too_large()
+        images.append(data)
+    content_types = [f.content_type for f in files]
+    jobs = await queue.enqueue_many(model_name, images, detail_level, content_types)
+
+    return ORJSONResponse(
+        status_code=202,
+        content={
+            "job_ids": [j.job_id for j in jobs],
+            "status": JobStatus.PENDING,
+        },
+    )
+
+
 @router.get("/jobs/{job_id}")
-async def get_job(job_id: str, request: Request) -> JSONResponse:
-    """ジョブのステータスと結果を返す"""
-    queue = _get_queue(request)
+async def get_job(
+    job_id: str,
+    request: Request,
+    return_images: bool = Query(False),
+) -> ORJSONResponse:
+    """
+    ジョブのステータスと結果を返す
+
+    return_images=true の場合、完了したジョブの結果に元画像・オーバーレイ画像を
+    base64 エンコードした PNG として埋め込みます（画像取得の往復を省略できる）。
+    """
+    queue = get_queue(request)
     job = queue.get_job(job_id)
 
     if job is None:
-        return JSONResponse(status_code=404, content={"error": "Job not found"})
+        return ORJSONResponse(status_code=404, content={"error": "Job not found"})
 
     body: dict = {
         "job_id": job.job_id,
@@ -77,10 +208,26 @@ async def get_job(job_id: str, request: Request) -> JSONResponse:
 
     if job.status == JobStatus.COMPLETED:
         body["result"] = job.result
+        if return_images and job.result is not None:
+            try:
+                engine = get_registry(request).get_engine(job.model_name)
+            except (KeyError, RuntimeError):
+                engine = None
+            if engine is not None:
+                images = await run_in_threadpool(
+                    _encode_result_images,
+                    get_image_cache(request),
+                    job.model_name,
+                    engine,
+                    job.result["image_id"],
+                )
+            else:
+                images = {key: None for key in job.result["image_id"]}
+            body["result"] = {**job.result, "images": images}
     elif job.status == JobStatus.FAILED:
         body["error"] = job.error
 
-    return JSONResponse(content=body)
+    return ORJSONResponse(content=body)
 
 
 @router.get("/jobs")
@@ -89,12 +236,12 @@ async def list_jobs(
     model_name: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=1000),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """ジョブ一覧を返す（新しい順）"""
-    queue = _get_queue(request)
+    queue = get_queue(request)
     jobs = queue.list_jobs(model_name=model_name, status=status, limit=limit)
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "jobs": [
                 {
@@ -102,7 +249,9 @@ async def list_jobs(
                     "model_name": j.model_name,
                     "status": j.status,
                     "created_at": j.created_at.isoformat(),
-                    "completed_at": j.completed_at.isoformat() if j.completed_at else None,
+                    "completed_at": (
+                        j.completed_at.isoformat() if j.completed_at else None
+                    ),
                 }
                 for j in jobs
             ]
@@ -5,23 +5,19 @@
 """
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
 
-from src.api.services.model_registry import ModelRegistry
+from src.api.routers.dependencies import get_image_cache, get_registry
+from src.api.utils.responses import ORJSONResponse
 
 router = APIRouter(prefix="/models", tags=["models"])
 
 
-def _get_registry(request: Request) -> ModelRegistry:
-    return request.app.state.registry  # type: ignore[no-any-return]
-
-
 @router.get("")
-async def list_models(request: Request) -> JSONResponse:
+async def list_models(request: Request) -> ORJSONResponse:
     """利用可能な全モデルをロード状態込みで返す"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     entries = registry.list_models()
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "models": [
                 {
@@ -37,13 +33,13 @@ async def list_models(request: Request) -> JSONResponse:
 
 
 @router.get("/{model_name}/status")
-async def model_status(model_name: str, request: Request) -> JSONResponse:
+async def model_status(model_name: str, request: Request) -> ORJSONResponse:
     """指定モデルのステータス・デバイス・キャッシュ数を返す"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     entries = {e.name: e for e in registry.list_models()}
 
     if model_name not in entries:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404, content={"error": f"Model '{model_name}' not found"}
         )
 
@@ -55,16 +51,16 @@ async def model_status(model_name: str, request: Request) -> JSONResponse:
         info["device"] = str(engine.device)
         info["image_cache"] = len(engine.get_store_image_list())
 
-    return JSONResponse(content=info)
+    return ORJSONResponse(content=info)
 
 
 @router.post("/{model_name}/load")
-async def load_model(model_name: str, request: Request) -> JSONResponse:
+async def load_model(model_name: str, request: Request) -> ORJSONResponse:
     """モデルをメモリにロードする"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     try:
         entry = await registry.load(model_name)
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "status": "loaded",
                 "name": entry.name,
@@ -72,36 +68,38 @@ async def load_model(model_name: str, request: Request) -> JSONResponse:
             }
         )
     except ValueError as e:
-        return JSONResponse(status_code=409, content={"error": str(e)})
+        return ORJSONResponse(status_code=409, content={"error": str(e)})
     except FileNotFoundError as e:
-        return JSONResponse(status_code=404, content={"error": str(e)})
+        return ORJSONResponse(status_code=404, content={"error": str(e)})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @router.delete("/{model_name}/unload")
-async def unload_model(model_name: str, request: Request) -> JSONResponse:
+async def unload_model(model_name: str, request: Request) -> ORJSONResponse:
     """モデルをメモリからアンロードする（ファイルは残す）"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     try:
         await registry.unload(model_name)
-        return JSONResponse(content={"status": "unloaded", "name": model_name})
+        get_image_cache(request).drop_model(model_name)
+        return ORJSONResponse(content={"status": "unloaded", "name": model_name})
     except KeyError as e:
-        return JSONResponse(status_code=404, content={"error": str(e)})
+        return ORJSONResponse(status_code=404, content={"error": str(e)})
     except ValueError as e:
-        return JSONResponse(status_code=409, content={"error": str(e)})
+        return ORJSONResponse(status_code=409, content={"error": str(e)})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @router.delete("/{model_name}")
-async def delete_model(model_name: str, request: Request) -> JSONResponse:
+async def delete_model(model_name: str, request: Request) -> ORJSONResponse:
     """モデルをアンロードし、ディスク上のファイルも削除する"""
-    registry = _get_registry(request)
+    registry = get_registry(request)
     try:
         await registry.delete(model_name)
-        return JSONResponse(content={"status": "deleted", "name": model_name})
+        get_image_cache(request).drop_model(model_name)
+        return ORJSONResponse(content={"status": "deleted", "name": model_name})
     except KeyError as e:
-        return JSONResponse(status_code=404, content={"error": str(e)})
+        return ORJSONResponse(status_code=404, content={"error": str(e)})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
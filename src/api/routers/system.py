@@ -5,45 +5,44 @@ OS、CPU、メモリ、GPU などのシステム情報を返します。
 """
 
 import platform
+from functools import lru_cache
+from typing import Any, Dict
 
 import psutil
 import torch
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.ml_engines.PatchCore.utils.device_utils import (
     check_gpu_environment,
     get_gpu_memory_info,
 )
+from src.api.utils.responses import ORJSONResponse
 
 router = APIRouter(tags=["system"])
 
 
-@router.get("/system_info")
-async def system_info() -> JSONResponse:
-    """OS、CPU、メモリ、PyTorch バージョンなどのシステム情報を返す"""
-    try:
-        info = {
-            "platform": platform.platform(),
-            "cpu_count": psutil.cpu_count(),
-            "memory_total": f"{psutil.virtual_memory().total / 1e9:.1f}GB",
-            "memory_available": f"{psutil.virtual_memory().available / 1e9:.1f}GB",
-            "pytorch_version": torch.__version__,
-            "cuda_support": torch.cuda.is_available(),
-        }
-        return JSONResponse(content=info)
-    except Exception as e:
-        return JSONResponse(
-            content={"error": f"システム情報の取得に失敗: {str(e)}"}, status_code=500
-        )
+@router.get("/health")
+async def health() -> ORJSONResponse:
+    """死活監視用の軽量エンドポイント（起動待ち・接続の事前確立に使用）"""
+    return ORJSONResponse(content={"status": "ok"})
 
 
-@router.get("/gpu_info")
-async def gpu_info() -> JSONResponse:
-    """GPU / CUDA 情報を返す"""
-    info = check_gpu_environment()
-    info["memory"] = get_gpu_memory_info()
+@lru_cache(maxsize=1)
+def _static_system_info() -> Dict[str, Any]:
+    """実行中に変化しないシステム情報（初回呼び出し時に一度だけ取得）"""
+    return {
+        "platform": platform.platform(),
+        "cpu_count": psutil.cpu_count(),
+        "pytorch_version": torch.__version__,
+        "cuda_support": torch.cuda.is_available(),
+    }
+
 
+@lru_cache(maxsize=1)
+def _static_gpu_info() -> Dict[str, Any]:
+    """GPU 環境とデバイスプロパティ（初回呼び出し時に一度だけ取得）"""
+    info = check_gpu_environment()
     if torch.cuda.is_available():
         for i in range(torch.cuda.device_count()):
             props = torch.cuda.get_device_properties(i)
@@ -54,5 +53,34 @@ async def gpu_info() -> JSONResponse:
                 "major": props.major,
                 "minor": props.minor,
             }
+    return info
 
-    return JSONResponse(content=info)
+
+@router.get("/system_info")
+async def system_info() -> ORJSONResponse:
+    """OS、CPU、メモリ、PyTorch バージョンなどのシステム情報を返す"""
+    try:
+        static = await run_in_threadpool(_static_system_info)
+        memory = await run_in_threadpool(psutil.virtual_memory)
+        info = {
+            "platform": static["platform"],
+            "cpu_count": static["cpu_count"],
+            "memory_total": f"{memory.total / 1e9:.1f}GB",
+            "memory_available": f"{memory.available / 1e9:.1f}GB",
+            "pytorch_version": static["pytorch_version"],
+            "cuda_support": static["cuda_support"],
+        }
+        return ORJSONResponse(content=info)
+    except Exception as e:
+        return ORJSONResponse(
+            content={"error": f"システム情報の取得に失敗: {str(e)}"}, status_code=500
+        )
+
+
+@router.get("/gpu_info")
+async def gpu_info() -> ORJSONResponse:
+    """GPU / CUDA 情報を返す（変化しない情報はキャッシュし、メモリ使用量のみ毎回取得）"""
+    static = await run_in_threadpool(_static_gpu_info)
+    info = dict(static)
+    info["memory"] = await run_in_threadpool(get_gpu_memory_info)
+    return ORJSONResponse(content=info)
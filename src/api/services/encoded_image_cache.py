@@ -0,0 +1,106 @@
+"""
+エンコード済み画像キャッシュサービス
+
+画像キャッシュ API で返す PNG などのエンコード結果を LRU で保持し、
+同じ画像の再取得時に再エンコードを省略します。
+エンコード結果は cv2.imencode の出力バッファを読み取り専用 memoryview のまま保持し、
+bytes へのコピーを行わずにレスポンスへ渡します。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# キャッシュ上限（バイト）
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+# (モデル名, 画像ID, 拡張子, エンコードパラメータ)
+CacheKey = Tuple[str, str, str, Tuple[int, ...]]
+
+
+class EncodedImageCache:
+    """
+    エンコード済み画像のバイト数上限付き LRU キャッシュ。
+
+    画像 ID はエンジン側で uuid4 の全桁を含めて一意に採番され内容は変化しないため、
+    モデル単位の明示的な破棄（キャッシュクリア・アンロード時）のみで整合性を保てます。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._store: "OrderedDict[CacheKey, memoryview]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model_name: str, image_id: str, ext: str = ".png", params: Tuple[int, ...] = ()
+    ) -> CacheKey:
+        """キャッシュキーを生成する"""
+        return (model_name, image_id, ext, params)
+
+    def get(self, key: CacheKey) -> Optional[memoryview]:
+        """キャッシュ済みのエンコード結果を返す（なければ None）"""
+        with self._lock:
+            data = self._store.get(key)
+            if data is not None:
+                self._store.move_to_end(key)
+            return data
+
+    def put(self, key: CacheKey, data: memoryview) -> None:
+        """エンコード結果を登録し、上限を超えた分を古い順に削除する"""
+        if data.nbytes > self._max_bytes:
+            return
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.nbytes
+            self._store[key] = data
+            self._total_bytes += data.nbytes
+            while self._total_bytes > self._max_bytes:
+                _, evicted = self._store.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+
+    def encode(
+        self,
+        model_name: str,
+        image_id: str,
+        image: np.ndarray,
+        ext: str = ".png",
+        params: Tuple[int, ...] = (),
+    ) -> memoryview:
+        """
+        画像をエンコードして返す（キャッシュにあればエンコードを省略）
+
+        Returns:
+            エンコード結果の読み取り専用 memoryview（Response の content にそのまま渡せる）
+
+        Raises:
+            ValueError: エンコードに失敗した場合
+        """
+        key = self.make_key(model_name, image_id, ext, params)
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        success, buffer = cv2.imencode(ext, image, list(params))
+        if not success:
+            raise ValueError(f"画像のエンコードに失敗しました: {image_id}")
+        data = memoryview(buffer.reshape(-1)).toreadonly()
+        self.put(key, data)
+        return data
+
+    def drop_model(self, model_name: str) -> None:
+        """指定モデルのエントリをすべて破棄する"""
+        with self._lock:
+            for key in [k for k in self._store if k[0] == model_name]:
+                self._total_bytes -= self._store.pop(key).nbytes
+
+    def clear(self) -> None:
+        """全エントリを破棄する"""
+        with self._lock:
+            self._store.clear()
+            self._total_bytes = 0
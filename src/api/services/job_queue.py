@@ -2,26 +2,41 @@
 非同期ジョブキューサービス
 
 推論リクエストをキューに積み、シングルワーカーで順番に処理します。
-GPU 推論はスレッドプールで実行し、イベントループをブロックしません。
+画像デコードはキューの先頭から DECODE_AHEAD 件分だけデコード用スレッドプールで
+先行して行い、GPU 推論は専用の推論スレッドで実行するため、イベントループをブロックしません。
 """
 
 import asyncio
-import io
+import os
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Sequence, Union
 
 import cv2
 import numpy as np
-from PIL import Image
 
+from src.api.utils.api_util import (
+    RAW_IMAGE_CONTENT_TYPE,
+    convert_png_bytes_to_ndarray,
+    convert_raw_bytes_to_ndarray,
+)
 from src.config import env_loader
+from src.types import DetailLevel, JobResult, PredictionResult
 from src.utils.logger import setup_logger
 from src.api.services.model_registry import ModelRegistry
 
 logger = setup_logger("job_queue", log_dir=env_loader.LOG_DIR + "/api")
 
+# 画像デコードの並列数（推論待ちの間に後続ジョブのデコードを進める）
+DECODE_WORKERS = min(4, os.cpu_count() or 1)
+
+# 推論を待つ間に先行してデコードしておくジョブ数の上限
+# （デコード済みの画像はこの件数分だけメモリに保持し、残りは圧縮データのまま待たせる）
+DECODE_AHEAD = DECODE_WORKERS * 2
+
 
 class JobStatus:
     PENDING = "pending"
@@ -34,21 +49,64 @@ class JobStatus:
 class PredictJob:
     job_id: str
     model_name: str
-    image_bytes: Optional[bytes]  # 完了後に None にしてメモリ解放
-    detail_level: str
+    image_bytes: Optional[Union[bytes, bytearray]]  # 完了後に None にしてメモリ解放
+    detail_level: DetailLevel
     status: str
     created_at: datetime
     started_at: Optional[datetime] = field(default=None)
     completed_at: Optional[datetime] = field(default=None)
-    result: Optional[Dict[str, Any]] = field(default=None)
+    result: Optional[JobResult] = field(default=None)
     error: Optional[str] = field(default=None)
+    content_type: Optional[str] = field(default=None)
+    decoded: Optional["asyncio.Future[np.ndarray]"] = field(default=None, repr=False)
 
 
-def _bytes_to_bgr(image_bytes: bytes) -> np.ndarray:
-    """アップロードされたバイト列を BGR numpy 配列に変換"""
-    pil_img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    rgb = np.array(pil_img)
-    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+def _build_job_result(
+    raw_result: PredictionResult, detail_level: DetailLevel
+) -> JobResult:
+    """
+    推論結果から detail_level に応じたジョブ結果を組み立てる
+
+    エンジンの結果の辞書はコピーせず参照で渡し、シリアライズ（orjson）に任せます。
+    """
+    z = raw_result["z_stats"]
+    if detail_level == "full":
+        return {
+            "label": raw_result["label"],
+            "image_id": raw_result["image_id"],
+            "thresholds": raw_result["thresholds"],
+            "z_stats": z,
+        }
+    # basic: z_stats は最小限（area, maxval のみ）
+    return {
+        "label": raw_result["label"],
+        "image_id": raw_result["image_id"],
+        "z_stats": {"area": z["area"], "maxval": z["maxval"]},
+    }
+
+
+def _bytes_to_bgr(
+    image_bytes: Union[bytes, bytearray], content_type: Optional[str] = None
+) -> np.ndarray:
+    """
+    アップロードされたバイト列を BGR numpy 配列に変換
+
+    戻り値は毎回新しい配列にする（出力バッファを使い回さない）。エンジンは入力画像を
+    そのまま画像キャッシュ（org_*）と NG 画像保存スレッドに渡し、さらに後続ジョブの
+    デコードが推論と並行して進むため、共有バッファにすると保持中の画像が上書きされる。
+    """
+    if content_type == RAW_IMAGE_CONTENT_TYPE:
+        # 無圧縮転送: デコード不要。bytes は読み取り専用なのでコピーして書き込み可能にする
+        img = convert_raw_bytes_to_ndarray(image_bytes).copy()
+        if img.shape[2] == 1:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        if img.shape[2] != 3:
+            raise ValueError(f"raw 画像のチャンネル数が不正です: {img.shape[2]}")
+        return img
+    # BGR へ直接デコード（EXIF の回転は適用しない: AFFINE_POINTS は撮像時の画素座標のため）
+    return convert_png_bytes_to_ndarray(
+        image_bytes, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+    )
 
 
 class JobQueue:
@@ -66,8 +124,18 @@ class JobQueue:
         self._ttl = ttl_seconds
         self._queue: asyncio.Queue[str] = asyncio.Queue()
         self._jobs: Dict[str, PredictJob] = {}
+        # デコード未開始のジョブ（キューと同じ順序）と、デコード開始済みで未処理のジョブ数
+        self._awaiting_decode: Deque[PredictJob] = deque()
+        self._decoding = 0
         self._worker_task: Optional[asyncio.Task] = None  # type: ignore[type-arg]
         self._cleanup_task: Optional[asyncio.Task] = None  # type: ignore[type-arg]
+        self._decode_executor = ThreadPoolExecutor(
+            max_workers=DECODE_WORKERS, thread_name_prefix="job_decode"
+        )
+        # 推論はシングルワーカーで順番に行うため専用スレッド 1 本で十分
+        self._infer_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="job_infer"
+        )
 
     async def start(self) -> None:
         """バックグラウンドタスクを起動する（FastAPI lifespan から呼ぶ）"""
@@ -84,10 +152,16 @@ class JobQueue:
                     await task
                 except asyncio.CancelledError:
                     pass
+        self._decode_executor.shutdown(wait=False, cancel_futures=True)
+        self._infer_executor.shutdown(wait=False, cancel_futures=True)
         logger.info("JobQueue stopped")
 
     async def enqueue(
-        self, model_name: str, image_bytes: bytes, detail_level: str = "basic"
+        self,
+        model_name: str,
+        image_bytes: Union[bytes, bytearray],
+        detail_level: DetailLevel = "basic",
+        content_type: Optional[str] = None,
     ) -> PredictJob:
         """
         推論ジョブをキューに登録する。
@@ -102,12 +176,51 @@ class JobQueue:
             detail_level=detail_level,
             status=JobStatus.PENDING,
             created_at=datetime.now(),
+            content_type=content_type,
         )
         self._jobs[job.job_id] = job
+        # 先行デコードの枠が空いていれば投入時点で開始し、前のジョブの推論と並行させる
+        self._awaiting_decode.append(job)
+        self._start_decodes()
         await self._queue.put(job.job_id)
         logger.info(f"Job enqueued: {job.job_id} model={model_name}")
         return job
 
+    async def enqueue_many(
+        self,
+        model_name: str,
+        images: Sequence[Union[bytes, bytearray]],
+        detail_level: DetailLevel = "basic",
+        content_types: Optional[List[Optional[str]]] = None,
+    ) -> List[PredictJob]:
+        """
+        複数の推論ジョブをまとめてキューに登録する。
+
+        Returns:
+            作成された PredictJob のリスト（images と同じ順序）
+        """
+        if content_types is None:
+            content_types = [None] * len(images)
+        return [
+            await self.enqueue(model_name, b, detail_level, ct)
+            for b, ct in zip(images, content_types)
+        ]
+
+    def _start_decodes(self) -> None:
+        """
+        キューの先頭側から DECODE_AHEAD 件までのジョブのデコードを開始する
+
+        キューは FIFO のため、ワーカーが取り出すジョブのデコードは常に開始済みになります。
+        """
+        loop = asyncio.get_running_loop()
+        while self._awaiting_decode and self._decoding < DECODE_AHEAD:
+            job = self._awaiting_decode.popleft()
+            assert job.image_bytes is not None
+            job.decoded = loop.run_in_executor(
+                self._decode_executor, _bytes_to_bgr, job.image_bytes, job.content_type
+            )
+            self._decoding += 1
+
     def get_job(self, job_id: str) -> Optional[PredictJob]:
         """ジョブを取得する（存在しない場合は None）"""
         return self._jobs.get(job_id)
@@ -145,26 +258,16 @@ class JobQueue:
 
             try:
                 engine = self._registry.get_engine(job.model_name)
-                image_bytes = job.image_bytes
-                assert image_bytes is not None
+                assert job.decoded is not None
 
-                # ブロッキング処理をスレッドプールで実行
-                bgr_img = await loop.run_in_executor(None, _bytes_to_bgr, image_bytes)
-                raw_result = await loop.run_in_executor(None, engine.predict, bgr_img)
+                # デコード（投入時に開始済み）の完了を待ち、推論は専用スレッドで実行
+                bgr_img = await job.decoded
+                raw_result = await loop.run_in_executor(
+                    self._infer_executor, engine.predict, bgr_img
+                )
 
                 # detail_level に応じてフィールドを絞る
-                result: Dict[str, Any] = {
-                    "label": raw_result["label"],
-                    "image_id": raw_result["image_id"],
-                }
-                if job.detail_level == "full":
-                    result["thresholds"] = raw_result["thresholds"]
-                    result["z_stats"] = raw_result["z_stats"]
-                else:
-                    # basic: z_stats は最小限（area, maxval のみ）
-                    z = raw_result["z_stats"]
-                    result["z_stats"] = {"area": z["area"], "maxval": z["maxval"]}
-
+                result = _build_job_result(raw_result, job.detail_level)
                 job.result = result
                 job.status = JobStatus.COMPLETED
                 logger.info(f"Job completed: {job_id} label={result['label']}")
@@ -184,6 +287,17 @@ class JobQueue:
             finally:
                 job.completed_at = datetime.now()
                 job.image_bytes = None  # メモリ解放
+                if job.decoded is not None:
+                    # 推論前に失敗した場合はデコードを取り消し、完了済みの例外も回収して
+                    # "Future exception was never retrieved" が出ないようにする
+                    job.decoded.cancel()
+                    job.decoded.add_done_callback(
+                        lambda f: f.cancelled() or f.exception()
+                    )
+                    job.decoded = None
+                    # 先行デコードの枠を次のジョブに回す
+                    self._decoding -= 1
+                    self._start_decodes()
                 self._queue.task_done()
 
     async def _cleanup(self) -> None:
@@ -6,6 +6,7 @@
 """
 
 import asyncio
+import gc
 import os
 import shutil
 from dataclasses import dataclass, field
@@ -14,12 +15,13 @@ from typing import Dict, List, Optional
 
 from src.config import env_loader
 from src.ml_engines.PatchCore.core.inference_engine import PatchCoreInferenceEngine
+from src.ml_engines.PatchCore.utils.device_utils import clear_gpu_cache
 from src.utils.logger import setup_logger
 
 logger = setup_logger("model_registry", log_dir=env_loader.LOG_DIR + "/api")
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelEntry:
     name: str
     engine: Optional[PatchCoreInferenceEngine]
@@ -28,6 +30,12 @@ class ModelEntry:
     error: Optional[str] = field(default=None)
 
 
+def _release_memory() -> None:
+    """アンロードしたエンジンの循環参照を回収し、PyTorch の GPU キャッシュを解放する"""
+    gc.collect()
+    clear_gpu_cache()
+
+
 class ModelRegistry:
     """
     複数の PatchCoreInferenceEngine インスタンスを管理するレジストリ。
@@ -81,12 +89,15 @@ class ModelRegistry:
             KeyError: モデルが未登録（存在しない）
             RuntimeError: モデルが登録済みだがアンロード済み
         """
-        if model_name not in self._registry:
+        # エントリ・エンジンはそれぞれ 1 回だけ読む（アンロードと競合しても
+        # 途中状態の None を返さない）
+        entry = self._registry.get(model_name)
+        if entry is None:
             raise KeyError(f"Model '{model_name}' not found")
-        entry = self._registry[model_name]
-        if entry.engine is None or entry.status != "loaded":
+        engine = entry.engine
+        if engine is None:
             raise RuntimeError(f"Model '{model_name}' is not loaded")
-        return entry.engine
+        return engine
 
     async def load(self, model_name: str) -> ModelEntry:
         """
@@ -147,6 +158,8 @@ class ModelRegistry:
             entry.engine = None
             entry.status = "unloaded"
             entry.loaded_at = None
+            # モデル入れ替え時の断片化・OOM を避けるため、次のロードを待たずに即時解放する
+            await asyncio.get_running_loop().run_in_executor(None, _release_memory)
             logger.info(f"Model unloaded: {model_name}")
 
     async def delete(self, model_name: str) -> None:
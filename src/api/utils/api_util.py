@@ -4,10 +4,30 @@ API ユーティリティモジュール
 画像形式の変換、URL構築などのAPI関連ユーティリティ関数を提供します。
 """
 
+import uuid
+from typing import Iterator, Tuple, Union
+
 import cv2
 import numpy as np
 from urllib.parse import urlparse
 
+# raw 転送時の Content-Type とヘッダー（height, width, channels の uint32 LE × 3）
+RAW_IMAGE_CONTENT_TYPE = "application/octet-stream"
+_RAW_HEADER_DTYPE = np.dtype("<u4")
+_RAW_HEADER_SIZE = _RAW_HEADER_DTYPE.itemsize * 3
+
+# アップロード時の転送フォーマット
+WIRE_FORMATS = ("png", "webp", "raw")
+
+# エンコード済み画像のシグネチャ → (ファイル名, Content-Type)
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ("image.png", "image/png")),
+    (b"\xff\xd8\xff", ("image.jpg", "image/jpeg")),
+    (b"BM", ("image.bmp", "image/bmp")),
+    (b"II*\x00", ("image.tif", "image/tiff")),
+    (b"MM\x00*", ("image.tif", "image/tiff")),
+)
+
 
 def convert_image_to_png_bytes(image: np.ndarray) -> bytes:
     """
@@ -39,14 +59,158 @@ def convert_image_to_png_bytes(image: np.ndarray) -> bytes:
         raise ValueError(f"画像の変換エラー: {e}")
 
 
-def convert_png_bytes_to_ndarray(image_bytes: bytes) -> np.ndarray:
+def convert_image_to_raw_bytes(image: np.ndarray) -> bytes:
+    """
+    NumPy画像配列を無圧縮のバイト列（形状ヘッダー + 画素）に変換
+
+    エンコード／デコードの CPU コストをなくす代わりに転送量が増えます。
+    帯域に余裕のある LAN 内での利用を想定しています。
+
+    Args:
+        image: 変換する画像配列（uint8、BGR形式またはグレースケール）
+
+    Returns:
+        先頭 12 バイトが (height, width, channels) の uint32 LE、続いて画素データのバイト列
+
+    Raises:
+        ValueError: uint8 の 2 次元／3 次元配列でない場合
+    """
+    if image.dtype != np.uint8 or image.ndim not in (2, 3):
+        raise ValueError(
+            f"raw 転送は uint8 の 2D/3D 配列のみ対応です: {image.dtype} {image.shape}"
+        )
+    h, w = image.shape[:2]
+    c = image.shape[2] if image.ndim == 3 else 1
+    header = np.array([h, w, c], dtype=_RAW_HEADER_DTYPE).tobytes()
+    return header + np.ascontiguousarray(image).tobytes()
+
+
+def convert_raw_bytes_to_ndarray(data: Union[bytes, bytearray]) -> np.ndarray:
+    """
+    convert_image_to_raw_bytes() で作成したバイト列をNumPy画像配列に戻す
+
+    Args:
+        data: 形状ヘッダー付きの無圧縮画素データ
+
+    Returns:
+        (height, width, channels) の uint8 配列（コピーなしの読み取り専用ビュー）
+
+    Raises:
+        ValueError: ヘッダーとデータ長が一致しない場合
+    """
+    if len(data) < _RAW_HEADER_SIZE:
+        raise ValueError("raw 画像データのヘッダーが不足しています")
+    h, w, c = (int(v) for v in np.frombuffer(data, dtype=_RAW_HEADER_DTYPE, count=3))
+    expected = h * w * c
+    if len(data) - _RAW_HEADER_SIZE != expected:
+        raise ValueError(f"raw 画像データのサイズが不正です: shape=({h}, {w}, {c})")
+    pixels = np.frombuffer(data, dtype=np.uint8, offset=_RAW_HEADER_SIZE)
+    return pixels.reshape(h, w, c)
+
+
+def _imencode_view(
+    ext: str, image: np.ndarray, params: Tuple[int, ...] = ()
+) -> memoryview:
+    """cv2.imencode の出力バッファを bytes にコピーせず 1 次元の memoryview で返す"""
+    try:
+        success, encoded_image = cv2.imencode(ext, image, list(params))
+        if not success:
+            raise ValueError("画像のエンコードに失敗しました")
+        return memoryview(encoded_image.reshape(-1))
+    except Exception as e:
+        raise ValueError(f"画像の変換エラー: {e}")
+
+
+def _detect_encoded_image(data: bytes) -> Tuple[str, str]:
+    """エンコード済み画像バイト列の形式を先頭シグネチャから判定し (ファイル名, Content-Type) を返す"""
+    for signature, info in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return info
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image.webp", "image/webp"
+    raise ValueError("未対応の画像形式です（PNG / JPEG / WebP / BMP / TIFF のみ対応）")
+
+
+def encode_image_for_upload(
+    image: Union[np.ndarray, bytes], wire_format: str = "png"
+) -> Tuple[str, Union[bytes, memoryview], str]:
+    """
+    アップロード用に画像をエンコードし、multipart 用のタプルを返す
+
+    PNG / WebP はエンコーダーの出力バッファを memoryview のまま返し、
+    送信までの余分なコピーを省きます。
+    画像ファイルのバイト列（エンコード済み）を渡した場合は再エンコードせずそのまま返します。
+
+    Args:
+        image: 送信する画像配列（BGR形式）、またはエンコード済み画像ファイルのバイト列
+        wire_format: "png"（デフォルト）/ "webp"（ロスレス）/ "raw"（無圧縮）。
+            バイト列を渡した場合は無視される
+
+    Returns:
+        (ファイル名, バイト列または memoryview, Content-Type)
+
+    Raises:
+        ValueError: 未対応の wire_format・画像形式、またはエンコードに失敗した場合
+    """
+    if isinstance(image, (bytes, bytearray)):
+        filename, content_type = _detect_encoded_image(bytes(image[:16]))
+        return filename, image, content_type
+    if wire_format == "png":
+        return "image.png", _imencode_view(".png", image), "image/png"
+    if wire_format == "webp":
+        return (
+            "image.webp",
+            _imencode_view(".webp", image, (cv2.IMWRITE_WEBP_QUALITY, 101)),
+            "image/webp",
+        )
+    if wire_format == "raw":
+        return "image.raw", convert_image_to_raw_bytes(image), RAW_IMAGE_CONTENT_TYPE
+    raise ValueError(
+        f"未対応の wire_format です: {wire_format}（{', '.join(WIRE_FORMATS)}）"
+    )
+
+
+def iter_multipart_file(
+    field_name: str, filename: str, payload: Union[bytes, memoryview], content_type: str
+) -> Tuple[Iterator[Union[bytes, memoryview]], str]:
+    """
+    1 ファイル分の multipart/form-data ボディをチャンクのイテレータとして生成
+
+    requests にイテレータを渡すと chunked 転送で送信されるため、
+    ボディ全体を 1 つの bytes に組み立てるコピーが発生しません。
+
+    Args:
+        field_name: フォームのフィールド名
+        filename: ファイル名
+        payload: ファイル内容
+        content_type: ファイルの Content-Type
+
+    Returns:
+        (ボディのチャンクイテレータ, リクエストの Content-Type ヘッダー値)
+    """
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; '
+        f'filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+    return iter((head, payload, tail)), f"multipart/form-data; boundary={boundary}"
+
+
+def convert_png_bytes_to_ndarray(
+    image_bytes: Union[bytes, bytearray], flags: int = cv2.IMREAD_COLOR
+) -> np.ndarray:
     """
     PNGバイト列をNumPy画像配列に変換
 
     HTTPレスポンスから受信した画像データをデコードする際に使用します。
+    PNG 以外でも OpenCV がデコードできる形式（JPEG / WebP など）であれば変換できます。
 
     Args:
         image_bytes: PNGフォーマットのバイト列
+        flags: cv2.imdecode に渡す読み込みフラグ
 
     Returns:
         デコードされた画像配列（BGR形式）
@@ -61,7 +225,7 @@ def convert_png_bytes_to_ndarray(image_bytes: bytes) -> np.ndarray:
     """
     try:
         image_buffer: np.ndarray = np.frombuffer(image_bytes, dtype=np.uint8)  # type: ignore[assignment]
-        image_array = cv2.imdecode(image_buffer, cv2.IMREAD_COLOR)  # type: ignore[arg-type]
+        image_array = cv2.imdecode(image_buffer, flags)  # type: ignore[arg-type]
         if image_array is None:
             raise ValueError("画像のデコードに失敗しました")
         return image_array  # type: ignore[no-any-return]
@@ -97,6 +261,7 @@ class ApiUrlBuilder:
 
     Attributes:
         _base_url: 検証済みのベースURL
+        _prefix: 末尾にスラッシュを付けたベースURL（結合時の正規化を省くため事前計算）
     """
 
     def __init__(self, base_url: str) -> None:
@@ -119,6 +284,7 @@ class ApiUrlBuilder:
         if parsed.scheme not in ("http", "https") or not parsed.netloc:
             raise ValueError(f"不正なURLです: {base_url}")
         self._base_url = base_url.rstrip("/")
+        self._prefix = self._base_url + "/"
 
     def make(self, endpoint: str) -> str:
         """
@@ -130,4 +296,7 @@ class ApiUrlBuilder:
         Returns:
             結合されたフルURL
         """
-        return f"{self._base_url}/{endpoint.lstrip('/')}"
+        # job_id など毎回異なるエンドポイントが多いため、キャッシュせず単純な連結で生成する
+        if endpoint.startswith("/"):
+            return self._prefix + endpoint[1:]
+        return self._prefix + endpoint
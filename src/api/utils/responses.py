@@ -0,0 +1,31 @@
+"""
+API レスポンスモジュール
+
+orjson による高速な JSON レスポンスクラスを提供します。
+orjson がインストールされていない場合は標準の json でシリアライズします。
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意依存（pip install .[fast]）
+    orjson = None  # type: ignore[assignment]
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjson でシリアライズする JSONResponse
+
+    z_stats・thresholds など float を多く含む辞書を標準の json より高速に変換し、
+    NumPy のスカラー・配列もそのまま扱えます。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
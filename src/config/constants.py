@@ -4,7 +4,9 @@
 ハードコードされたパスやマジックナンバーを一元管理します。
 """
 
+from functools import lru_cache
 from pathlib import Path
+from typing import Final, Tuple
 
 # プロジェクトルート
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -25,9 +27,13 @@ MEMORY_BANK_COMPRESSED_FILENAME = "memory_bank_compressed.pkl"
 PCA_FILENAME = "pca.pkl"
 MODEL_FILENAME = "model.pt"
 PIXEL_STATS_FILENAME = "pixel_stats.pkl"
+# メモリバンク・PCA・ピクセル統計をまとめた単一ファイル（旧形式の各 .pkl を置き換える）
+MODEL_ASSETS_FILENAME = "model_assets.pt"
 
 
 # モデル関連のパスを生成するヘルパー関数
+# （モデル数は少なく Path は不変なので、結果をキャッシュして再生成を省く）
+@lru_cache(maxsize=None)
 def get_model_dir(model_name: str) -> Path:
     """モデルディレクトリのパスを取得
 
@@ -47,6 +53,7 @@ def get_model_dir(model_name: str) -> Path:
     return MODELS_DIR / model_name
 
 
+@lru_cache(maxsize=None)
 def get_settings_path(model_name: str) -> Path:
     """モデル設定ファイルのパスを取得
 
@@ -66,6 +73,7 @@ def get_settings_path(model_name: str) -> Path:
     return SETTINGS_MODELS_DIR / model_name / SETTINGS_FILENAME
 
 
+@lru_cache(maxsize=None)
 def get_dataset_dir(model_name: str) -> Path:
     """データセットディレクトリのパスを取得
 
@@ -85,6 +93,7 @@ def get_dataset_dir(model_name: str) -> Path:
     return DATASETS_DIR / model_name
 
 
+@lru_cache(maxsize=None)
 def get_normal_dir(model_name: str) -> Path:
     """正常画像ディレクトリのパスを取得
 
@@ -104,14 +113,15 @@ def get_normal_dir(model_name: str) -> Path:
     return get_dataset_dir(model_name) / "normal"
 
 
+@lru_cache(maxsize=None)
 def get_augmented_dir(model_name: str) -> Path:
     """拡張画像ディレクトリのパスを取得"""
     return get_dataset_dir(model_name) / "normal_augmented"
 
 
 # 画像関連の定数
-SUPPORTED_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+SUPPORTED_IMAGE_EXTENSIONS: Final[Tuple[str, ...]] = (".png", ".jpg", ".jpeg", ".bmp")
 
 # その他の定数
-DEFAULT_SAMPLING_RATIO = 0.1
-DEFAULT_LOG_INTERVAL = 10
+DEFAULT_SAMPLING_RATIO: Final[float] = 0.1
+DEFAULT_LOG_INTERVAL: Final[int] = 10
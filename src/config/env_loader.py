@@ -5,15 +5,60 @@
 プロジェクトルートの.envファイルを自動的に読み込みます。
 """
 
+import io
+import json
 import os
+import pickle
+import re
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, TypeVar, Type, Dict, List
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import (
+    Any,
+    TypeVar,
+    Type,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from dotenv import dotenv_values
 
 # プロジェクトルートの.envファイルを読み込み
 _project_root = Path(__file__).parent.parent.parent
 _env_path = _project_root / ".env"
 
+# .env のパース結果キャッシュの拡張子（.env と同じディレクトリに作成）
+ENV_CACHE_SUFFIX = ".cache.pkl"
+
+# 単純な KEY=VALUE 行（引用符・エスケープ・変数展開なし）の .env を一括で解析する正規表現
+# 値の後ろの「空白 + #」以降はコメントとして除去する（python-dotenv と同じ扱い）
+_SIMPLE_ENV_LINE = re.compile(
+    r"^[ \t]*([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=(.*?)(?:[ \t]+#.*)?[ \t]*\r?$",
+    re.MULTILINE,
+)
+# 上記で扱えない記法（これらを含む場合は python-dotenv で解析する）
+_COMPLEX_ENV_CHARS = frozenset("'\"\\$")
+
+# .env の反映済みを示す環境変数（"1": 読み込み不要、"<mtime_ns>:<size>": その内容の .env を反映済み）
+ENV_READY_VAR = "PATCHCORE_ENV_READY"
+
+
+def _try_stat(path: Union[str, Path]) -> Optional[os.stat_result]:
+    """
+    ファイルの stat を取得（存在しない場合は None）
+
+    存在確認と更新日時・サイズの取得を1回のシステムコールで済ませるために使用します。
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
 
 def env_exists() -> bool:
     """
@@ -25,15 +70,18 @@ def env_exists() -> bool:
     return _env_path.exists()
 
 
-def make_env_file() -> None:
+def make_env_file() -> Optional[str]:
     """
     デフォルトの.envファイルを作成
 
     既に.envファイルが存在する場合は上書きしません。
+
+    Returns:
+        作成した.envファイルの内容（作成しなかった場合はNone）
     """
     if env_exists():
         print(f"[Info] {_env_path} は既に存在します。上書きしません。")
-        return
+        return None
 
     env_example_path = _env_path.parent / ".env.example"
     if env_example_path.exists():
@@ -41,23 +89,67 @@ def make_env_file() -> None:
             open(env_example_path, "r", encoding="utf-8") as src,
             open(_env_path, "w", encoding="utf-8") as dst,
         ):
-            dst.write(src.read())
+            text = src.read()
+            dst.write(text)
         print(f"[Info] {_env_path} を {env_example_path} から作成しました。")
-    else:
-        print(
-            f"[Error] {env_example_path} が見つかりません。デフォルトの.envファイルを作成できません。"
-        )
+        return text
+
+    print(
+        f"[Error] {env_example_path} が見つかりません。デフォルトの.envファイルを作成できません。"
+    )
+    return None
 
 
-# .envファイルがなければ作成し、読み込む
-if not env_exists():
-    make_env_file()
-    load_dotenv(_env_path)
-else:
-    load_dotenv(_env_path)
+# .envファイルがなければ作成する（読み込みは EnvLoader が行う）
+# 作成した場合は書き込んだ内容を保持し、EnvLoader が .env を読み直さずに済むようにする
+_env_created: Optional[str] = None
+_env_stat = _try_stat(_env_path)
+if _env_stat is None:
+    _env_created = make_env_file()
+    _env_stat = _try_stat(_env_path)
 
 T = TypeVar("T")
 
+# 型変換に失敗したことを示す番兵
+_CAST_FAILED = object()
+
+
+# 真と判定する文字列（小文字）と、よく使われる表記（lower() を呼ばずに判定できる）
+_TRUTHY = frozenset(("true", "1", "yes"))
+_TRUTHY_FAST = _TRUTHY | frozenset(("True", "TRUE", "Yes", "YES"))
+_FALSY_FAST = frozenset(("false", "False", "FALSE", "0", "no", "No", "NO", ""))
+
+
+def _to_bool(value: Any) -> bool:
+    # 文字列"true"/"1"/"yes"を真と判定（大文字小文字は区別しない）
+    if isinstance(value, bool):
+        return value
+    if value in _TRUTHY_FAST:
+        return True
+    if value in _FALSY_FAST:
+        return False
+    return value.lower() in _TRUTHY  # type: ignore[no-any-return]
+
+
+def _to_list(value: Any) -> List[str]:
+    # JSON 配列（"[...]"）またはカンマ区切りの文字列を要素ごとに分割（前後の空白と空要素は除く）
+    if isinstance(value, str):
+        if value.lstrip().startswith("["):
+            return [str(item) for item in json.loads(value)]
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
+
+
+# 型 → 変換関数（登録のない型は型そのものを呼び出して変換する）
+_CASTERS: Dict[Type[Any], Any] = {
+    bool: _to_bool,
+    int: int,
+    float: float,
+    str: str,
+    list: _to_list,
+    frozenset: lambda value: frozenset(_to_list(value)),
+}
+
 
 class EnvLoader:
     """
@@ -67,6 +159,10 @@ class EnvLoader:
     変換に失敗した場合はデフォルト値を返します。
     """
 
+    # プロセス内のパース結果: .envの絶対パス → ((st_mtime_ns, st_size), 値の辞書)
+    # EnvLoader を複数生成しても同じ .env は1回しか読み込まない
+    _parsed: Dict[str, Tuple[Tuple[int, int], Dict[str, Optional[str]]]] = {}
+
     def __init__(self, env_file: str = ".env") -> None:
         """
         EnvLoaderを初期化
@@ -75,24 +171,138 @@ class EnvLoader:
             env_file: 環境変数ファイルのパス（デフォルト: ".env"）
         """
         self.env_file = env_file
+        # 型変換結果のキャッシュ（キー名, 変換先の型, 生の値）→ 変換後の値
+        self._resolved: Dict[Tuple[str, Type[Any], str], Any] = {}
+        # os.environ のスナップショット（os.environ.get はキーのエンコードを伴うため dict で参照する）
+        self._environ: Dict[str, str] = {}
         self._load_env()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        環境変数のスナップショットを os.environ と再同期する
+
+        プログラムから os.environ を変更した後、get に反映させたい場合に呼び出します。
+        """
+        self._environ = dict(os.environ)
 
     def _load_env(self) -> None:
         """
         環境変数ファイルを読み込む
 
+        python-dotenv で一括パースし、まとめて os.environ に反映します。
+        既に設定されている環境変数も .env の値で上書きします（.env が最優先）。
         ファイルが見つからない場合は警告を表示します。
+        PATCHCORE_ENV_READY が "1" の場合、または親プロセスが同じ .env を反映済みの場合は
+        読み込みを省略します。
         """
-        if not os.path.exists(self.env_file):
+        # オーケストレーターが環境変数を注入済みの場合は .env を読まない
+        ready = os.environ.get(ENV_READY_VAR)
+        if ready == "1":
+            return
+
+        st = _try_stat(self.env_file)
+        if st is None:
             print(f"[Warning] {self.env_file} が見つかりません")
             return
 
-        with open(self.env_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    os.environ[key.strip()] = value.strip()
+        # 親プロセスが同じ内容の .env を反映済み（環境変数を継承済み）なら読み込みを省略
+        stamp = f"{st.st_mtime_ns}:{st.st_size}"
+        if ready == stamp:
+            return
+
+        values = self._read_values(st)
+        os.environ.update({k: v for k, v in values.items() if v is not None})
+        os.environ[ENV_READY_VAR] = stamp
+
+    def _read_values(self, st: os.stat_result) -> Dict[str, Optional[str]]:
+        """
+        .env をパースして値の辞書を返す
+
+        パース結果は .env の更新時刻とサイズをキーにプロセス内とファイルにキャッシュし、
+        .env が変わっていなければ再生成時や次回以降の起動でパースを省略します。
+
+        Args:
+            st: .env の stat（存在確認時に取得したものを再利用）
+        """
+        cache_key = (st.st_mtime_ns, st.st_size)
+        parsed_key = os.path.abspath(self.env_file)
+        parsed = self._parsed.get(parsed_key)
+        if parsed is not None and parsed[0] == cache_key:
+            return parsed[1]
+
+        cache_path = self.env_file + ENV_CACHE_SUFFIX
+        values = self._load_cache(cache_path, cache_key)
+        if values is None:
+            values = self._parse(self.env_file)
+            self._save_cache(cache_path, cache_key, values)
+        self._parsed[parsed_key] = (cache_key, values)
+        return values
+
+    @classmethod
+    def _seed(cls, env_file: str, st: os.stat_result, text: str) -> None:
+        """内容が分かっている .env のパース結果をキャッシュに登録する（ファイルの読み直しを省略）"""
+        cache_key = (st.st_mtime_ns, st.st_size)
+        values = cls._parse(env_file, text)
+        cls._save_cache(env_file + ENV_CACHE_SUFFIX, cache_key, values)
+        cls._parsed[os.path.abspath(env_file)] = (cache_key, values)
+
+    @staticmethod
+    def _parse(env_file: str, text: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        .env をパースする
+
+        すべての行が単純な KEY=VALUE 形式（またはコメント・空行）であれば
+        正規表現1回でまとめて解析し、それ以外は python-dotenv に任せます。
+
+        Args:
+            env_file: .env のパス
+            text: .env の内容（既に手元にある場合。省略時はファイルから読み込む）
+        """
+        if text is None:
+            with open(env_file, "r", encoding="utf-8") as f:
+                text = f.read()
+
+        if not _COMPLEX_ENV_CHARS.intersection(text):
+            matches = _SIMPLE_ENV_LINE.findall(text)
+            entries = sum(
+                1
+                for line in text.splitlines()
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+            # 解析できない行（export 付き・= なしなど）が無い場合のみ結果を使う
+            if len(matches) == entries:
+                return {key: value.lstrip(" \t") for key, value in matches}
+
+        return dict(dotenv_values(stream=io.StringIO(text)))
+
+    @staticmethod
+    def _load_cache(
+        cache_path: str, cache_key: Tuple[int, int]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """キャッシュが .env と一致する場合のみ値の辞書を返す"""
+        try:
+            with open(cache_path, "rb") as f:
+                key, values = pickle.load(f)
+        except Exception:
+            return None
+        return values if key == cache_key else None  # type: ignore[no-any-return]
+
+    @staticmethod
+    def _save_cache(
+        cache_path: str, cache_key: Tuple[int, int], values: Dict[str, Optional[str]]
+    ) -> None:
+        """パース結果をキャッシュに保存（書き込みできない場合はキャッシュしない）"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((cache_key, values), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
     def get(self, key: str, default: Any = None, cast_type: Type[Any] = str) -> Any:  # type: ignore[assignment]
         """
@@ -114,91 +324,159 @@ class EnvLoader:
             >>> port = loader.get("API_PORT", 8000, int)
             >>> debug = loader.get("DEBUG", False, bool)
         """
-        value = os.getenv(key, default)
+        raw = self._environ.get(key)
+        if raw is None:
+            return self._cast(key, default, default, cast_type)
+
+        # 生の値をキーに含めるため、環境変数が変わればキャッシュは自動的に外れる
+        cache_key = (key, cast_type, raw)
+        try:
+            return self._resolved[cache_key]
+        except KeyError:
+            pass
 
+        value = self._cast(key, raw, _CAST_FAILED, cast_type)
+        if value is _CAST_FAILED:
+            return default
+        # list などの可変オブジェクトは呼び出し側で変更されうるためキャッシュしない
+        if not isinstance(value, (list, dict, set)):
+            self._resolved[cache_key] = value
+        return value
+
+    @staticmethod
+    def _cast(key: str, value: Any, default: Any, cast_type: Type[Any]) -> Any:
+        """値を cast_type に変換する（失敗時は警告を表示して default を返す）"""
         if value is None:
             return default
 
         try:
-            if cast_type is bool:
-                # boolの場合は特別処理(文字列"true"/"1"/"yes"を真と判定)
-                if isinstance(value, bool):
-                    return value  # type: ignore[return-value]
-                return value.lower() in ("true", "1", "yes")  # type: ignore[return-value, union-attr]
-            elif cast_type is int:
-                return int(value)  # type: ignore[return-value, arg-type]
-            elif cast_type is float:
-                return float(value)  # type: ignore[return-value, arg-type]
-            elif cast_type is str:
-                return str(value)  # type: ignore[return-value]
-            else:
-                return cast_type(value)  # type: ignore[return-value]
+            return _CASTERS.get(cast_type, cast_type)(value)
         except (ValueError, TypeError):
             print(f"[Warning] {key}の型変換に失敗しました。デフォルト値を使用します。")
             return default
 
 
-env_loader = EnvLoader()
-
-# ===== アプリケーション設定 =====
-APP_NAME: str = env_loader.get("APP_NAME", "PatchCoreBackend")
-APP_VERSION: str = env_loader.get("APP_VERSION", "1.0.0")
-DEBUG: bool = env_loader.get("DEBUG", False, bool)
-
-# ===== API設定 =====
-# サーバー設定（バインドアドレス - サーバーがリッスンするアドレス）
-API_SERVER_HOST: str = env_loader.get("API_SERVER_HOST", "0.0.0.0")
-API_SERVER_PORT: int = env_loader.get("API_SERVER_PORT", 8000, int)
-
-# クライアント設定（接続先アドレス - クライアントが接続するアドレス）
-API_CLIENT_HOST: str = env_loader.get("API_CLIENT_HOST", "127.0.0.1")
-API_CLIENT_PORT: int = env_loader.get("API_CLIENT_PORT", 8000, int)
-
-# 後方互換性のための旧変数名（非推奨、新コードではAPI_CLIENT_*を使用）
-API_HOST: str = API_CLIENT_HOST
-API_PORT: int = API_CLIENT_PORT
-
-API_RELOAD: bool = env_loader.get("API_RELOAD", False, bool)
-API_WORKERS: int = env_loader.get("API_WORKERS", 1, int)
-
-# ===== モデル設定 =====
-DEFAULT_MODEL_NAME: str = env_loader.get("DEFAULT_MODEL_NAME", "example_model")
-# 起動時にロードするモデル名（カンマ区切り）例: "model_a,model_b"
-LOADED_MODELS: str = env_loader.get("LOADED_MODELS", "")
-
-# ===== ジョブキュー設定 =====
-JOB_QUEUE_TTL: int = env_loader.get("JOB_QUEUE_TTL", 3600, int)
-
-# ===== ログ設定 =====
-LOG_LEVEL: str = env_loader.get("LOG_LEVEL", "INFO")
-LOG_DIR: str = env_loader.get("LOG_DIR", "logs")
+# .env を作成した直後は、書き込んだ内容からパース結果を用意しておく
+if _env_created is not None and _env_stat is not None:
+    EnvLoader._seed(str(_env_path), _env_stat, _env_created)
+env_loader = EnvLoader(str(_env_path))
+
+# ===== 設定定義 =====
+# 属性名 → (環境変数名, デフォルト値, 型)
+# 値はモジュール属性への初回アクセス時に解決してキャッシュする（PEP 562 の __getattr__）
+_SPEC: Dict[str, Tuple[str, Any, Type[Any]]] = {
+    # アプリケーション設定
+    "APP_NAME": ("APP_NAME", "PatchCoreBackend", str),
+    "APP_VERSION": ("APP_VERSION", "1.0.0", str),
+    "DEBUG": ("DEBUG", False, bool),
+    # サーバー設定（バインドアドレス - サーバーがリッスンするアドレス）
+    "API_SERVER_HOST": ("API_SERVER_HOST", "0.0.0.0", str),
+    "API_SERVER_PORT": ("API_SERVER_PORT", 8000, int),
+    # クライアント設定（接続先アドレス - クライアントが接続するアドレス）
+    "API_CLIENT_HOST": ("API_CLIENT_HOST", "127.0.0.1", str),
+    "API_CLIENT_PORT": ("API_CLIENT_PORT", 8000, int),
+    # 後方互換性のための旧変数名（非推奨、新コードではAPI_CLIENT_*を使用）
+    "API_HOST": ("API_CLIENT_HOST", "127.0.0.1", str),
+    "API_PORT": ("API_CLIENT_PORT", 8000, int),
+    "API_RELOAD": ("API_RELOAD", False, bool),
+    "API_WORKERS": ("API_WORKERS", 1, int),
+    # アップロード画像 1 枚あたりの最大サイズ（バイト）。超過時は 413 を返す
+    "MAX_UPLOAD_BYTES": ("MAX_UPLOAD_BYTES", 64 * 1024 * 1024, int),
+    # モデル設定
+    "DEFAULT_MODEL_NAME": ("DEFAULT_MODEL_NAME", "example_model", str),
+    # 起動時にロードするモデル名（カンマ区切り）例: "model_a,model_b"
+    "LOADED_MODELS": ("LOADED_MODELS", "", str),
+    # ジョブキュー設定
+    "JOB_QUEUE_TTL": ("JOB_QUEUE_TTL", 3600, int),
+    # ログ設定
+    "LOG_LEVEL": ("LOG_LEVEL", "INFO", str),
+    "LOG_DIR": ("LOG_DIR", "logs", str),
+    # GPU設定
+    "USE_GPU": ("USE_GPU", False, bool),
+    "GPU_DEVICE_ID": ("GPU_DEVICE_ID", 0, int),
+    "USE_MIXED_PRECISION": ("USE_MIXED_PRECISION", True, bool),
+    # CPU最適化設定
+    "CPU_THREADS": ("CPU_THREADS", 4, int),
+    "CPU_MEMORY_EFFICIENT": ("CPU_MEMORY_EFFICIENT", True, bool),
+    # データ設定
+    "DATA_DIR": ("DATA_DIR", "datasets", str),
+    "MODEL_DIR": ("MODEL_DIR", "models", str),
+    "SETTINGS_DIR": ("SETTINGS_DIR", "settings", str),
+    # キャッシュ設定
+    "MAX_CACHE_IMAGES": ("MAX_CACHE_IMAGES", 1200, int),
+    "CACHE_TTL": ("CACHE_TTL", 3600, int),
+    # NG画像保存設定
+    "NG_IMAGE_SAVE": ("NG_IMAGE_SAVE", True, bool),
+    # セキュリティ設定
+    "API_KEY": ("API_KEY", "your-secret-api-key-here", str),
+    # 許可オリジン（所属判定を O(1) で行えるよう frozenset で保持）
+    "ALLOWED_ORIGINS": (
+        "ALLOWED_ORIGINS",
+        frozenset(("http://localhost:3000", "http://localhost:8000")),
+        frozenset,
+    ),
+}
+
+# 型注釈のみ（値は __getattr__ で解決される）
+APP_NAME: str
+APP_VERSION: str
+DEBUG: bool
+API_SERVER_HOST: str
+API_SERVER_PORT: int
+API_CLIENT_HOST: str
+API_CLIENT_PORT: int
+API_HOST: str
+API_PORT: int
+API_RELOAD: bool
+API_WORKERS: int
+MAX_UPLOAD_BYTES: int
+DEFAULT_MODEL_NAME: str
+LOADED_MODELS: str
+JOB_QUEUE_TTL: int
+LOG_LEVEL: str
+LOG_DIR: str
+USE_GPU: bool
+GPU_DEVICE_ID: int
+USE_MIXED_PRECISION: bool
+CPU_THREADS: int
+CPU_MEMORY_EFFICIENT: bool
+DATA_DIR: str
+MODEL_DIR: str
+SETTINGS_DIR: str
+MAX_CACHE_IMAGES: int
+CACHE_TTL: int
+NG_IMAGE_SAVE: bool
+API_KEY: str
+ALLOWED_ORIGINS: FrozenSet[str]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    設定値を初回アクセス時に解決する（PEP 562）
 
-# ===== GPU設定 =====
-USE_GPU: bool = env_loader.get("USE_GPU", False, bool)
-GPU_DEVICE_ID: int = env_loader.get("GPU_DEVICE_ID", 0, int)
-USE_MIXED_PRECISION: bool = env_loader.get("USE_MIXED_PRECISION", True, bool)
+    解決した値はモジュールのグローバルに保存し、2 回目以降は通常の属性参照になります。
 
-# ===== CPU最適化設定 =====
-CPU_THREADS: int = env_loader.get("CPU_THREADS", 4, int)
-CPU_MEMORY_EFFICIENT: bool = env_loader.get("CPU_MEMORY_EFFICIENT", True, bool)
+    Raises:
+        AttributeError: 未定義の設定名の場合
+    """
+    spec = _SPEC.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = env_loader.get(*spec)
+    globals()[name] = value
+    return value
 
-# ===== データ設定 =====
-DATA_DIR: str = env_loader.get("DATA_DIR", "datasets")
-MODEL_DIR: str = env_loader.get("MODEL_DIR", "models")
-SETTINGS_DIR: str = env_loader.get("SETTINGS_DIR", "settings")
 
-# ===== キャッシュ設定 =====
-MAX_CACHE_IMAGES: int = env_loader.get("MAX_CACHE_IMAGES", 1200, int)
-CACHE_TTL: int = env_loader.get("CACHE_TTL", 3600, int)
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SPEC))
 
-# ===== NG画像保存設定 =====
-NG_IMAGE_SAVE: bool = env_loader.get("NG_IMAGE_SAVE", True, bool)
 
-# ===== セキュリティ設定 =====
-API_KEY: str = env_loader.get("API_KEY", "your-secret-api-key-here")
-ALLOWED_ORIGINS: List[str] = env_loader.get(  # type: ignore[assignment]
-    "ALLOWED_ORIGINS", ["http://localhost:3000", "http://localhost:8000"], list
-)
+def _setting(name: str) -> Any:
+    """モジュール内の関数から設定値を参照する（グローバル参照は __getattr__ を経由しないため）"""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
 
 
 def get_cpu_optimization() -> Dict[str, Any]:
@@ -218,29 +496,57 @@ def get_cpu_optimization() -> Dict[str, Any]:
         4
     """
     return {
-        "threads": CPU_THREADS,
-        "memory_efficient": CPU_MEMORY_EFFICIENT,
+        "threads": _setting("CPU_THREADS"),
+        "memory_efficient": _setting("CPU_MEMORY_EFFICIENT"),
     }
 
 
+@lru_cache(maxsize=None)
+def get_settings() -> Mapping[str, Any]:
+    """
+    全設定値を読み取り専用の辞書として取得
+
+    初回呼び出し時に未解決の設定をまとめて解決し、以降は同じオブジェクトを返します。
+    ループ内などで複数の設定を参照する場合は、戻り値をローカル変数に保持して使用してください。
+
+    Returns:
+        設定名 → 値の読み取り専用マッピング（MappingProxyType）
+
+    Example:
+        >>> settings = get_settings()
+        >>> print(settings["API_SERVER_PORT"])
+        8000
+    """
+    return MappingProxyType({name: _setting(name) for name in _SPEC})
+
+
+# print_config で表示する設定名（表示順）
+_PRINT_CONFIG_NAMES: Tuple[str, ...] = (
+    "APP_NAME",
+    "DEBUG",
+    "API_HOST",
+    "API_PORT",
+    "DEFAULT_MODEL_NAME",
+    "USE_GPU",
+    "GPU_DEVICE_ID",
+    "LOG_LEVEL",
+    "MAX_CACHE_IMAGES",
+    "NG_IMAGE_SAVE",
+)
+
+
 def print_config() -> None:
     """
     デバッグ用：読み込まれた設定を表示
 
     主要な環境変数設定をコンソールに出力します。
     """
-    print("=== 環境変数設定 ===")
-    print(f"APP_NAME: {APP_NAME}")
-    print(f"DEBUG: {DEBUG}")
-    print(f"API_HOST: {API_HOST}")
-    print(f"API_PORT: {API_PORT}")
-    print(f"DEFAULT_MODEL_NAME: {DEFAULT_MODEL_NAME}")
-    print(f"USE_GPU: {USE_GPU}")
-    print(f"GPU_DEVICE_ID: {GPU_DEVICE_ID}")
-    print(f"LOG_LEVEL: {LOG_LEVEL}")
-    print(f"MAX_CACHE_IMAGES: {MAX_CACHE_IMAGES}")
-    print(f"NG_IMAGE_SAVE: {NG_IMAGE_SAVE}")
-    print("=" * 30)
+    lines = ["=== 環境変数設定 ==="]
+    lines.extend(f"{name}: {_setting(name)}" for name in _PRINT_CONFIG_NAMES)
+    lines.append("=" * 30)
+    # 1回の書き込みで出力し、他スレッドの出力と行が混ざらないようにする
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
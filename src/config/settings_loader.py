@@ -5,10 +5,138 @@
 """
 
 import os
+import pickle
+import stat
 import importlib.util
-from typing import Any, Tuple, List, Dict, Optional
+from types import SimpleNamespace
+from typing import Any, Callable, Tuple, List, Dict, Optional
 from src.config import env_loader
 
+# settings.py の評価結果キャッシュの拡張子（settings.py と同じディレクトリに作成）
+SETTINGS_CACHE_SUFFIX = ".cache.pkl"
+
+# settings.py をコンパイルする際の最適化レベル（2: docstring と assert を除去）
+SETTINGS_OPTIMIZE = 2
+
+# settings.pyで定義されている設定のうち、環境変数で上書き可能なもの
+# 設定名 → (env_loader の属性名, 型)
+_ENV_OVERRIDE_MAP: Dict[str, Tuple[Optional[str], Optional[type]]] = {
+    "USE_GPU": ("USE_GPU", bool),
+    "GPU_DEVICE_ID": ("GPU_DEVICE_ID", int),
+    "USE_MIXED_PRECISION": ("USE_MIXED_PRECISION", bool),
+    "CPU_OPTIMIZATION": (None, None),  # 特殊処理
+    "MAX_CACHE_IMAGE": ("MAX_CACHE_IMAGES", int),
+    "NG_IMAGE_SAVE": ("NG_IMAGE_SAVE", bool),
+}
+
+# .envファイルが実際に存在する場合のみ環境変数でオーバーライドする（import 時の確認結果を再利用）
+_ENV_FILE_PRESENT = env_loader._env_stat is not None
+
+
+# 未定義の設定を表す番兵
+_MISSING = object()
+
+
+def _check_affine_points(value: Any) -> List[str]:
+    if not isinstance(value, list) or len(value) != 4:
+        return ["AFFINE_POINTS は4点のリストである必要があります"]
+    # 各点が[x, y]形式か確認
+    return [
+        f"AFFINE_POINTS[{i}] は [x, y] 形式である必要があります"
+        for i, point in enumerate(value)
+        if not isinstance(point, (list, tuple)) or len(point) != 2
+    ]
+
+
+def _check_image_size(value: Any) -> List[str]:
+    if not isinstance(value, (tuple, list)) or len(value) != 2:
+        return ["IMAGE_SIZE は (width, height) のタプルである必要があります"]
+    if not all(isinstance(x, int) and x > 0 for x in value):
+        return ["IMAGE_SIZE の値は正の整数である必要があります"]
+    return []
+
+
+def _check_positive(name: str) -> Callable[[Any], List[str]]:
+    def check(value: Any) -> List[str]:
+        if not isinstance(value, (int, float)) or value <= 0:
+            return [f"{name} は正の数値である必要があります"]
+        return []
+
+    return check
+
+
+def _check_z_area(value: Any) -> List[str]:
+    # Z_AREA_THRESHOLDは0以上のピクセル数
+    if not isinstance(value, (int, float)) or value < 0:
+        return ["Z_AREA_THRESHOLD は0以上の数値である必要があります"]
+    return []
+
+
+def _check_pca_variance(value: Any) -> List[str]:
+    if not isinstance(value, (int, float)) or not (0 < value <= 1):
+        return ["PCA_VARIANCE は 0 < x <= 1 の範囲である必要があります"]
+    return []
+
+
+def _check_feature_depth(value: Any) -> List[str]:
+    if not isinstance(value, int) or value not in (1, 2, 3, 4):
+        return ["FEATURE_DEPTH は 1, 2, 3, 4 のいずれかである必要があります"]
+    return []
+
+
+def _check_save_format(value: Any) -> List[str]:
+    if value not in ("compressed", "full"):
+        return ["SAVE_FORMAT は 'compressed' または 'full' である必要があります"]
+    return []
+
+
+def _check_enable_augment(value: Any) -> List[str]:
+    if not isinstance(value, bool):
+        return ["ENABLE_AUGMENT は True または False である必要があります"]
+    return []
+
+
+# 必須設定と検証関数（settings.py固有の設定のみ）。検証関数はエラーメッセージのリストを返す
+_SETTINGS_SCHEMA: Tuple[Tuple[str, Callable[[Any], List[str]]], ...] = (
+    ("AFFINE_POINTS", _check_affine_points),  # GUIで設定
+    ("IMAGE_SIZE", _check_image_size),  # モデル設計
+    ("Z_SCORE_THRESHOLD", _check_positive("Z_SCORE_THRESHOLD")),  # 異常検出コア設定
+    ("Z_AREA_THRESHOLD", _check_z_area),  # 異常検出コア設定
+    ("Z_MAX_THRESHOLD", _check_positive("Z_MAX_THRESHOLD")),  # 異常検出コア設定
+    ("PCA_VARIANCE", _check_pca_variance),  # 異常検出に関与
+    ("FEATURE_DEPTH", _check_feature_depth),  # モデル設計
+    ("SAVE_FORMAT", _check_save_format),  # モデル保存形式
+    ("ENABLE_AUGMENT", _check_enable_augment),  # 学習コア設定
+)
+
+
+def _check_scoring_method(value: Any) -> List[str]:
+    if value not in ("mean", "knn"):
+        return ["SCORING_METHOD は 'mean' または 'knn' である必要があります"]
+    return []
+
+
+def _check_score_upsample_mode(value: Any) -> List[str]:
+    if value not in ("bicubic", "bilinear"):
+        return [
+            "SCORE_UPSAMPLE_MODE は 'bicubic' または 'bilinear' である必要があります"
+        ]
+    return []
+
+
+def _check_quantize_int8(value: Any) -> List[str]:
+    if not isinstance(value, bool):
+        return ["QUANTIZE_INT8 は True または False である必要があります"]
+    return []
+
+
+# 任意設定と検証関数（未定義の場合は既定値を使用する）
+_OPTIONAL_SETTINGS_SCHEMA: Tuple[Tuple[str, Callable[[Any], List[str]]], ...] = (
+    ("SCORING_METHOD", _check_scoring_method),  # 異常スコアの計算方式
+    ("SCORE_UPSAMPLE_MODE", _check_score_upsample_mode),  # スコアマップの拡大方式
+    ("QUANTIZE_INT8", _check_quantize_int8),  # CPU 向け int8 量子化モデル
+)
+
 
 class SettingsLoader:
     """
@@ -17,6 +145,9 @@ class SettingsLoader:
     環境変数による設定のオーバーライドをサポートします。
     """
 
+    # プロセス内の設定値キャッシュ: settings.pyの絶対パス → ((st_mtime_ns, st_size), 設定値)
+    _memo: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
     def __init__(self, settings_path: str) -> None:
         """
         SettingsLoaderを初期化し、settings.pyを読み込む
@@ -29,17 +160,18 @@ class SettingsLoader:
             RuntimeError: settings.pyの読み込みに失敗した場合
         """
         self.settings_path = settings_path
-        if not os.path.isfile(settings_path):
+        st = env_loader._try_stat(settings_path)
+        if st is None or not stat.S_ISREG(st.st_mode):
             raise FileNotFoundError(
                 f"{settings_path} が存在しません。settings.py を配置してください。"
             )
 
         try:
-            self.reload()
+            self.reload(st)
         except Exception as e:
             raise RuntimeError(f"settings.py の読み込みに失敗しました: {e}")
 
-    def get_variable(self, name: str) -> Any:
+    def get_variable(self, name: str, default: Any = _MISSING) -> Any:
         """
         settings.pyから変数を取得（環境変数でオーバーライド可能）
 
@@ -47,12 +179,13 @@ class SettingsLoader:
 
         Args:
             name: 取得する変数名
+            default: 変数が定義されていない場合の値（省略時は AttributeError）
 
         Returns:
             変数の値（環境変数でオーバーライドされる場合はその値）
 
         Raises:
-            AttributeError: 変数がsettings.pyに定義されていない場合
+            AttributeError: 変数がsettings.pyに定義されておらず、default も指定されていない場合
 
         Example:
             >>> loader = SettingsLoader("models/example_model/settings.py")
@@ -60,52 +193,159 @@ class SettingsLoader:
             >>> print(image_size)
             (256, 256)
         """
-        # 環境変数からのオーバーライドマッピング
-        # settings.pyで定義されている設定のうち、環境変数で上書き可能なもの
-        env_override_map: Dict[str, Tuple[Optional[str], Optional[type]]] = {
-            "USE_GPU": ("USE_GPU", bool),
-            "GPU_DEVICE_ID": ("GPU_DEVICE_ID", int),
-            "USE_MIXED_PRECISION": ("USE_MIXED_PRECISION", bool),
-            "CPU_OPTIMIZATION": (None, None),  # 特殊処理
-            "MAX_CACHE_IMAGE": ("MAX_CACHE_IMAGES", int),
-            "NG_IMAGE_SAVE": ("NG_IMAGE_SAVE", bool),
-        }
-
-        # 環境変数でのオーバーライドを試みる
-        if name in env_override_map:
-            env_key, cast_type = env_override_map[name]
-
-            # CPU_OPTIMIZATIONの特殊処理
-            if name == "CPU_OPTIMIZATION":
-                return env_loader.get_cpu_optimization()
-
-            # 環境変数が設定されているか確認
-            env_value = getattr(env_loader, env_key if env_key else "", None)
-            if env_value is not None:
-                # .envファイルが実際に存在し、値が設定されている場合のみオーバーライド
-                if hasattr(env_loader, "_env_path") and env_loader._env_path.exists():
-                    return env_value
-
-        # settings.pyから値を取得
-        if not hasattr(self.module, name):
+        # 環境変数のオーバーライドと参照済みの値は reload 時に初期化した辞書にある
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        # settings.pyから値を取得（reload まで結果を保持）
+        try:
+            value = vars(self.module)[name]
+        except KeyError:
+            if default is not _MISSING:
+                return default
             raise AttributeError(
                 f"{name} が {self.module.__name__} に定義されていません。"
-            )
-        return getattr(self.module, name)
+            ) from None
+        self._values[name] = value
+        return value
 
-    def reload(self) -> None:
+    def reload(self, st: Optional[os.stat_result] = None) -> None:
         """
         設定ファイルを再読み込み
 
         settings.pyの内容が変更された場合に、変更を反映させるために使用します。
+        settings.py の更新日時・サイズが前回と同じ場合は、評価済みの設定値を
+        キャッシュ（settings.py.cache.pkl）から読み込み、ファイルの実行を省略します。
+        環境変数のスナップショットもここで再同期します。
+
+        Args:
+            st: settings.py の stat（取得済みの場合。省略時はここで取得する）
         """
+        # 起動後に変更された環境変数を env_loader.get に反映する
+        env_loader.env_loader.refresh()
+        if st is None:
+            st = os.stat(self.settings_path)
+        values = self._load_module(st)
+        # 全設定値を登録し、環境変数のオーバーライドで上書きする（get_variable は辞書を引くだけ）
+        self._values: Dict[str, Any] = {**values, **self._resolve_env_overrides()}
+        # 検証結果（validate_model_settings の初回呼び出し時に計算）
+        self._validation: Optional[Tuple[bool, List[str]]] = None
+
+    def _load_module(self, st: os.stat_result) -> Dict[str, Any]:
+        """
+        settings.py を読み込み、設定値（大文字の変数）の辞書を返す
+
+        self.module はキャッシュの有無によらず、設定値のみを持つ名前空間になります。
+
+        プロセス内のキャッシュ、ファイルのキャッシュの順に確認し、
+        どちらも一致しない場合のみ settings.py を実行します。
+        """
+        cache_key = (st.st_mtime_ns, st.st_size)
+        memo_key = os.path.abspath(self.settings_path)
+
+        # 同じプロセスで読み込み済みかつ未変更なら、ファイルを開かずに再利用
+        memo = self._memo.get(memo_key)
+        if memo is not None and memo[0] == cache_key:
+            self.module = SimpleNamespace(__name__="settings", **memo[1])
+            return memo[1]
+
+        cache_path = self.settings_path + SETTINGS_CACHE_SUFFIX
+        cached = self._load_cache(cache_path, cache_key)
+        if cached is not None:
+            self._memo[memo_key] = (cache_key, cached)
+            self.module = SimpleNamespace(__name__="settings", **cached)
+            return cached
+
         spec = importlib.util.spec_from_file_location("settings", self.settings_path)
         if spec is None or spec.loader is None:
             raise ImportError(
                 f"設定ファイルの読み込みに失敗しました: {self.settings_path}"
             )
-        self.module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(self.module)
+        # settings.py は値の定義のみなので、docstring と assert を除いてコンパイルする
+        with open(self.settings_path, "rb") as f:
+            code = compile(
+                f.read(), self.settings_path, "exec", optimize=SETTINGS_OPTIMIZE
+            )
+        module = importlib.util.module_from_spec(spec)
+        exec(code, module.__dict__)
+        values = self._extract_values(module)
+        # キャッシュから読み込んだ場合と同じく、設定値だけを持つ名前空間にする
+        self.module = SimpleNamespace(__name__="settings", **values)
+        self._memo[memo_key] = (cache_key, values)
+        self._save_cache(cache_path, cache_key, values)
+        return values
+
+    @staticmethod
+    def _resolve_env_overrides() -> Dict[str, Any]:
+        """
+        環境変数でオーバーライドする設定値を解決する
+
+        CPU_OPTIMIZATION は常に環境変数の値を使用し、それ以外は .env ファイルが
+        実際に存在し、値が設定されている場合のみオーバーライドします。
+        env_loader のモジュール属性は初回の値を保持し続けるため、reload で
+        環境変数の変更を反映できるよう env_loader.env_loader.get で毎回解決します。
+        """
+
+        def resolve(env_key: str) -> Any:
+            return env_loader.env_loader.get(*env_loader._SPEC[env_key])
+
+        overrides: Dict[str, Any] = {}
+        for name, (env_key, _) in _ENV_OVERRIDE_MAP.items():
+            # CPU_OPTIMIZATIONの特殊処理（env_loader.get_cpu_optimization() と同じ形式）
+            if name == "CPU_OPTIMIZATION":
+                overrides[name] = {
+                    "threads": resolve("CPU_THREADS"),
+                    "memory_efficient": resolve("CPU_MEMORY_EFFICIENT"),
+                }
+                continue
+            if not _ENV_FILE_PRESENT or env_key is None:
+                continue
+            env_value = resolve(env_key)
+            if env_value is not None:
+                overrides[name] = env_value
+        return overrides
+
+    @staticmethod
+    def _load_cache(
+        cache_path: str, cache_key: Tuple[int, int]
+    ) -> Optional[Dict[str, Any]]:
+        """キャッシュが settings.py と一致する場合のみ設定値の辞書を返す"""
+        try:
+            with open(cache_path, "rb") as f:
+                key, values = pickle.load(f)
+        except Exception:
+            return None
+        return values if key == cache_key else None  # type: ignore[no-any-return]
+
+    @staticmethod
+    def _extract_values(module: Any) -> Dict[str, Any]:
+        """settings.py の設定値（大文字の変数）を辞書で返す"""
+        return {
+            name: value
+            for name, value in vars(module).items()
+            if name.isupper() and not name.startswith("_")
+        }
+
+    @staticmethod
+    def _save_cache(
+        cache_path: str, cache_key: Tuple[int, int], values: Dict[str, Any]
+    ) -> None:
+        """
+        settings.py の設定値をキャッシュに保存
+
+        pickle できない値を含む場合や書き込みできない場合はキャッシュしない。
+        """
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((cache_key, values), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
     def validate_model_settings(self) -> Tuple[bool, List[str]]:
         """
@@ -114,6 +354,8 @@ class SettingsLoader:
         settings.pyの必須項目と値の範囲をチェックします。
         環境変数でオーバーライドされる設定は検証対象外です。
 
+        検証結果は reload まで保持し、2回目以降は検証を省略します。
+
         Returns:
             検証結果のタプル
             - bool: 検証が成功した場合True、失敗した場合False
@@ -126,91 +368,23 @@ class SettingsLoader:
             ...     for error in errors:
             ...         print(f"検証エラー: {error}")
         """
-        errors: List[str] = []
+        if self._validation is not None:
+            is_valid, errors = self._validation
+            return is_valid, list(errors)
 
-        # 必須設定の確認（settings.py固有の設定のみ）
-        required_vars = [
-            "AFFINE_POINTS",  # GUIで設定
-            "IMAGE_SIZE",  # モデル設計
-            "Z_SCORE_THRESHOLD",  # 異常検出コア設定
-            "Z_AREA_THRESHOLD",  # 異常検出コア設定
-            "Z_MAX_THRESHOLD",  # 異常検出コア設定
-            "PCA_VARIANCE",  # 異常検出に関与
-            "FEATURE_DEPTH",  # モデル設計
-            "SAVE_FORMAT",  # モデル保存形式
-            "ENABLE_AUGMENT",  # 学習コア設定
-        ]
-
-        for var in required_vars:
-            try:
-                self.get_variable(var)
-            except AttributeError:
-                errors.append(f"必須設定 '{var}' が定義されていません")
-
-        # 設定値の検証
-        try:
-            # AFFINE_POINTS検証
-            affine_points = self.get_variable("AFFINE_POINTS")
-            if not isinstance(affine_points, list) or len(affine_points) != 4:
-                errors.append("AFFINE_POINTS は4点のリストである必要があります")
-            else:
-                # 各点が[x, y]形式か確認
-                for i, point in enumerate(affine_points):
-                    if not isinstance(point, (list, tuple)) or len(point) != 2:
-                        errors.append(
-                            f"AFFINE_POINTS[{i}] は [x, y] 形式である必要があります"
-                        )
-
-            # IMAGE_SIZE検証
-            image_size = self.get_variable("IMAGE_SIZE")
-            if not isinstance(image_size, (tuple, list)) or len(image_size) != 2:
-                errors.append(
-                    "IMAGE_SIZE は (width, height) のタプルである必要があります"
-                )
+        errors: List[str] = []
+        # 検証対象は環境変数でオーバーライドされない設定のみなので、モジュールを直接参照する
+        for name, validate in _SETTINGS_SCHEMA:
+            value = getattr(self.module, name, _MISSING)
+            if value is _MISSING:
+                errors.append(f"必須設定 '{name}' が定義されていません")
             else:
-                if not all(isinstance(x, int) and x > 0 for x in image_size):
-                    errors.append("IMAGE_SIZE の値は正の整数である必要があります")
-
-            # しきい値チェック
-            for threshold_name in ["Z_SCORE_THRESHOLD", "Z_MAX_THRESHOLD"]:
-                threshold = self.get_variable(threshold_name)
-                if not isinstance(threshold, (int, float)) or threshold <= 0:
-                    errors.append(f"{threshold_name} は正の数値である必要があります")
-
-            # Z_AREA_THRESHOLDは0以上のピクセル数
-            z_area = self.get_variable("Z_AREA_THRESHOLD")
-            if not isinstance(z_area, (int, float)) or z_area < 0:
-                errors.append("Z_AREA_THRESHOLD は0以上の数値である必要があります")
-
-            # PCA設定チェック（異常検出に関与）
-            pca_variance = self.get_variable("PCA_VARIANCE")
-            if not isinstance(pca_variance, (int, float)) or not (
-                0 < pca_variance <= 1
-            ):
-                errors.append("PCA_VARIANCE は 0 < x <= 1 の範囲である必要があります")
-
-            # 特徴深度チェック
-            feature_depth = self.get_variable("FEATURE_DEPTH")
-            if not isinstance(feature_depth, int) or feature_depth not in [1, 2, 3, 4]:
-                errors.append(
-                    "FEATURE_DEPTH は 1, 2, 3, 4 のいずれかである必要があります"
-                )
-
-            # 保存形式チェック
-            save_format = self.get_variable("SAVE_FORMAT")
-            if save_format not in ["compressed", "full"]:
-                errors.append(
-                    "SAVE_FORMAT は 'compressed' または 'full' である必要があります"
-                )
-
-            # データ拡張設定チェック
-            enable_augment = self.get_variable("ENABLE_AUGMENT")
-            if not isinstance(enable_augment, bool):
-                errors.append(
-                    "ENABLE_AUGMENT は True または False である必要があります"
-                )
-
-        except AttributeError as e:
-            errors.append(str(e))
-
-        return len(errors) == 0, errors
+                errors.extend(validate(value))
+        # 任意設定は定義されている場合のみ検証する
+        for name, validate in _OPTIONAL_SETTINGS_SCHEMA:
+            value = getattr(self.module, name, _MISSING)
+            if value is not _MISSING:
+                errors.extend(validate(value))
+
+        self._validation = (len(errors) == 0, errors)
+        return len(errors) == 0, list(errors)
@@ -4,10 +4,22 @@ import cv2
 import torch
 import numpy as np
 from src.ml_engines.PatchCore.utils.inference_utils import (
-    preprocess_cv2,
     load_image_unicode_path,
+    to_input_tensor,
+    warp_image,
 )
-from src.ml_engines.PatchCore.utils.score_utils import evaluate_z_score_map, is_ok_z
+from src.ml_engines.PatchCore.utils.score_utils import (
+    UPSAMPLE_BICUBIC,
+    evaluate_z_score_map,
+    inverse_pixel_std,
+    is_ok_z,
+    to_z_score_map,
+    upsample_score_maps,
+)
+from src.ml_engines.PatchCore.utils.nn_scorer import NearestNeighborScorer
+
+# 検査結果の表示用画像（オーバーレイ）のサイズ（幅, 高さ）
+DISPLAY_SIZE = (400, 400)
 
 
 class GpuAssets:
@@ -19,7 +31,7 @@ class GpuAssets:
         ).to(device)
         self.pca_mean_t = torch.from_numpy(pca.mean_.astype(np.float32)).to(device)
         self.bank_mean_t = torch.from_numpy(
-            memory_bank.mean(axis=0).astype(np.float32)
+            memory_bank.mean(axis=0, dtype=np.float32)
         ).to(device)
 
 
@@ -37,14 +49,18 @@ def run_inference_on_image(
     z_max_threshold,
     device: Optional[torch.device] = None,
     gpu_assets: Optional[GpuAssets] = None,
+    scorer: Optional[NearestNeighborScorer] = None,
+    upsample_mode: str = UPSAMPLE_BICUBIC,
+    pixel_inv_std: Optional[np.ndarray] = None,
+    image: Optional[np.ndarray] = None,
 ) -> Tuple[np.ndarray, dict, bool]:
-    image = load_image_unicode_path(image_path)
-    inputs = preprocess_cv2(image, affine_points, image_size)
-
-    if device is not None:
-        inputs = inputs.to(device)
+    # 読み込み済みの画像が渡された場合はファイルを読まない（先読みする呼び出し側向け）
+    if image is None:
+        image = load_image_unicode_path(image_path)
+    warped = warp_image(image, affine_points, image_size)
+    inputs = to_input_tensor(warped, device)
 
-    with torch.no_grad():
+    with torch.inference_mode():
         fmap = model(inputs)
         patches = fmap.squeeze(0).permute(1, 2, 0).reshape(-1, fmap.size(1))
 
@@ -54,39 +70,52 @@ def run_inference_on_image(
             patches_pca = (
                 patches - gpu_assets.pca_mean_t
             ) @ gpu_assets.pca_components_t
-            scores = torch.norm(patches_pca - gpu_assets.bank_mean_t, dim=1)
-            score_map = scores.reshape(fmap.shape[2], fmap.shape[3]).cpu().numpy()
+            if scorer is not None:
+                score_map = scorer.score(patches_pca).reshape(
+                    fmap.shape[2], fmap.shape[3]
+                )
+            else:
+                scores = torch.norm(patches_pca - gpu_assets.bank_mean_t, dim=1)
+                score_map = scores.reshape(fmap.shape[2], fmap.shape[3])
         else:
             # CPU fallback
             patches_np = patches.cpu().numpy() if patches.is_cuda else patches.numpy()
             patches_np = pca.transform(patches_np)
-            scores_np = np.linalg.norm(patches_np - memory_bank.mean(axis=0), axis=1)
+            if scorer is not None:
+                scores_np = scorer.score(patches_np)
+            else:
+                bank_mean = memory_bank.mean(axis=0, dtype=np.float32)
+                scores_np = np.linalg.norm(patches_np - bank_mean, axis=1)
             score_map = scores_np.reshape(fmap.shape[2], fmap.shape[3])
 
-        raw_score_map = cv2.resize(score_map, image_size, interpolation=cv2.INTER_CUBIC)
+        raw_score_map = upsample_score_maps(score_map[None], image_size, upsample_mode)[
+            0
+        ]
 
-    pixel_std_safe = np.where(pixel_std == 0, 1e-6, pixel_std)
-    z_score_map = (raw_score_map - pixel_mean) / pixel_std_safe
+    # 複数画像を処理する場合は inverse_pixel_std() の結果を渡して再計算を省く
+    if pixel_inv_std is None:
+        pixel_inv_std = inverse_pixel_std(pixel_std)
+    z_score_map = to_z_score_map(raw_score_map, pixel_mean, pixel_inv_std)
 
     z_stats = evaluate_z_score_map(z_score_map, z_score_threshold)
     is_ok = is_ok_z(z_stats, z_area_threshold, z_max_threshold)
 
+    # 可視化は表示サイズで行う（判定は画像サイズの Zスコアマップで済ませてある）。
+    # 合成後に縮小する代わりに、Zスコアマップを縮小し入力画像は表示サイズへ直接射影変換する
+    if tuple(image_size) != DISPLAY_SIZE:
+        z_score_map = cv2.resize(z_score_map, DISPLAY_SIZE)
+        warped = warp_image(image, affine_points, DISPLAY_SIZE)
+
     z_score_map_vis = np.clip(z_score_map, 0, 5.0)
     z_score_map_vis = (z_score_map_vis / 5.0 * 255).astype(np.uint8)
     heatmap = cv2.applyColorMap(z_score_map_vis, cv2.COLORMAP_JET)
 
-    input_img = inputs.squeeze(0).permute(1, 2, 0)
-    if input_img.is_cuda:
-        input_img = input_img.cpu()
-    input_img = (input_img.numpy() * 255).astype(np.uint8)
-
     overlay = cv2.addWeighted(
-        cv2.cvtColor(input_img, cv2.COLOR_RGB2BGR),
+        cv2.cvtColor(warped, cv2.COLOR_RGB2BGR),
         0.6,
         heatmap,
         0.4,
         0,
     )
-    overlay = cv2.resize(overlay, [400, 400])
 
     return overlay, z_stats, is_ok
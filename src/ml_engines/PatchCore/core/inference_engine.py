@@ -6,23 +6,87 @@ PatchCore モデルを使用した異常検出推論を実行します。
 """
 
 import os
+import queue
+import time
 import uuid
 from collections import OrderedDict
+from itertools import islice
 from datetime import datetime
-from typing import Optional, Literal, Dict, Any, cast
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+    cast,
+)
 import numpy as np
 import cv2
 import threading
 import torch
-from sklearn.decomposition import PCA  # noqa: F401
 from src.config.settings_loader import SettingsLoader
 from src.ml_engines.PatchCore.utils.model_loader import load_model_and_assets
-from src.ml_engines.PatchCore.utils.inference_utils import preprocess_cv2
-from src.ml_engines.PatchCore.utils.score_utils import evaluate_z_score_map, is_ok_z
-from src.ml_engines.PatchCore.utils.device_utils import get_device, clear_gpu_cache
+from src.ml_engines.PatchCore.utils.inference_utils import (
+    InputBuffers,
+    perspective_matrix,
+)
+from src.ml_engines.PatchCore.utils.score_utils import (
+    UPSAMPLE_BICUBIC,
+    evaluate_z_score_map,
+    inverse_pixel_std,
+    is_ok_z,
+    upsample_z_score_map,
+)
+from src.ml_engines.PatchCore.utils.device_utils import (
+    clear_gpu_cache,
+    get_device,
+    select_quantized_engine,
+)
+from src.ml_engines.PatchCore.utils.nn_scorer import (
+    NearestNeighborScorer,
+    SCORING_KNN,
+    SCORING_MEAN,
+)
 from src.utils.logger import setup_logger
 from src.types import PredictionResult
 
+# 推論結果ログのバッファサイズ（バイト）。ログファイルは日付が変わるまで開いたままにする
+LOG_BUFFER_SIZE = 1 << 16
+
+# 推論結果ログをバッファから書き出す最大間隔（秒）。NG.log は行単位で書き出す
+LOG_FLUSH_INTERVAL = 1.0
+
+# NG画像保存キューの上限（超えた分は保存せずに破棄し、推論側を待たせない）
+NG_SAVE_QUEUE_SIZE = 64
+
+# NG画像保存キューの項目（保存先ディレクトリ, 画像ID, オーバーレイ画像, 元画像）
+NgSaveItem = Tuple[str, str, np.ndarray, np.ndarray]
+
+
+def _ng_save_worker(
+    save_queue: "queue.Queue[Optional[NgSaveItem]]", logger: Any
+) -> None:
+    """
+    NG画像保存キューを処理するワーカー
+
+    エンジン本体への参照を持たないため、エンジンの破棄を妨げません。
+    None を受け取ると終了します。
+    """
+    while True:
+        item = save_queue.get()
+        if item is None:
+            return
+        save_dir, image_id, overlay, original = item
+        try:
+            os.makedirs(save_dir, exist_ok=True)
+            cv2.imwrite(os.path.join(save_dir, f"{image_id}_overlay.png"), overlay)
+            cv2.imwrite(os.path.join(save_dir, f"{image_id}_original.png"), original)
+        except Exception as e:
+            logger.error(f"NG image save failed: {e}")
+
 
 class PatchCoreInferenceEngine:
     """
@@ -66,20 +130,60 @@ class PatchCoreInferenceEngine:
         self.use_gpu = self.loader.get_variable("USE_GPU")
         self.device_id = self.loader.get_variable("GPU_DEVICE_ID")
         self.use_mixed_precision = self.loader.get_variable("USE_MIXED_PRECISION")
-        self.device = get_device(self.use_gpu, self.device_id)
+        # int8 量子化モデルは CPU 専用（読み込み前に量子化エンジンを選択する）
+        self.quantize_int8 = self.loader.get_variable("QUANTIZE_INT8", False)
+        if self.quantize_int8:
+            select_quantized_engine()
+        self.device = get_device(
+            self.use_gpu and not self.quantize_int8, self.device_id
+        )
 
         self.model, self.memory_bank, self.pca, self.pixel_mean, self.pixel_std = (
             load_model_and_assets(self.model_dir, self.save_format)
         )
 
-        # モデルをGPUに移動
+        # モデルをGPUに移動し、入力の型・メモリ配置に合わせて最適化する
         self.model = self.model.to(self.device)
-        self.pixel_std_safe = np.where(self.pixel_std == 0, 1e-6, self.pixel_std)
-
-        # PCA・メモリバンクをGPUテンソルとして事前計算
-        self._prepare_gpu_assets()
+        self._specialize_model()
+        # Zスコア計算用に標準偏差の逆数を事前計算（推論ごとの割り算を省く）
+        self.pixel_inv_std = inverse_pixel_std(self.pixel_std)
+        self._prepare_z_score_assets()
+
+        # PCA・メモリバンク平均をデバイス上のテンソルとして事前計算
+        self._prepare_device_assets()
+
+        # 最近傍スコアリング（SCORING_METHOD="knn" の場合のみ）
+        self.scorer: Optional[NearestNeighborScorer] = (
+            NearestNeighborScorer(self.memory_bank, self.device)
+            if self.scoring_method == SCORING_KNN
+            else None
+        )
 
         self.image_store: OrderedDict[str, np.ndarray] = OrderedDict()
+        # 接頭辞（org/ovr）・ラベル（OK/NG）ごとの画像IDインデックス（挿入順）
+        self._image_index: Dict[str, OrderedDict[str, None]] = {}
+        self._store_lock = threading.Lock()
+
+        # 推論ごとに再利用する入力バッファ
+        self._input_buffers = self._new_input_buffers()
+        # オーバーレイ生成の中間バッファ（初回の推論時に確保）
+        self._overlay_z_u8: Optional[np.ndarray] = None
+        self._overlay_heatmap: Optional[np.ndarray] = None
+        self._overlay_base: Optional[np.ndarray] = None
+
+        # 推論結果ログのファイルハンドル（初回の記録時に開き、日付が変わったら開き直す）
+        self._log_date: Optional[str] = None
+        self._log_fh: Optional[TextIO] = None
+        self._ng_log_fh: Optional[TextIO] = None
+        self._log_last_flush = 0.0
+
+        # NG画像保存は専用スレッド1本で順に処理する（推論ごとのスレッド生成を省く）
+        self._ng_queue: "queue.Queue[Optional[NgSaveItem]]" = queue.Queue(
+            maxsize=NG_SAVE_QUEUE_SIZE
+        )
+        threading.Thread(
+            target=_ng_save_worker, args=(self._ng_queue, self.logger), daemon=True
+        ).start()
 
         self._warmup()
 
@@ -99,12 +203,18 @@ class PatchCoreInferenceEngine:
         self.loader.reload()
         self.affine_points = self.loader.get_variable("AFFINE_POINTS")
         self.image_size = self.loader.get_variable("IMAGE_SIZE")
+        # 射影変換行列は設定の再読み込みまで固定のため、ここで1回だけ求める
+        self._perspective_M = perspective_matrix(self.affine_points, self.image_size)
         self.save_format: str = self.loader.get_variable("SAVE_FORMAT")
         self.z_score_threshold = self.loader.get_variable("Z_SCORE_THRESHOLD")
         self.z_area_threshold = self.loader.get_variable("Z_AREA_THRESHOLD")
         self.z_max_threshold = self.loader.get_variable("Z_MAX_THRESHOLD")
         self.ng_image_save = self.loader.get_variable("NG_IMAGE_SAVE")
         self.max_images = self.loader.get_variable("MAX_CACHE_IMAGE")
+        self.scoring_method = self.loader.get_variable("SCORING_METHOD", SCORING_MEAN)
+        self.score_upsample_mode = self.loader.get_variable(
+            "SCORE_UPSAMPLE_MODE", UPSAMPLE_BICUBIC
+        )
 
         # GPU設定の再読み込み
         self.use_gpu = self.loader.get_variable("USE_GPU")
@@ -113,28 +223,56 @@ class PatchCoreInferenceEngine:
 
         self.logger.info(f"Settings reloaded for model={self.model_name}")
 
-    def _prepare_gpu_assets(self) -> None:
+    def _prepare_device_assets(self) -> None:
         """
-        PCA変換行列とメモリバンク平均をGPUテンソルとして事前計算
+        PCA変換行列とメモリバンク平均をデバイス上のテンソルとして事前計算
 
-        GPU上でPCA変換と距離計算を行うことで、
-        CPU↔GPU間のデータ転送とNumPy処理を削減します。
+        PCA変換と距離計算をデバイス上の行列演算で行うことで、
+        GPU使用時は CPU↔GPU 間のデータ転送を、CPU使用時は sklearn・NumPy を経由する処理を省きます。
         """
-        if self.device.type == "cuda":
-            self.pca_components_t = torch.from_numpy(
-                self.pca.components_.T.astype(np.float32)
-            ).to(self.device)
-            self.pca_mean_t = torch.from_numpy(self.pca.mean_.astype(np.float32)).to(
-                self.device
-            )
-            self.bank_mean_t = torch.from_numpy(
-                self.memory_bank.mean(axis=0).astype(np.float32)
-            ).to(self.device)
-            self.logger.info("GPU assets prepared (PCA components, memory bank mean)")
-        else:
-            self.pca_components_t = None
-            self.pca_mean_t = None
-            self.bank_mean_t = None
+        self.pca_components_t = torch.from_numpy(
+            np.ascontiguousarray(self.pca.components_.T, dtype=np.float32)
+        ).to(self.device)
+        self.pca_mean_t = torch.from_numpy(self.pca.mean_.astype(np.float32)).to(
+            self.device
+        )
+        self.bank_mean_t = torch.from_numpy(
+            self.memory_bank.mean(axis=0, dtype=np.float32)
+        ).to(self.device)
+        self.logger.info(
+            f"Device assets prepared on {self.device} "
+            "(PCA components, memory bank mean)"
+        )
+
+    def _specialize_model(self) -> None:
+        """
+        読み込んだモデルを推論専用に最適化
+
+        入力を channels_last 配置にし、混合精度が有効な GPU 使用時は重みを fp16 に変換したうえで
+        torch.jit.optimize_for_inference で凍結・融合します。
+        推論ごとの autocast による型変換を省けます（int8 量子化モデルはそのまま使用します）。
+        """
+        self._model_dtype = torch.float32
+        self._memory_format = torch.contiguous_format
+        if self.quantize_int8:
+            return
+
+        model = self.model.to(memory_format=torch.channels_last)
+        self._memory_format = torch.channels_last
+        if self.use_mixed_precision and self.device.type == "cuda":
+            model = model.half()
+            self._model_dtype = torch.float16
+        try:
+            model = torch.jit.optimize_for_inference(model)
+        except Exception as e:
+            self.logger.warning(f"optimize_for_inference skipped: {e}")
+        self.model = model
+
+    def _new_input_buffers(self) -> InputBuffers:
+        """モデルの入力の型・メモリ配置に合わせた入力バッファを作成"""
+        return InputBuffers(
+            self.image_size, self.device, self._model_dtype, self._memory_format
+        )
 
     def _warmup(self) -> None:
         """
@@ -147,8 +285,7 @@ class PatchCoreInferenceEngine:
             dummy = np.zeros(
                 (self.image_size[1], self.image_size[0], 3), dtype=np.uint8
             )
-            inputs = preprocess_cv2(dummy, self.affine_points, self.image_size)
-            inputs = inputs.to(self.device)
+            _, inputs = self._input_buffers.prepare(dummy, self._perspective_M)
             _ = self._run_model(inputs)
             self.logger.info("Warmup complete")
         except Exception as e:
@@ -164,32 +301,76 @@ class PatchCoreInferenceEngine:
         return str(self.model_name)
 
     def __del__(self):
-        """デストラクタ：GPUキャッシュをクリア"""
+        """デストラクタ：NG画像保存ワーカーを終了し、GPUキャッシュをクリア"""
+        ng_queue = getattr(self, "_ng_queue", None)
+        if ng_queue is not None:
+            try:
+                # 保存待ちの画像を処理し終えてからワーカーが終了する
+                ng_queue.put(None, timeout=1)
+            except queue.Full:
+                pass
+        self._close_log_files()
         clear_gpu_cache()
         self.logger.info(
             f"PatchCoreInferenceEngine ended - id={id(self)}, model={self.model_name}"
         )
 
+    def _open_log_files(self, date_str: str) -> None:
+        """指定日付のログファイルを開く（開いているファイルは閉じる）"""
+        self._close_log_files()
+        log_path = os.path.join(self.settings_dir, "execute", "log")
+        os.makedirs(log_path, exist_ok=True)
+        self._log_fh = open(
+            os.path.join(log_path, f"inference_{date_str}.log"),
+            "a",
+            encoding="utf-8",
+            buffering=LOG_BUFFER_SIZE,
+        )
+        self._ng_log_fh = open(
+            os.path.join(log_path, "NG.log"),
+            "a",
+            encoding="utf-8",
+            buffering=1,
+        )
+        self._log_date = date_str
+        self._log_last_flush = time.monotonic()
+
+    def _close_log_files(self) -> None:
+        """開いているログファイルを書き出して閉じる"""
+        for fh in (getattr(self, "_log_fh", None), getattr(self, "_ng_log_fh", None)):
+            if fh is not None:
+                fh.close()
+        self._log_fh = None
+        self._ng_log_fh = None
+        self._log_date = None
+
     def _log_result(self, result: Dict[str, Any]) -> None:
         """
         推論結果をログファイルに記録
 
         日付別のログファイルとNG専用ログファイルに記録します。
+        ファイルは日付が変わるまで開いたままにし、書き込みはバッファにためて
+        LOG_BUFFER_SIZE ごと、または前回から LOG_FLUSH_INTERVAL 秒以上経過した時点で
+        まとめて書き出します。NG.log は件数が少なく監査用途のため行単位で書き出します。
 
         Args:
             result: 推論結果の辞書（label, z_stats, thresholds, image_id を含む）
         """
-        date_str = datetime.now().strftime("%Y%m%d")
-        log_filename = f"inference_{date_str}.log"
-        log_path = os.path.join(self.settings_dir, "execute", "log")
-        os.makedirs(log_path, exist_ok=True)
+        now = datetime.now()
+        date_str = now.strftime("%Y%m%d")
+        if date_str != self._log_date:
+            self._open_log_files(date_str)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        with open(os.path.join(log_path, log_filename), "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}]: {result}\n")
+        line = f"[{now.strftime('%Y%m%d_%H%M%S')}]: {result}\n"
+        log_fh = cast(TextIO, self._log_fh)
+        log_fh.write(line)
         if result["label"] == "NG":
-            with open(os.path.join(log_path, "NG.log"), "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}]: {result}\n")
+            cast(TextIO, self._ng_log_fh).write(line)
+
+        mono = time.monotonic()
+        if mono - self._log_last_flush >= LOG_FLUSH_INTERVAL:
+            log_fh.flush()
+            self._log_last_flush = mono
 
     def _store_image(self, image_id: str, image: np.ndarray) -> None:
         """
@@ -201,9 +382,19 @@ class PatchCoreInferenceEngine:
             image_id: 画像を識別するユニークなID
             image: 保存する画像配列
         """
-        self.image_store[image_id] = image
-        if len(self.image_store) > self.max_images:
-            self.image_store.popitem(last=False)  # 最古の画像を削除
+        with self._store_lock:
+            self.image_store[image_id] = image
+            for key in self._index_keys(image_id):
+                self._image_index.setdefault(key, OrderedDict())[image_id] = None
+            if len(self.image_store) > self.max_images:
+                old_id, _ = self.image_store.popitem(last=False)  # 最古の画像を削除
+                for key in self._index_keys(old_id):
+                    self._image_index[key].pop(old_id, None)
+
+    @staticmethod
+    def _index_keys(image_id: str) -> Tuple[str, ...]:
+        """画像ID（{接頭辞}_{ラベル}_{日時}_{uuid}）からインデックスキーを取り出す"""
+        return tuple(image_id.split("_", 2)[:2])
 
     def get_image_by_id(self, image_id: str) -> Optional[np.ndarray]:
         """
@@ -217,14 +408,41 @@ class PatchCoreInferenceEngine:
         """
         return self.image_store.get(image_id)
 
-    def get_store_image_list(self) -> list:
+    def get_store_image_list(
+        self,
+        prefix: Optional[str] = None,
+        label: Optional[str] = None,
+        limit: Optional[int] = None,
+        oldest_first: bool = False,
+    ) -> List[str]:
         """
         キャッシュされている画像IDのリストを取得
 
+        フィルタはインデックスを引くだけで、キャッシュ全体を走査しません。
+        limit 件集まった時点で走査を打ち切ります。
+
+        Args:
+            prefix: 接頭辞で絞り込む（"org" / "ovr"）
+            label: ラベルで絞り込む（"OK" / "NG"）
+            limit: 返す最大件数（None なら全件）
+            oldest_first: True なら古い順で返す
+
         Returns:
-            画像IDのリスト（新しい順）
-        """
-        return list(reversed(self.image_store.keys()))
+            画像IDのリスト（デフォルトは新しい順）
+        """
+        keys = [k for k in (prefix, label) if k]
+        with self._store_lock:
+            if keys:
+                empty: OrderedDict[str, None] = OrderedDict()
+                buckets = sorted(
+                    (self._image_index.get(k, empty) for k in keys), key=len
+                )
+                base, others = buckets[0].keys(), buckets[1:]
+            else:
+                base, others = self.image_store.keys(), []
+            ids = iter(base) if oldest_first else reversed(base)
+            matched = (i for i in ids if all(i in b for b in others))
+            return list(islice(matched, limit))
 
     def clear_store_image(self) -> None:
         """
@@ -232,9 +450,11 @@ class PatchCoreInferenceEngine:
 
         すべての保存済み画像をメモリから削除します。
         """
-        self.image_store.clear()
+        with self._store_lock:
+            self.image_store.clear()
+            self._image_index.clear()
 
-    def _run_model(self, inputs: torch.Tensor) -> np.ndarray:
+    def _run_model(self, inputs: torch.Tensor) -> Union[np.ndarray, torch.Tensor]:
         """
         モデルを実行して異常スコアマップを生成
 
@@ -244,81 +464,102 @@ class PatchCoreInferenceEngine:
             inputs: 前処理済みの入力テンソル（形状: [1, C, H, W]）
 
         Returns:
-            異常スコアマップ（2D NumPy配列）
+            異常スコアマップ（形状: [h, w]、faiss 使用時以外はデバイス上のテンソル）
         """
-        inputs = inputs.to(self.device)
+        # モデルに合わせた型・メモリ配置にする（入力バッファ経由の場合は変換なし）
+        inputs = inputs.to(
+            self.device, dtype=self._model_dtype, memory_format=self._memory_format
+        )
 
-        with torch.no_grad():
-            # 新しいautocast APIを使用
-            if self.use_mixed_precision and self.device.type == "cuda":
-                with torch.amp.autocast(device_type="cuda", dtype=torch.float16):
-                    fmap = self.model(inputs)
-            else:
-                fmap = self.model(inputs)
+        with torch.inference_mode():
+            # fp16 化はモデル読み込み時に済ませているため autocast は使わない
+            fmap = self.model(inputs)
 
             patches = fmap.squeeze(0).permute(1, 2, 0).reshape(-1, fmap.size(1))
 
-            if self.pca_components_t is not None:
-                # GPU上でPCA変換と距離計算を実行
-                patches = patches.float()
-                patches_pca = (patches - self.pca_mean_t) @ self.pca_components_t
-                scores = torch.norm(patches_pca - self.bank_mean_t, dim=1)
-                return scores.reshape(fmap.shape[2], fmap.shape[3]).cpu().numpy()  # type: ignore[no-any-return]
-            else:
-                # CPU fallback
-                patches = patches.cpu().numpy()
-                patches = self.pca.transform(patches)
-                scores = np.linalg.norm(patches - self.memory_bank.mean(axis=0), axis=1)
-                return scores.reshape(fmap.shape[2], fmap.shape[3])  # type: ignore[no-any-return]
+            # PCA変換と距離計算もデバイス上で行う（CPU に戻すのは最後のスコアマップのみ）
+            patches = patches.float()
+            patches_pca = (patches - self.pca_mean_t) @ self.pca_components_t
+            if self.scorer is not None:
+                return self.scorer.score(patches_pca).reshape(
+                    fmap.shape[2], fmap.shape[3]
+                )
+            scores = torch.linalg.vector_norm(patches_pca - self.bank_mean_t, dim=1)
+            # 拡大もデバイス上で行うため CPU には戻さない
+            return scores.reshape(fmap.shape[2], fmap.shape[3])
 
-    def _resize_score_map(self, score_map: np.ndarray) -> np.ndarray:
+    def _prepare_z_score_assets(self) -> None:
         """
-        スコアマップを元画像サイズにリサイズ
-
-        Args:
-            score_map: 異常スコアマップ
+        Zスコア計算用の係数と転送先バッファを事前に用意
 
-        Returns:
-            リサイズされたスコアマップ
+        z = (raw - mean) / std を z = raw * scale + shift の1回の積和にできるよう、
+        scale = 1 / std と shift = -mean / std をデバイス上に置きます。
         """
-        return cv2.resize(score_map, self.image_size, interpolation=cv2.INTER_CUBIC)
+        shift = -self.pixel_mean.astype(np.float32) * self.pixel_inv_std
+        self._z_scale_t = torch.from_numpy(self.pixel_inv_std).to(self.device)
+        self._z_shift_t = torch.from_numpy(shift).to(self.device)
+        self._z_host = torch.empty(
+            self.pixel_inv_std.shape,
+            dtype=torch.float32,
+            pin_memory=self.device.type == "cuda",
+        )
 
-    def _compute_z_score_map(self, raw_score_map: np.ndarray) -> np.ndarray:
+    def _compute_z_score_map(
+        self, score_map: Union[np.ndarray, torch.Tensor]
+    ) -> np.ndarray:
         """
-        Z-scoreマップを計算
+        スコアマップを元画像サイズにリサイズし、Z-scoreマップを計算
 
         正常画像の統計情報を使用してスコアを標準化します。
+        リサイズと標準化はデバイス上で続けて行い、結果は再利用バッファに転送します
+        （戻り値は次の推論で上書きされます）。
 
         Args:
-            raw_score_map: 元の異常スコアマップ
+            score_map: 異常スコアマップ（形状: [h, w]）
 
         Returns:
             Z-scoreマップ
         """
-        return (raw_score_map - self.pixel_mean) / self.pixel_std_safe  # type: ignore[no-any-return]
+        return upsample_z_score_map(
+            score_map,
+            self.image_size,
+            self.score_upsample_mode,
+            self._z_scale_t,
+            self._z_shift_t,
+            out=self._z_host,
+        )
 
     def _generate_overlay(
-        self, inputs: torch.Tensor, z_score_map: np.ndarray
+        self, warped: np.ndarray, z_score_map: np.ndarray
     ) -> np.ndarray:
         """
         ヒートマップ重畳画像を生成
 
         Z-scoreマップをJETカラーマップで可視化し、元画像に重ねます。
+        途中の配列は再利用バッファに書き込み、新たに確保するのは戻り値の画像のみです
+        （戻り値はキャッシュ・NG保存に渡されるため再利用しません）。
 
         Args:
-            inputs: 入力画像テンソル
-            z_score_map: Z-scoreマップ
+            warped: 射影変換後の入力画像（uint8）
+            z_score_map: Z-scoreマップ（その場で下限 0 に切り詰められます）
 
         Returns:
             ヒートマップが重畳された画像（BGR形式）
         """
-        z_vis = np.clip(z_score_map, 0, 5.0)
-        z_vis = (z_vis / 5.0 * 255).astype(np.uint8)
-        heatmap = cv2.applyColorMap(z_vis, cv2.COLORMAP_JET)
-        input_img = (inputs.squeeze(0).permute(1, 2, 0).numpy() * 255).astype(np.uint8)
-        return cv2.addWeighted(
-            cv2.cvtColor(input_img, cv2.COLOR_RGB2BGR), 0.6, heatmap, 0.4, 0
+        height, width = z_score_map.shape
+        if self._overlay_z_u8 is None or self._overlay_z_u8.shape != (height, width):
+            self._overlay_z_u8 = np.empty((height, width), dtype=np.uint8)
+            self._overlay_heatmap = np.empty((height, width, 3), dtype=np.uint8)
+            self._overlay_base = np.empty((height, width, 3), dtype=np.uint8)
+
+        # 0〜5 を 0〜255 に対応付ける（上限は uint8 への飽和変換で切り詰められる）
+        np.maximum(z_score_map, 0, out=z_score_map)
+        cv2.convertScaleAbs(z_score_map, dst=self._overlay_z_u8, alpha=255 / 5.0)
+        cv2.applyColorMap(
+            self._overlay_z_u8, cv2.COLORMAP_JET, dst=self._overlay_heatmap
         )
+        cv2.cvtColor(warped, cv2.COLOR_RGB2BGR, dst=self._overlay_base)
+        return cv2.addWeighted(self._overlay_base, 0.6, self._overlay_heatmap, 0.4, 0)
 
     def _result_gen(
         self, label: Literal["OK", "NG"], z_stats: dict, image_id: str
@@ -377,28 +618,34 @@ class PatchCoreInferenceEngine:
             >>> result = engine.predict(img)
             >>> print(result["label"])  # "OK" or "NG"
         """
-        # 入力画像のテンソル化
-        inputs = preprocess_cv2(image_array, self.affine_points, self.image_size)
+        # 入力画像の射影変換とテンソル化（再利用バッファに書き込み、uint8 で転送して転送先で正規化）
+        # 推論は JobQueue の専用スレッドから1件ずつ呼ばれるため、バッファを共有しても競合しない
+        if self._input_buffers.output_size != tuple(self.image_size):
+            self._input_buffers = self._new_input_buffers()
+        warped, inputs = self._input_buffers.prepare(image_array, self._perspective_M)
 
         # 特徴マップからスコアマップ生成
         score_map = self._run_model(inputs)
 
-        # スコアマップを元画像サイズにリサイズ
-        raw_score_map = self._resize_score_map(score_map)
-
-        # Zスコアマップ生成
-        z_score_map = self._compute_z_score_map(raw_score_map)
+        # スコアマップを元画像サイズにリサイズしてZスコアマップ生成
+        z_score_map = self._compute_z_score_map(score_map)
 
         # Zスコア統計と判定
-        z_stats = evaluate_z_score_map(z_score_map, self.z_score_threshold)
+        # 応答に含まれない percentile_95 は計算しない
+        z_stats = evaluate_z_score_map(
+            z_score_map, self.z_score_threshold, with_percentile=False
+        )
         is_ok = is_ok_z(z_stats, self.z_area_threshold, self.z_max_threshold)
 
         # 可視化オーバーレイ生成
-        overlay = self._generate_overlay(inputs, z_score_map)
+        overlay = self._generate_overlay(warped, z_score_map)
 
         # 画像ID生成とキャッシュ保存
         label_str: Literal["OK", "NG"] = "OK" if is_ok else "NG"
-        image_id = f"{label_str}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:4]}"
+        # 末尾は uuid4 の全桁（画像キャッシュ・エンコード済みキャッシュ・クライアントの
+        # キャッシュは画像IDが一意で内容が変わらないことを前提にしているため）
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        image_id = f"{label_str}_{timestamp}_{uuid.uuid4().hex}"
         threading.Thread(
             target=self._store_image, args=(f"org_{image_id}", image_array)
         ).start()
@@ -415,7 +662,6 @@ class PatchCoreInferenceEngine:
                 datetime.now().strftime("%Y%m%d"),
                 datetime.now().strftime("%H%M"),
             )
-            os.makedirs(save_dir, exist_ok=True)
             self._save_ng_images_async(save_dir, image_id, overlay, image_array)
 
         # 結果整形とログ
@@ -430,22 +676,17 @@ class PatchCoreInferenceEngine:
         """
         NG画像を非同期で保存
 
-        別スレッドで画像を保存するため、メイン処理をブロックしません。
+        保存は専用のワーカースレッドに任せるため、メイン処理をブロックしません。
+        保存待ちが NG_SAVE_QUEUE_SIZE 件を超えた場合は保存せずに破棄してログに記録します。
+        渡した画像は保存が終わるまで書き換えないでください（いずれも推論ごとに新しく確保された配列）。
 
         Args:
-            save_dir: 保存先ディレクトリのパス
+            save_dir: 保存先ディレクトリのパス（存在しなければワーカーが作成）
             image_id: 画像ID（ファイル名に使用）
             overlay: ヒートマップ重畳画像
             original: オリジナル画像
         """
-
-        def save():
-            try:
-                cv2.imwrite(os.path.join(save_dir, f"{image_id}_overlay.png"), overlay)
-                cv2.imwrite(
-                    os.path.join(save_dir, f"{image_id}_original.png"), original
-                )
-            except Exception as e:
-                self.logger.error(f"NG image save failed: {e}")
-
-        threading.Thread(target=save, daemon=True).start()
+        try:
+            self._ng_queue.put_nowait((save_dir, image_id, overlay, original))
+        except queue.Full:
+            self.logger.warning(f"NG image save queue is full, dropped: {image_id}")
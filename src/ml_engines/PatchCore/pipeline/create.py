@@ -1,28 +1,69 @@
 import os
-import cv2
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 import torch
 import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 import numpy as np
-import pickle
 from sklearn.decomposition import PCA
 from torchvision.models import resnet18, ResNet18_Weights
+from torchvision.models.quantization import resnet18 as quantizable_resnet18
+from torch.ao.quantization import DeQuantStub, QuantStub
 from PIL import Image, ImageFilter, ImageEnhance
 from src.config.settings_loader import SettingsLoader
 from src.config import env_loader
+from src.config.constants import MODEL_FILENAME
 from src.ml_engines.PatchCore.utils.inference_utils import (
-    preprocess_cv2,
+    list_png_files,
+    warp_image,
     load_image_unicode_path,
 )
-from src.ml_engines.PatchCore.utils.device_utils import get_device, clear_gpu_cache
+from src.ml_engines.PatchCore.core.inference_core import GpuAssets
+from src.ml_engines.PatchCore.utils.nn_scorer import (
+    NearestNeighborScorer,
+    SCORING_KNN,
+    SCORING_MEAN,
+    greedy_coreset_indices,
+)
+from src.ml_engines.PatchCore.utils.score_utils import (
+    UPSAMPLE_BICUBIC,
+    upsample_score_maps,
+)
+from src.ml_engines.PatchCore.utils.model_loader import (
+    PcaProjection,
+    save_model_assets,
+)
+from src.ml_engines.PatchCore.utils.device_utils import (
+    clear_gpu_cache,
+    get_device,
+    select_quantized_engine,
+)
 from src.utils.logger import setup_logger
 
 logger = setup_logger("model_creator", log_dir="logs/model")
 
+# 特徴抽出時に1回のフォワードでまとめて処理する画像枚数
+BATCH_SIZE = 16
+# 画像の読み込み・射影変換を並列に行うスレッド数（OpenCV は GIL を解放する）
+LOAD_WORKERS = min(8, os.cpu_count() or 1)
+# 各画像から無作為に抽出してメモリバンク（SCORING_METHOD="mean"）・PCA学習に使うパッチの割合
+SAMPLING_RATIO = 0.1
+# 最近傍スコアリング（SCORING_METHOD="knn"）時にコアセットとして残す全パッチ数に対する割合
+CORESET_RATIO = 0.01
+# 学習画像のパッチ特徴をメモリ上に保持する上限（バイト）。超える場合は一時ファイルに置く
+FEATURE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# CUDA 使用時に特徴抽出を torch.compile で最適化するか（コンパイルできない環境では通常実行）
+COMPILE_FEATURE_EXTRACTOR = True
+# int8 量子化（QUANTIZE_INT8=True）時に活性化の範囲の調整に使う学習画像の枚数
+QUANT_CALIBRATION_IMAGES = 100
+
 
 class FeatureExtractor(nn.Module):
-    def __init__(self, depth: int = 1):
+
+    def __init__(self, depth: int = 1, backbone: Optional[nn.Module] = None):
         super().__init__()
-        resnet = resnet18(weights=ResNet18_Weights.IMAGENET1K_V1)
+        resnet = backbone or resnet18(weights=ResNet18_Weights.IMAGENET1K_V1)
 
         self.layer0 = nn.Sequential(
             resnet.conv1, resnet.bn1, resnet.relu, resnet.maxpool
@@ -44,6 +85,203 @@ class FeatureExtractor(nn.Module):
             x = self.layer4(x)
         return x
 
+    def fuse_conv_bn(self) -> "FeatureExtractor":
+        """
+        BatchNorm を直前の Conv の重みとバイアスに畳み込む（評価モード専用）
+
+        評価モードの BatchNorm は固定のスケールとシフトなので、Conv に吸収しても出力は変わらず、
+        各活性化マップへの BatchNorm の読み書きを省けます。畳み込んだ BatchNorm は
+        nn.Identity に置き換えるため、ResNet のブロックの forward はそのまま使えます。
+
+        Returns:
+            自身（インプレースで変更）
+        """
+        self.layer0[0] = fuse_conv_bn_eval(self.layer0[0], self.layer0[1])
+        self.layer0[1] = nn.Identity()
+        for layer in (self.layer1, self.layer2, self.layer3, self.layer4):
+            if layer is None:
+                continue
+            for block in layer:
+                block.conv1 = fuse_conv_bn_eval(block.conv1, block.bn1)
+                block.bn1 = nn.Identity()
+                block.conv2 = fuse_conv_bn_eval(block.conv2, block.bn2)
+                block.bn2 = nn.Identity()
+                if block.downsample is not None:
+                    block.downsample[0] = fuse_conv_bn_eval(
+                        block.downsample[0], block.downsample[1]
+                    )
+                    block.downsample[1] = nn.Identity()
+        return self
+
+
+class Int8FeatureExtractor(FeatureExtractor):
+    """
+    int8 静的量子化用の特徴抽出器（CPU 専用）
+
+    残差接続の加算を量子化できる torchvision の量子化対応 ResNet18 を使い、
+    Conv+BN+ReLU を融合した状態で構築します。入出力は float のままです。
+    """
+
+    def __init__(self, depth: int = 1):
+        resnet = quantizable_resnet18(
+            weights=ResNet18_Weights.IMAGENET1K_V1, quantize=False
+        )
+        resnet.eval()
+        resnet.fuse_model()
+        super().__init__(depth, backbone=resnet)
+        self.quant = QuantStub()
+        self.dequant = DeQuantStub()
+
+    def forward(self, x):
+        return self.dequant(super().forward(self.quant(x)))
+
+
+def _augment_image(path: str, dst_dir: str) -> None:
+    """1枚の正常画像から拡張画像（ぼかし＋色調補正、シャープ化）の2枚を作成する"""
+    fname = os.path.basename(path)
+    image = Image.open(path).convert("RGB")
+    blurred = image.filter(ImageFilter.GaussianBlur(radius=2))
+    enhanced = ImageEnhance.Brightness(blurred).enhance(1.2)
+    enhanced = ImageEnhance.Contrast(enhanced).enhance(1.3)
+    enhanced = ImageEnhance.Color(enhanced).enhance(1.1)
+    enhanced.save(os.path.join(dst_dir, f"aug_{fname}"))
+    sharp_img = ImageEnhance.Sharpness(image).enhance(1.2)
+    sharp_img.save(os.path.join(dst_dir, f"aug_s_{fname}"))
+
+
+def _allocate_feature_cache(shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    学習画像のパッチ特徴を保持する float32 配列を確保する
+
+    FEATURE_CACHE_MAX_BYTES を超える場合は一時ファイルにマップした配列を返します
+    （一時ファイルは配列の解放とともに削除されます）。
+    """
+    if int(np.prod(shape)) * 4 <= FEATURE_CACHE_MAX_BYTES:
+        return np.empty(shape, dtype=np.float32)
+    return np.memmap(tempfile.TemporaryFile(), dtype=np.float32, mode="w+", shape=shape)
+
+
+def _compile_for_extraction(
+    model: nn.Module, image_size, device: torch.device, use_amp: bool
+) -> nn.Module:
+    """
+    学習画像の特徴抽出用に、入力形状を固定して torch.compile したモデルを返す
+
+    conv+bn+relu の融合や形状に特化したカーネル選択により、同じ形状のバッチを
+    繰り返し処理する学習時の特徴抽出を高速化します。
+    CUDA 以外のデバイスや、Triton が使えない環境などでコンパイルに失敗した場合は元のモデルを返します。
+    コンパイルは BATCH_SIZE の入力形状でのみ行うため、返したモデルには
+    _iter_feature_maps(..., pad_to_batch=True) で常に BATCH_SIZE のバッチを渡してください。
+    保存するモデル（model.pt）は従来どおり元のモデルをトレースしたものです。
+    """
+    if not COMPILE_FEATURE_EXTRACTOR or device.type != "cuda":
+        return model
+    try:
+        compiled = torch.compile(
+            model, mode="max-autotune", fullgraph=True, dynamic=False
+        )
+        # 1回実行してコンパイルを済ませる（失敗はここで検出する）
+        dummy = torch.zeros(BATCH_SIZE, 3, image_size[1], image_size[0], device=device)
+        with torch.inference_mode():
+            if use_amp:
+                with torch.amp.autocast(device_type="cuda", dtype=torch.float16):
+                    compiled(dummy)
+            else:
+                compiled(dummy)
+    except Exception as e:
+        logger.warning(f"torch.compile unavailable, using eager model: {e}")
+        return model
+    logger.info("Feature extractor compiled with torch.compile")
+    return compiled  # type: ignore[no-any-return]
+
+
+def _quantize_int8(
+    model: Int8FeatureExtractor, image_paths: List[str], affine_points, image_size
+) -> nn.Module:
+    """
+    学習画像で活性化の範囲を調整し、特徴抽出器を int8 に変換する
+
+    Args:
+        model: 評価モードの Int8FeatureExtractor
+        image_paths: 学習画像のパス（先頭から最大 QUANT_CALIBRATION_IMAGES 枚を使用）
+        affine_points: 射影変換の4点座標
+        image_size: 入力画像サイズ
+
+    Returns:
+        int8 に変換したモデル（インプレースで変換）
+    """
+    engine = select_quantized_engine()
+    model.qconfig = torch.ao.quantization.get_default_qconfig(engine)
+    torch.ao.quantization.prepare(model, inplace=True)
+    calibration = image_paths[:QUANT_CALIBRATION_IMAGES]
+    for _ in _iter_feature_maps(
+        model, calibration, affine_points, image_size, torch.device("cpu"), False
+    ):
+        pass
+    torch.ao.quantization.convert(model, inplace=True)
+    logger.info(
+        f"Feature extractor quantized to int8 ({engine}, {len(calibration)} images)"
+    )
+    return model
+
+
+def _load_inputs(path: str, affine_points, image_size) -> torch.Tensor:
+    """画像を読み込み、射影変換後の uint8 テンソル（[1, C, H, W]）に変換する（正規化は転送後に行う）"""
+    warped = warp_image(load_image_unicode_path(path), affine_points, image_size)
+    return torch.from_numpy(warped).permute(2, 0, 1).unsqueeze(0)
+
+
+def _iter_feature_maps(
+    model: nn.Module,
+    image_paths: List[str],
+    affine_points,
+    image_size,
+    device: torch.device,
+    use_amp: bool,
+    pad_to_batch: bool = False,
+) -> Iterator[Tuple[int, torch.Tensor]]:
+    """
+    画像をバッチ単位でモデルに入力し、特徴マップを順に返す
+
+    次のバッチの読み込み・前処理はスレッドで先行して行い、モデルの実行と重ねます。
+    pad_to_batch=True の場合、最後の端数のバッチを 0 埋めで BATCH_SIZE にそろえて
+    入力し、特徴マップは実際の枚数分だけ返します（形状固定でコンパイルしたモデルの
+    再コンパイルを避けるため）。
+
+    Yields:
+        (バッチ先頭の画像インデックス, 特徴マップ [K, C, h, w])
+    """
+    batches = [
+        image_paths[i : i + BATCH_SIZE] for i in range(0, len(image_paths), BATCH_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as pool:
+
+        def submit(paths: List[str]) -> List[Future]:
+            return [
+                pool.submit(_load_inputs, path, affine_points, image_size)
+                for path in paths
+            ]
+
+        pending = submit(batches[0]) if batches else []
+        for batch_idx in range(len(batches)):
+            inputs = torch.cat([f.result() for f in pending])
+            n_images = inputs.shape[0]
+            if pad_to_batch and n_images < BATCH_SIZE:
+                padding = inputs.new_zeros((BATCH_SIZE - n_images, *inputs.shape[1:]))
+                inputs = torch.cat([inputs, padding])
+            if batch_idx + 1 < len(batches):
+                pending = submit(batches[batch_idx + 1])
+            # uint8 のまま転送し、float 化と正規化は転送先で行う
+            inputs = inputs.to(device, non_blocking=True).float().div_(255.0)
+
+            with torch.inference_mode():
+                if use_amp:
+                    with torch.amp.autocast(device_type="cuda", dtype=torch.float16):
+                        fmap = model(inputs)
+                else:
+                    fmap = model(inputs)
+            yield batch_idx * BATCH_SIZE, fmap[:n_images]
+
 
 def run_creator():
     MODEL_NAME = env_loader.DEFAULT_MODEL_NAME
@@ -61,137 +299,170 @@ def run_creator():
     ENABLE_AUGMENT = loader.get_variable("ENABLE_AUGMENT")
     SAVE_FORMAT = loader.get_variable("SAVE_FORMAT")
     FEATURE_DEPTH = loader.get_variable("FEATURE_DEPTH")
+    SCORING_METHOD = loader.get_variable("SCORING_METHOD", SCORING_MEAN)
+    SCORE_UPSAMPLE_MODE = loader.get_variable("SCORE_UPSAMPLE_MODE", UPSAMPLE_BICUBIC)
 
     # GPU設定の読み込み
     USE_GPU = loader.get_variable("USE_GPU")
     GPU_DEVICE_ID = loader.get_variable("GPU_DEVICE_ID")
     USE_MIXED_PRECISION = loader.get_variable("USE_MIXED_PRECISION")
+    QUANTIZE_INT8 = loader.get_variable("QUANTIZE_INT8", False)
 
-    # デバイス設定
-    device = get_device(USE_GPU, GPU_DEVICE_ID)
+    # デバイス設定（int8 量子化モデルは CPU 専用）
+    device = get_device(USE_GPU and not QUANTIZE_INT8, GPU_DEVICE_ID)
 
     if ENABLE_AUGMENT and not os.path.isdir(AUGMENTED_DIR):
         os.makedirs(AUGMENTED_DIR, exist_ok=True)
-        i = 0
-        for fname in os.listdir(NORMAL_DIR):
-            if fname.lower().endswith(".png"):
-                path = os.path.join(NORMAL_DIR, fname)
-                image = Image.open(path).convert("RGB")
-                blurred = image.filter(ImageFilter.GaussianBlur(radius=2))
-                enhanced = ImageEnhance.Brightness(blurred).enhance(1.2)
-                enhanced = ImageEnhance.Contrast(enhanced).enhance(1.3)
-                enhanced = ImageEnhance.Color(enhanced).enhance(1.1)
-                enhanced.save(os.path.join(AUGMENTED_DIR, f"aug_{fname}"))
-                sharp_img = ImageEnhance.Sharpness(image).enhance(1.2)
-                sharp_img.save(os.path.join(AUGMENTED_DIR, f"aug_s_{fname}"))
-                i += 1
-        logger.info(f"Data augmentation completed: {i} images created")
+        normal_paths = list_png_files(NORMAL_DIR)
+        # Pillow のフィルタと PNG 保存は GIL を解放するため、スレッドで並列に処理する
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as pool:
+            list(
+                pool.map(lambda path: _augment_image(path, AUGMENTED_DIR), normal_paths)
+            )
+        logger.info(f"Data augmentation completed: {len(normal_paths)} images created")
 
     image_paths = []
     for subdir in [NORMAL_DIR, AUGMENTED_DIR] if ENABLE_AUGMENT else [NORMAL_DIR]:
-        for fname in os.listdir(subdir):
-            if fname.lower().endswith(".png"):
-                image_paths.append(os.path.join(subdir, fname))
-
-    model = FeatureExtractor(FEATURE_DEPTH)
-    model = model.to(device)  # モデルをGPUに移動
-    model.eval()
+        image_paths.extend(list_png_files(subdir))
+
+    if QUANTIZE_INT8:
+        # メモリバンクと Zスコア統計も int8 モデルの特徴で作る（推論時と同じモデルにする）
+        model = _quantize_int8(
+            Int8FeatureExtractor(FEATURE_DEPTH).eval(),
+            image_paths,
+            AFFINE_POINTS,
+            IMAGE_SIZE,
+        )
+    else:
+        model = FeatureExtractor(FEATURE_DEPTH)
+        model = model.to(device)  # モデルをGPUに移動
+        model.eval()
+        # 推論専用のため BatchNorm を Conv に畳み込んでおく（保存する model.pt にも反映される）
+        model.fuse_conv_bn()
     memory_bank = []
 
-    # 混合精度演算の設定（新しいAPI）
-    scaler = (
-        torch.amp.GradScaler("cuda")
-        if USE_MIXED_PRECISION and device.type == "cuda"
-        else None
-    )
-
-    with torch.no_grad():
-        for idx, path in enumerate(image_paths):
-            image = load_image_unicode_path(path)
-            inputs = preprocess_cv2(image, AFFINE_POINTS, IMAGE_SIZE)
-            inputs = inputs.to(device)  # 入力をGPUに移動
-
-            if scaler and USE_MIXED_PRECISION:
-                with torch.amp.autocast(device_type="cuda", dtype=torch.float16):
-                    fmap = model(inputs)
-            else:
-                fmap = model(inputs)
-
-            patches = fmap.squeeze(0).permute(1, 2, 0).reshape(-1, fmap.size(1))
-
-            sampling_ratio = 0.1
-            patches_np = patches.cpu().numpy()
-
-            if sampling_ratio < 1.0:
-                sample_size = int(len(patches_np) * sampling_ratio)
-                indices = np.random.choice(len(patches_np), sample_size, replace=False)
-                patches_np = patches_np[indices]
-
-            memory_bank.append(patches_np)
+    # 混合精度演算の設定（推論のみのため GradScaler は不要）
+    use_amp = USE_MIXED_PRECISION and device.type == "cuda"
+    # 最近傍スコアリングでは全パッチを集め、後でコアセットを選ぶ
+    use_coreset = SCORING_METHOD == SCORING_KNN
+
+    # 全画像のパッチ特徴 [N, h*w, C]（Zスコア統計の計算で再利用し、画像の再読み込みと再推論を省く）
+    features: Optional[np.ndarray] = None
+    map_hw: Tuple[int, int] = (0, 0)
+
+    extractor = _compile_for_extraction(model, IMAGE_SIZE, device, use_amp)
+    for start, fmap in _iter_feature_maps(
+        extractor,
+        image_paths,
+        AFFINE_POINTS,
+        IMAGE_SIZE,
+        device,
+        use_amp,
+        pad_to_batch=extractor is not model,
+    ):
+        # [K, C, h, w] → [K, h*w, C]（画像ごとのパッチ特徴）
+        batch_patches = (
+            fmap.permute(0, 2, 3, 1)
+            .reshape(fmap.size(0), -1, fmap.size(1))
+            .float()
+            .cpu()
+            .numpy()
+        )
+        if features is None:
+            map_hw = (fmap.size(2), fmap.size(3))
+            features = _allocate_feature_cache(
+                (len(image_paths),) + batch_patches.shape[1:]
+            )
+        features[start : start + len(batch_patches)] = batch_patches
+
+        if not use_coreset:
+            for patches_np in batch_patches:
+                if SAMPLING_RATIO < 1.0:
+                    sample_size = int(len(patches_np) * SAMPLING_RATIO)
+                    indices = np.random.choice(
+                        len(patches_np), sample_size, replace=False
+                    )
+                    patches_np = patches_np[indices]
+                memory_bank.append(patches_np)
+
+        logger.info(
+            f"Training in progress... {start + len(batch_patches)}/{len(image_paths)}"
+        )
 
-            if idx % 10 == 0:
-                logger.info(f"Training in progress... {idx+1}/{len(image_paths)}")
+    if features is None:
+        raise FileNotFoundError(f"No training images found in {NORMAL_DIR}")
+    n_channels = features.shape[2]
 
-    memory_bank = np.concatenate(memory_bank, axis=0)
     pca = PCA(n_components=PCA_VARIANCE)
-    memory_bank_compressed = pca.fit_transform(memory_bank)
-
-    if SAVE_FORMAT == "compressed":
-        with open(os.path.join(MODEL_DIR, "memory_bank_compressed.pkl"), "wb") as f:
-            pickle.dump(memory_bank_compressed, f)
+    if use_coreset:
+        # PCA は従来と同じ割合の無作為標本で学習し、PCA空間で全パッチからコアセットを選ぶ
+        all_patches = features.reshape(-1, n_channels)
+        sample_size = max(1, int(len(all_patches) * SAMPLING_RATIO))
+        sample = np.random.choice(len(all_patches), sample_size, replace=False)
+        pca.fit(all_patches[np.sort(sample)])
+        # sklearn の入力検証を通さず float32 の行列積で射影する
+        projected = PcaProjection.from_pca(pca).transform(all_patches)
+        n_select = max(1, int(len(all_patches) * CORESET_RATIO))
+        indices = greedy_coreset_indices(projected, n_select, device)
+        memory_bank = all_patches[indices]
+        memory_bank_compressed = projected[indices]
+        del projected
+        logger.info(f"Coreset selected: {len(indices)}/{len(all_patches)} patches")
     else:
-        with open(os.path.join(MODEL_DIR, "memory_bank.pkl"), "wb") as f:
-            pickle.dump(memory_bank, f)
-
-    with open(os.path.join(MODEL_DIR, "pca.pkl"), "wb") as f:
-        pickle.dump(pca, f)
+        memory_bank = np.concatenate(memory_bank, axis=0)
+        memory_bank_compressed = pca.fit_transform(memory_bank)
+
+    # Zスコアマップは保持した特徴から計算する（画像の再読み込み・再推論は行わない）
+    # PCA変換と距離計算はデバイス上の行列演算で行う（sklearn の transform を経由しない）
+    assets = GpuAssets(pca, memory_bank_compressed, device)
+    scorer = (
+        NearestNeighborScorer(memory_bank_compressed, device)
+        if SCORING_METHOD == SCORING_KNN
+        else None
+    )
+    score_maps = []
+    with torch.inference_mode():
+        for start in range(0, len(features), BATCH_SIZE):
+            batch = np.ascontiguousarray(features[start : start + BATCH_SIZE])
+            patches = torch.from_numpy(batch).to(device).reshape(-1, n_channels)
+            patches_pca = (patches - assets.pca_mean_t) @ assets.pca_components_t
+            map_shape = (len(batch),) + map_hw
+            if scorer is not None:
+                batch_maps = scorer.score(patches_pca).reshape(map_shape)
+            else:
+                scores = torch.linalg.vector_norm(
+                    patches_pca - assets.bank_mean_t, dim=1
+                )
+                batch_maps = scores.reshape(map_shape)
+            # バッチ単位でデバイス上で拡大する
+            score_maps.extend(
+                upsample_score_maps(batch_maps, IMAGE_SIZE, SCORE_UPSAMPLE_MODE)
+            )
+            logger.info(
+                f"Creating Z-score map... {start + len(batch_maps)}/{len(image_paths)}"
+            )
+    del features
 
     # モデル保存時にCPUに移動してからトレース
     model_cpu = model.cpu()
     example_input = torch.randn(1, 3, *IMAGE_SIZE)  # CPUテンソル
     scripted_model = torch.jit.trace(model_cpu, example_input)
-    scripted_model.save(os.path.join(MODEL_DIR, "model.pt"))
-    logger.info(f"Model and memory bank ({SAVE_FORMAT}) saved to {MODEL_DIR}")
-
-    # Zスコアマップ作成のためにモデルを再度GPUに移動
-    model = model.to(device)
-
-    score_maps = []
-    with torch.no_grad():
-        for idx, path in enumerate(image_paths):
-            image = load_image_unicode_path(path)
-            inputs = preprocess_cv2(image, AFFINE_POINTS, IMAGE_SIZE)
-            inputs = inputs.to(device)  # 入力をGPUに移動
-
-            if scaler and USE_MIXED_PRECISION:
-                with torch.amp.autocast(device_type="cuda", dtype=torch.float16):
-                    fmap = model(inputs)
-            else:
-                fmap = model(inputs)
-
-            patches = (
-                fmap.squeeze(0).permute(1, 2, 0).reshape(-1, fmap.size(1)).cpu().numpy()
-            )
-            patches = pca.transform(patches)
-            scores = np.linalg.norm(
-                patches - memory_bank_compressed.mean(axis=0), axis=1
-            )
-            score_map = scores.reshape(fmap.shape[2], fmap.shape[3])
-            raw_score_map = cv2.resize(
-                score_map, IMAGE_SIZE, interpolation=cv2.INTER_CUBIC
-            )
-            score_maps.append(raw_score_map)
-            if idx % 10 == 0:
-                logger.info(f"Creating Z-score map... {idx+1}/{len(image_paths)}")
+    scripted_model.save(os.path.join(MODEL_DIR, MODEL_FILENAME))
 
     score_maps = np.stack(score_maps)
     pixel_mean = np.mean(score_maps, axis=0)
     pixel_std = np.std(score_maps, axis=0)
 
-    with open(os.path.join(MODEL_DIR, "pixel_stats.pkl"), "wb") as f:
-        pickle.dump((pixel_mean, pixel_std), f)
-
-    logger.info("Pixel-wise Z-score statistics saved: pixel_stats.pkl")
+    # メモリバンク・PCA・ピクセル統計は1つのファイルにまとめて保存する
+    save_model_assets(
+        MODEL_DIR,
+        memory_bank_compressed if SAVE_FORMAT == "compressed" else memory_bank,
+        SAVE_FORMAT,
+        pca,
+        pixel_mean,
+        pixel_std,
+    )
+    logger.info(f"Model and assets (memory bank: {SAVE_FORMAT}) saved to {MODEL_DIR}")
 
     # GPU キャッシュクリア
     clear_gpu_cache()
@@ -1,21 +1,46 @@
 import os
-import glob
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import cv2
-from sklearn.decomposition import PCA  # noqa: F401
+import numpy as np
 from src.config.settings_loader import SettingsLoader
 from src.config import env_loader
 import logging
-from src.ml_engines.PatchCore.utils.inference_utils import save_overlay_image
+from src.ml_engines.PatchCore.utils.inference_utils import (
+    list_png_files,
+    load_image_unicode_path,
+    save_overlay_image,
+)
 from src.ml_engines.PatchCore.utils.model_loader import load_model_and_assets
 from src.ml_engines.PatchCore.core.inference_core import (
+    DISPLAY_SIZE,
     run_inference_on_image,
     GpuAssets,
 )
-from src.ml_engines.PatchCore.utils.device_utils import get_device
+from src.ml_engines.PatchCore.utils.device_utils import (
+    get_device,
+    select_quantized_engine,
+)
+from src.ml_engines.PatchCore.utils.nn_scorer import (
+    NearestNeighborScorer,
+    SCORING_KNN,
+    SCORING_MEAN,
+)
+from src.ml_engines.PatchCore.utils.score_utils import (
+    UPSAMPLE_BICUBIC,
+    inverse_pixel_std,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+# 画像の読み込みを並列に行うスレッド数（OpenCV のデコードは GIL を解放する）
+LOAD_WORKERS = min(4, os.cpu_count() or 1)
+# 推論中の画像より先に読み込んでおく枚数
+PREFETCH_IMAGES = 8
+# 結果画像の保存を行うスレッド数
+SAVE_WORKERS = 2
+
 
 def run_inference():
     MODEL_NAME = env_loader.DEFAULT_MODEL_NAME
@@ -31,69 +56,109 @@ def run_inference():
     Z_SCORE_THRESHOLD = loader.get_variable("Z_SCORE_THRESHOLD")
     Z_AREA_THRESHOLD = loader.get_variable("Z_AREA_THRESHOLD")
     Z_MAX_THRESHOLD = loader.get_variable("Z_MAX_THRESHOLD")
+    SCORING_METHOD = loader.get_variable("SCORING_METHOD", SCORING_MEAN)
+    SCORE_UPSAMPLE_MODE = loader.get_variable("SCORE_UPSAMPLE_MODE", UPSAMPLE_BICUBIC)
 
-    image_paths = glob.glob(os.path.join(SETTINGS_DIR, TEST_DIR, "*.png"))
+    image_paths = list_png_files(os.path.join(SETTINGS_DIR, TEST_DIR))
     if not image_paths:
         raise FileNotFoundError("No test images found.")
 
+    # int8 量子化モデルは CPU 専用（読み込み前に量子化エンジンを選択する）
+    quantize_int8 = loader.get_variable("QUANTIZE_INT8", False)
+    if quantize_int8:
+        select_quantized_engine()
+
     model, memory_bank, pca, pixel_mean, pixel_std = load_model_and_assets(
         MODEL_DIR, SAVE_FORMAT
     )
+    pixel_inv_std = inverse_pixel_std(pixel_std)
 
     # GPUデバイス設定
     use_gpu = loader.get_variable("USE_GPU")
     device_id = loader.get_variable("GPU_DEVICE_ID")
-    device = get_device(use_gpu, device_id)
+    device = get_device(use_gpu and not quantize_int8, device_id)
     model = model.to(device)
-    gpu_assets = GpuAssets(pca, memory_bank, device) if device.type == "cuda" else None
+    # PCA変換と距離計算は CPU 使用時もデバイス上の行列演算で行う
+    gpu_assets = GpuAssets(pca, memory_bank, device)
+    scorer = (
+        NearestNeighborScorer(memory_bank, device)
+        if SCORING_METHOD == SCORING_KNN
+        else None
+    )
     logging.info(f"Device: {device}")
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     img_save_dir = os.path.join(SETTINGS_DIR, "execute", "test", timestamp)
     os.makedirs(img_save_dir, exist_ok=True)
 
-    overlay_list = []
-    for i, image_path in enumerate(image_paths):
-        overlay, z_stats, is_ok = run_inference_on_image(
-            image_path,
-            model,
-            memory_bank,
-            pca,
-            pixel_mean,
-            pixel_std,
-            AFFINE_POINTS,
-            IMAGE_SIZE,
-            Z_SCORE_THRESHOLD,
-            Z_AREA_THRESHOLD,
-            Z_MAX_THRESHOLD,
-            device=device,
-            gpu_assets=gpu_assets,
+    # 全画像を横に並べた表示用画像を先に確保し、各結果を直接書き込む（最後の連結コピーを省く）
+    width, height = DISPLAY_SIZE
+    mosaic = np.empty((height, width * len(image_paths), 3), dtype=np.uint8)
+    # 画像の読み込み（デコード）と結果の保存はスレッドで行い、推論と重ねる
+    with (
+        ThreadPoolExecutor(max_workers=LOAD_WORKERS) as load_pool,
+        ThreadPoolExecutor(max_workers=SAVE_WORKERS) as save_pool,
+    ):
+        pending = deque(
+            load_pool.submit(load_image_unicode_path, path)
+            for path in image_paths[:PREFETCH_IMAGES]
         )
+        for i, image_path in enumerate(image_paths):
+            image = pending.popleft().result()
+            if i + PREFETCH_IMAGES < len(image_paths):
+                pending.append(
+                    load_pool.submit(
+                        load_image_unicode_path, image_paths[i + PREFETCH_IMAGES]
+                    )
+                )
 
-        label = "OK" if is_ok else "NG"
-        logging.info("-" * 10)
-        logging.info(f"{image_path}")
-        logging.info(
-            f"z_sum={z_stats['total']:.2f}, z_max={z_stats['maxval']:.2f}, z_area={z_stats['area']}"
-        )
-        logging.info(f"is_ok_z={is_ok}")
-        logging.info("-" * 10)
-
-        color = (0, 255, 0) if label == "OK" else (0, 0, 255)
-        cv2.putText(
-            overlay,
-            f"[{label}] {os.path.basename(image_path)}",
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
-            color,
-            2,
-        )
+            overlay, z_stats, is_ok = run_inference_on_image(
+                image_path,
+                model,
+                memory_bank,
+                pca,
+                pixel_mean,
+                pixel_std,
+                AFFINE_POINTS,
+                IMAGE_SIZE,
+                Z_SCORE_THRESHOLD,
+                Z_AREA_THRESHOLD,
+                Z_MAX_THRESHOLD,
+                device=device,
+                gpu_assets=gpu_assets,
+                scorer=scorer,
+                upsample_mode=SCORE_UPSAMPLE_MODE,
+                pixel_inv_std=pixel_inv_std,
+                image=image,
+            )
+
+            label = "OK" if is_ok else "NG"
+            logging.info("-" * 10)
+            logging.info(f"{image_path}")
+            logging.info(
+                f"z_sum={z_stats['total']:.2f}, z_max={z_stats['maxval']:.2f}, "
+                f"z_area={z_stats['area']}"
+            )
+            logging.info(f"is_ok_z={is_ok}")
+            logging.info("-" * 10)
+
+            color = (0, 255, 0) if label == "OK" else (0, 0, 255)
+            cv2.putText(
+                overlay,
+                f"[{label}] {os.path.basename(image_path)}",
+                (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.6,
+                color,
+                2,
+            )
 
-        save_overlay_image(overlay, img_save_dir, i, label, image_path)
-        overlay_list.append(overlay)
+            save_pool.submit(
+                save_overlay_image, overlay, img_save_dir, i, label, image_path
+            )
+            mosaic[:, i * width : (i + 1) * width] = overlay
 
-    cv2.imshow("Anomaly Map", cv2.hconcat(overlay_list))
+    cv2.imshow("Anomaly Map", mosaic)
     cv2.waitKey(0)
     cv2.destroyAllWindows()
 
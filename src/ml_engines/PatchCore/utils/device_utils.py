@@ -47,6 +47,26 @@ def get_device(use_gpu: bool = True, device_id: int = 0) -> torch.device:
     return torch.device("cpu")
 
 
+# int8 量子化モデルの CPU 実行エンジンの優先順（x86: oneDNN/FBGEMM を自動選択、qnnpack: ARM）
+QUANTIZED_ENGINES = ("x86", "onednn", "fbgemm", "qnnpack")
+
+
+def select_quantized_engine() -> str:
+    """
+    int8 量子化モデル用の CPU 実行エンジンを選択して設定する
+
+    量子化モデルの重みは読み込み時に選択中のエンジン向けに再パックされるため、
+    量子化（学習時）とモデル読み込み（推論時）の前に呼び出します。
+
+    Returns:
+        設定したエンジン名
+    """
+    supported = torch.backends.quantized.supported_engines
+    engine = next((e for e in QUANTIZED_ENGINES if e in supported), supported[0])
+    torch.backends.quantized.engine = engine
+    return engine
+
+
 def clear_gpu_cache() -> None:
     """
     GPU メモリキャッシュをクリアする
@@ -5,22 +5,45 @@
 """
 
 import os
+from functools import lru_cache
 import torch
 import numpy as np
 import cv2
 from PIL import Image
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def list_png_files(directory: str) -> List[str]:
+    """
+    ディレクトリ直下の PNG ファイルのパスを列挙する
+
+    os.scandir の DirEntry を使い、名前の判定とファイル種別の確認を
+    ディレクトリ読み取り時に得た情報だけで行います（ファイルごとの stat を省く）。
+
+    Args:
+        directory: 検索するディレクトリ
+
+    Returns:
+        PNG ファイルのパスのリスト（拡張子の大文字・小文字は区別しない）
+    """
+    with os.scandir(directory) as it:
+        return [
+            entry.path
+            for entry in it
+            if entry.name.lower().endswith(".png") and entry.is_file()
+        ]
+
+
 def load_image_unicode_path(path: str) -> np.ndarray:
     """
     Unicode パスに対応した画像読み込み
 
-    日本語を含むパスでも正しく画像を読み込めるように、
-    PILを経由してOpenCV形式に変換します。
+    日本語を含むパスでも正しく画像を読み込めるように、ファイルをバイト列として読み込み
+    cv2.imdecode で BGR に直接デコードします。
+    OpenCV がデコードできない形式の場合のみ PIL を経由します。
 
     Args:
         path: 画像ファイルのパス
@@ -41,8 +64,16 @@ def load_image_unicode_path(path: str) -> np.ndarray:
         raise FileNotFoundError(f"画像ファイルが見つかりません: {path}")
 
     try:
-        pil_img = Image.open(path).convert("RGB")
-        img_array = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        # EXIF の回転情報は PIL と同様に無視する（学習時と推論時で向きを揃える）
+        img_array = cv2.imdecode(
+            np.fromfile(path, dtype=np.uint8),
+            cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION,
+        )
+        if img_array is None:
+            pil_img = Image.open(path).convert("RGB")
+            # np.asarray は PIL の配列インターフェースを使いコピーを省く
+            # （cvtColor は新しい配列を確保するため読み取り専用でも問題ない）
+            img_array = cv2.cvtColor(np.asarray(pil_img), cv2.COLOR_RGB2BGR)
 
         if img_array is None or img_array.size == 0:
             raise ValueError(f"画像の読み込みに失敗しました: {path}")
@@ -54,8 +85,156 @@ def load_image_unicode_path(path: str) -> np.ndarray:
         raise ValueError(f"画像読み込みエラー ({path}): {str(e)}")
 
 
+@lru_cache(maxsize=16)
+def _perspective_matrix(
+    quad_pts: Tuple[Tuple[float, ...], ...], output_size: Tuple[int, int]
+) -> np.ndarray:
+    """
+    射影変換行列を計算する（4点座標と出力サイズはモデルごとに固定のためキャッシュする）
+
+    Returns:
+        3x3 の射影変換行列（共有されるため読み取り専用）
+    """
+    src_pts = np.array(quad_pts, dtype=np.float32)
+    dst_pts = np.array(
+        [
+            [0, 0],
+            [output_size[0], 0],
+            [output_size[0], output_size[1]],
+            [0, output_size[1]],
+        ],
+        dtype=np.float32,
+    )
+    M = cv2.getPerspectiveTransform(src_pts, dst_pts)
+    M.setflags(write=False)
+    return M
+
+
+def perspective_matrix(
+    quad_pts: List[List[float]], output_size: Tuple[int, int]
+) -> np.ndarray:
+    """
+    4点座標を出力画像の四隅に写す射影変換行列を返す（同じ引数では計算済みの行列を返す）
+
+    Args:
+        quad_pts: 射影変換に使用する4点座標（左上→右上→右下→左下の順）
+        output_size: 出力画像サイズ（幅, 高さ）のタプル
+
+    Returns:
+        3x3 の射影変換行列（読み取り専用）
+    """
+    return _perspective_matrix(tuple(map(tuple, quad_pts)), tuple(output_size))
+
+
+def warp_image(
+    image: np.ndarray,
+    quad_pts: List[List[float]],
+    output_size: Tuple[int, int],
+    dst: Optional[np.ndarray] = None,
+    M: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    4点の座標で射影変換（Perspective Transform）を行い、矩形画像を切り出す
+
+    Args:
+        image: 入力画像（BGR形式のNumPy配列）
+        quad_pts: 射影変換に使用する4点座標（左上→右上→右下→左下の順）
+        output_size: 出力画像サイズ（幅, 高さ）のタプル
+        dst: 出力先の配列（形状・型が一致すれば再確保せずに書き込む）
+        M: perspective_matrix() で計算済みの射影変換行列（省略時は quad_pts から求める）
+
+    Returns:
+        射影変換後の画像（uint8、形状: [H, W, C]）
+    """
+    output_size = tuple(output_size)  # type: ignore[assignment]
+    if M is None:
+        M = perspective_matrix(quad_pts, output_size)
+    return cv2.warpPerspective(image, M, output_size, dst=dst)
+
+
+def to_input_tensor(
+    warped: np.ndarray, device: Optional[torch.device] = None
+) -> torch.Tensor:
+    """
+    射影変換後の画像をモデル入力用のテンソルに変換する
+
+    uint8 のまま転送してから float 化・正規化するため、
+    device に GPU を指定した場合の転送量は float32 の 1/4 になり、正規化も GPU 上で行われます。
+
+    Args:
+        warped: 射影変換後の画像（uint8、形状: [H, W, C]）
+        device: 転送先デバイス（None の場合は CPU のまま）
+
+    Returns:
+        正規化された画像テンソル（形状: [1, C, H, W]、値域: [0.0, 1.0]）
+    """
+    tensor = torch.from_numpy(warped).permute(2, 0, 1).unsqueeze(0)
+    if device is not None:
+        tensor = tensor.to(device, non_blocking=True)
+    return tensor.float().div_(255.0)
+
+
+class InputBuffers:
+    """
+    同じサイズの画像を1枚ずつ推論する際に再利用する入力バッファ
+
+    射影変換の出力、uint8 のホスト側テンソル（GPU 使用時はピン留めメモリ）、
+    デバイス上の入力テンソルを一度だけ確保し、推論ごとのメモリ確保・解放を省きます。
+    返すテンソルとバッファは次の呼び出しで上書きされるため、同時に複数のスレッドから使用しないでください。
+
+    Attributes:
+        output_size: 出力画像サイズ（幅, 高さ）
+        warped: 射影変換の出力先（uint8、形状: [H, W, 3]）
+    """
+
+    def __init__(
+        self,
+        output_size: Tuple[int, int],
+        device: torch.device,
+        dtype: torch.dtype = torch.float32,
+        memory_format: torch.memory_format = torch.contiguous_format,
+    ) -> None:
+        """
+        Args:
+            output_size: 出力画像サイズ（幅, 高さ）
+            device: モデルを実行するデバイス
+            dtype: モデル入力の型（fp16 のモデルには torch.float16）
+            memory_format: モデル入力のメモリ配置（channels_last のモデルには torch.channels_last）
+        """
+        width, height = output_size
+        self.output_size = (width, height)
+        self.warped = np.empty((height, width, 3), dtype=np.uint8)
+        self._host = torch.empty(
+            (1, 3, height, width), dtype=torch.uint8, pin_memory=device.type == "cuda"
+        )
+        self._input = torch.empty(
+            (1, 3, height, width), dtype=dtype, device=device
+        ).contiguous(memory_format=memory_format)
+
+    def prepare(
+        self, image: np.ndarray, M: np.ndarray
+    ) -> Tuple[np.ndarray, torch.Tensor]:
+        """
+        射影変換してモデル入力用のテンソルを作る（いずれもバッファに書き込む）
+
+        Args:
+            image: 入力画像（BGR形式のNumPy配列）
+            M: perspective_matrix() で計算済みの射影変換行列
+
+        Returns:
+            (射影変換後の画像, 正規化された入力テンソル [1, 3, H, W])
+        """
+        warped = cv2.warpPerspective(image, M, self.output_size, dst=self.warped)
+        self._host[0].copy_(torch.from_numpy(warped).permute(2, 0, 1))
+        self._input.copy_(self._host, non_blocking=True)
+        return warped, self._input.div_(255.0)
+
+
 def preprocess_cv2(
-    image: np.ndarray, quad_pts: List[List[float]], output_size: Tuple[int, int]
+    image: np.ndarray,
+    quad_pts: List[List[float]],
+    output_size: Tuple[int, int],
+    device: Optional[torch.device] = None,
 ) -> torch.Tensor:
     """
     指定された画像に対して射影変換を行い、モデル入力用のテンソルに変換する
@@ -68,6 +247,7 @@ def preprocess_cv2(
         quad_pts: 射影変換に使用する4点座標（左上→右上→右下→左下の順）
                   例: [[0, 0], [640, 0], [640, 480], [0, 480]]
         output_size: 出力画像サイズ（幅, 高さ）のタプル
+        device: 転送先デバイス（指定時は uint8 で転送してから正規化する）
 
     Returns:
         正規化された画像テンソル（形状: [1, C, H, W]、値域: [0.0, 1.0]）
@@ -79,20 +259,7 @@ def preprocess_cv2(
         >>> print(tensor.shape)
         torch.Size([1, 3, 256, 256])
     """
-    src_pts = np.array(quad_pts, dtype=np.float32)
-    dst_pts = np.array(
-        [
-            [0, 0],
-            [output_size[0], 0],
-            [output_size[0], output_size[1]],
-            [0, output_size[1]],
-        ],
-        dtype=np.float32,
-    )
-    M = cv2.getPerspectiveTransform(src_pts, dst_pts)
-    warped = cv2.warpPerspective(image, M, output_size)
-    tensor = torch.from_numpy(warped.transpose(2, 0, 1)).float() / 255.0
-    return tensor.unsqueeze(0)
+    return to_input_tensor(warp_image(image, quad_pts, output_size), device)
 
 
 def save_overlay_image(
@@ -1,14 +1,124 @@
 """モデル読み込みユーティリティモジュール
 
 PatchCoreモデルと関連アセット（メモリバンク、PCA、統計情報）の読み込み機能を提供します。
+アセットは model_assets.pt にまとめて保存され、読み込み時はメモリマップで開くため
+実際に参照されるまでデータの読み込みは発生しません。
+旧形式（個別の .pkl ファイル）のモデルもそのまま読み込めます。
 """
 
 import os
 import torch
 import pickle
-from typing import Tuple, Any
+from typing import Dict, Tuple, Any
 import numpy as np
 
+from src.config.constants import (
+    MEMORY_BANK_COMPRESSED_FILENAME,
+    MEMORY_BANK_FILENAME,
+    MODEL_ASSETS_FILENAME,
+    MODEL_FILENAME,
+    PCA_FILENAME,
+    PIXEL_STATS_FILENAME,
+)
+
+# model_assets.pt に保存する配列の型（L2 距離の計算には float16 の精度で十分なため、
+# ファイルサイズ・読み込み量・メモリバンクのメモリ使用量を半分にする）
+ASSET_DTYPE = np.float16
+
+# float32 のまま保存する配列（Zスコアの計算に直接使う平均・標準偏差）
+# float16 に丸めると std が小さいピクセルで Zスコアが大きくずれ、閾値付近の判定が変わる。
+# いずれも小さい配列のため、float32 でもファイルサイズへの影響はほぼない
+_FLOAT32_KEYS = frozenset(("pca_mean", "pixel_mean", "pixel_std"))
+
+# model_assets.pt 内のキー
+_BANK_KEYS = {
+    "compressed": "memory_bank_compressed",
+    "full": "memory_bank",
+}
+
+
+class PcaProjection:
+    """
+    学習済みPCAの射影（平均を引いて主成分へ射影）だけを行うクラス
+
+    sklearn.decomposition.PCA と同じ属性名・transform を持ち、推論側ではそのまま置き換えられます
+    （whiten=False の PCA のみ対応）。
+
+    Attributes:
+        components_: 主成分（形状: [n_components, dim]）
+        mean_: 学習データの平均（形状: [dim]）
+    """
+
+    def __init__(self, components: np.ndarray, mean: np.ndarray) -> None:
+        self.components_ = np.asarray(components, dtype=np.float32)
+        self.mean_ = np.asarray(mean, dtype=np.float32)
+        # 射影に使う転置済みの主成分（transform ごとの転置・型変換を省く）
+        self._components_t = np.ascontiguousarray(self.components_.T)
+
+    @classmethod
+    def from_pca(cls, pca: Any) -> "PcaProjection":
+        """学習済みの sklearn.decomposition.PCA から射影部分だけを取り出す"""
+        return cls(pca.components_, pca.mean_)
+
+    @property
+    def n_components_(self) -> int:
+        return int(self.components_.shape[0])
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        特徴ベクトル（形状: [N, dim]）を主成分空間へ射影する
+
+        sklearn の transform と異なり入力検証を行わず、float32 の行列積のみで計算します。
+        """
+        centered = np.subtract(X, self.mean_, dtype=np.float32)
+        return centered @ self._components_t  # type: ignore[no-any-return]
+
+
+def save_model_assets(
+    model_dir: str,
+    memory_bank: np.ndarray,
+    save_format: str,
+    pca: Any,
+    pixel_mean: np.ndarray,
+    pixel_std: np.ndarray,
+) -> str:
+    """メモリバンク・PCA・ピクセル統計を1つのファイルに保存する
+
+    メモリバンクと PCA の主成分は ASSET_DTYPE（float16）、
+    平均・標準偏差（_FLOAT32_KEYS）は float32 で保存します。
+
+    Args:
+        model_dir: 保存先ディレクトリ
+        memory_bank: メモリバンク（save_format に対応する方）
+        save_format: メモリバンクの保存形式（"compressed" または "full"）
+        pca: 学習済みPCA（components_ と mean_ を使用）
+        pixel_mean: ピクセルごとのスコア平均
+        pixel_std: ピクセルごとのスコア標準偏差
+
+    Returns:
+        保存したファイルのパス
+    """
+    arrays: Dict[str, np.ndarray] = {
+        _BANK_KEYS.get(save_format, "memory_bank"): memory_bank,
+        "pca_components": pca.components_,
+        "pca_mean": pca.mean_,
+        "pixel_mean": pixel_mean,
+        "pixel_std": pixel_std,
+    }
+    path = os.path.join(model_dir, MODEL_ASSETS_FILENAME)
+    torch.save(
+        {
+            k: torch.from_numpy(
+                np.ascontiguousarray(
+                    v, dtype=np.float32 if k in _FLOAT32_KEYS else ASSET_DTYPE
+                )
+            )
+            for k, v in arrays.items()
+        },
+        path,
+    )
+    return path
+
 
 def load_model_and_assets(
     model_dir: str, save_format: str
@@ -21,14 +131,14 @@ def load_model_and_assets(
     Args:
         model_dir: モデルファイルが格納されたディレクトリパス
         save_format: メモリバンクの保存形式
-                     - "compressed": PCA圧縮版（memory_bank_compressed.pkl）
-                     - その他: 非圧縮版（memory_bank.pkl）
+                     - "compressed": PCA圧縮版
+                     - その他: 非圧縮版
 
     Returns:
         読み込まれたアセットのタプル:
         - model: TorchScript形式のPatchCoreモデル（評価モード）
         - memory_bank: 特徴ベクトルのメモリバンク（NumPy配列）
-        - pca: 次元削減用のPCA変換器（sklearn.decomposition.PCA）
+        - pca: 次元削減用のPCA変換器（PcaProjection）
         - pixel_mean: ピクセル値の平均値（正規化用）
         - pixel_std: ピクセル値の標準偏差（正規化用）
 
@@ -46,20 +156,47 @@ def load_model_and_assets(
     Note:
         - モデルは自動的に評価モード（eval()）に設定されます
         - 圧縮版メモリバンクはメモリ使用量を大幅に削減します（推奨）
+        - model_assets.pt がない場合は旧形式の .pkl ファイルを読み込みます
     """
-    model = torch.jit.load(os.path.join(model_dir, "model.pt"))
+    model = torch.jit.load(os.path.join(model_dir, MODEL_FILENAME))
     model.eval()
 
+    assets_path = os.path.join(model_dir, MODEL_ASSETS_FILENAME)
+    if os.path.exists(assets_path):
+        # テンソルのみを含むため weights_only で読み込み、mmap で遅延読み込みする
+        assets = torch.load(
+            assets_path, map_location="cpu", weights_only=True, mmap=True
+        )
+        bank_key = _BANK_KEYS.get(save_format, "memory_bank")
+        if bank_key not in assets:
+            raise FileNotFoundError(
+                f"{assets_path} に {save_format} 形式のメモリバンクがありません"
+            )
+        # メモリバンクは float16 のまま（メモリマップ）返し、計算側で必要な分だけ float32 にする。
+        # 小さい PCA とピクセル統計は推論ごとの型変換を避けるため float32 に戻しておく
+        pca = PcaProjection(
+            assets["pca_components"].float().numpy(),
+            assets["pca_mean"].float().numpy(),
+        )
+        return (
+            model,
+            assets[bank_key].numpy(),
+            pca,
+            assets["pixel_mean"].float().numpy(),
+            assets["pixel_std"].float().numpy(),
+        )
+
     bank_path = (
-        "memory_bank_compressed.pkl"
+        MEMORY_BANK_COMPRESSED_FILENAME
         if save_format == "compressed"
-        else "memory_bank.pkl"
+        else MEMORY_BANK_FILENAME
     )
     with open(os.path.join(model_dir, bank_path), "rb") as f:
         memory_bank = pickle.load(f)
-    with open(os.path.join(model_dir, "pca.pkl"), "rb") as f:
-        pca = pickle.load(f)
-    with open(os.path.join(model_dir, "pixel_stats.pkl"), "rb") as f:
+    with open(os.path.join(model_dir, PCA_FILENAME), "rb") as f:
+        # 推論では射影しか使わないため、sklearn の PCA は PcaProjection に置き換える
+        pca = PcaProjection.from_pca(pickle.load(f))
+    with open(os.path.join(model_dir, PIXEL_STATS_FILENAME), "rb") as f:
         pixel_mean, pixel_std = pickle.load(f)
 
     return model, memory_bank, pca, pixel_mean, pixel_std
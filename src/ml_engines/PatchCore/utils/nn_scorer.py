@@ -0,0 +1,119 @@
+"""
+最近傍スコアリングモジュール
+
+PatchCore 本来の異常スコア（各パッチ特徴とメモリバンク内の最近傍との距離）を計算します。
+faiss がインストールされていれば faiss の全探索インデックスを使用し、
+なければ PyTorch でクエリをチャンクに分けて距離を計算します。
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import torch
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - faiss は任意依存（pip install .[knn]）
+    faiss = None  # type: ignore[assignment]
+
+# スコアリング方式（settings.py の SCORING_METHOD）
+# "mean": メモリバンク平均との距離（従来方式）
+# "knn": メモリバンク内の最近傍との距離（PatchCore 本来の方式）
+SCORING_MEAN = "mean"
+SCORING_KNN = "knn"
+SCORING_METHODS = (SCORING_MEAN, SCORING_KNN)
+
+# PyTorch で距離を計算する際のクエリのチャンクサイズ（距離行列のメモリ使用量を抑える）
+QUERY_CHUNK_SIZE = 1024
+
+
+def greedy_coreset_indices(
+    features: np.ndarray, n_select: int, device: torch.device, seed: int = 0
+) -> np.ndarray:
+    """
+    貪欲法（k-center）でコアセットを選択する
+
+    既に選んだ点から最も遠い点を順に選ぶことで、少ない点数で特徴空間全体を覆います。
+    各ステップの距離計算は全点に対して一括で行います（GPU 使用時は GPU 上で実行）。
+
+    Args:
+        features: 特徴ベクトル（形状: [N, dim]）
+        n_select: 選択する点数
+        device: 計算に使用するデバイス
+        seed: 最初の1点を選ぶ乱数シード
+
+    Returns:
+        選択した行のインデックス（形状: [n_select]、選択順）
+    """
+    n = len(features)
+    if n_select >= n:
+        return np.arange(n)
+
+    feats = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32)).to(
+        device
+    )
+    selected = np.empty(n_select, dtype=np.int64)
+    idx = int(np.random.default_rng(seed).integers(n))
+    min_dist = torch.full((n,), float("inf"), device=device)
+    with torch.inference_mode():
+        for i in range(n_select):
+            selected[i] = idx
+            dist = torch.linalg.vector_norm(feats - feats[idx], dim=1)
+            min_dist = torch.minimum(min_dist, dist)
+            idx = int(torch.argmax(min_dist))
+    return selected
+
+
+class NearestNeighborScorer:
+    """
+    メモリバンク内の最近傍までの L2 距離を計算するクラス
+
+    Attributes:
+        dim: 特徴ベクトルの次元数
+        device: PyTorch で計算する場合のデバイス
+    """
+
+    def __init__(self, memory_bank: np.ndarray, device: torch.device) -> None:
+        """
+        Args:
+            memory_bank: メモリバンク（形状: [M, dim]、PCA変換済み）
+            device: PyTorch で計算する場合のデバイス
+        """
+        bank = np.ascontiguousarray(memory_bank, dtype=np.float32)
+        self.dim = bank.shape[1]
+        self.device = device
+        self._index = None
+        self._bank_t: Optional[torch.Tensor] = None
+        if faiss is not None:
+            self._index = faiss.IndexFlatL2(self.dim)
+            self._index.add(bank)
+        else:
+            self._bank_t = torch.from_numpy(bank).to(device)
+
+    def score(self, patches: Union[np.ndarray, torch.Tensor]) -> np.ndarray:
+        """
+        各パッチ特徴について、メモリバンク内の最近傍までの距離を返す
+
+        Args:
+            patches: PCA変換済みのパッチ特徴（形状: [N, dim]）
+
+        Returns:
+            最近傍距離（形状: [N]、float32）
+        """
+        if self._index is not None:
+            if isinstance(patches, torch.Tensor):
+                patches = patches.float().cpu().numpy()
+            queries = np.ascontiguousarray(patches, dtype=np.float32)
+            distances, _ = self._index.search(queries, 1)
+            # faiss は二乗距離を返す（丸め誤差で負になる場合があるため 0 で下限を取る）
+            return np.sqrt(np.maximum(distances[:, 0], 0.0))
+
+        if isinstance(patches, np.ndarray):
+            patches = torch.from_numpy(np.ascontiguousarray(patches, dtype=np.float32))
+        queries = patches.to(self.device, dtype=torch.float32)
+        with torch.inference_mode():
+            nearest = [
+                torch.cdist(chunk, self._bank_t).min(dim=1).values
+                for chunk in queries.split(QUERY_CHUNK_SIZE)
+            ]
+        return torch.cat(nearest).cpu().numpy()  # type: ignore[no-any-return]
@@ -1,26 +1,210 @@
+from typing import Optional, Tuple, Union
+
 import numpy as np
+import torch
+import torch.nn.functional as F
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba は任意依存（pip install .[fast]）
+    njit = None
+
+# スコアマップの拡大方式（settings.py の SCORE_UPSAMPLE_MODE）
+# "bicubic": 従来の cv2.INTER_CUBIC 相当
+# "bilinear": 双線形補間（高速。滑らかなスコアマップでは見た目の差はほぼない）
+UPSAMPLE_BICUBIC = "bicubic"
+UPSAMPLE_BILINEAR = "bilinear"
+UPSAMPLE_MODES = (UPSAMPLE_BICUBIC, UPSAMPLE_BILINEAR)
+
+
+# 標準偏差が 0 のピクセルで割り算が発散しないようにするための下限値
+PIXEL_STD_EPS = 1e-6
+
+
+def inverse_pixel_std(pixel_std: np.ndarray) -> np.ndarray:
+    """
+    ピクセルごとの標準偏差の逆数を計算する（モデル読み込み時に1回だけ呼ぶ）
+
+    Args:
+        pixel_std: ピクセルごとのスコア標準偏差
+
+    Returns:
+        1 / pixel_std（0 の画素は PIXEL_STD_EPS に置き換える、float32）
+    """
+    safe = np.where(pixel_std == 0, PIXEL_STD_EPS, pixel_std)
+    return (1.0 / safe).astype(np.float32)
+
 
+def to_z_score_map(
+    raw_score_map: np.ndarray, pixel_mean: np.ndarray, pixel_inv_std: np.ndarray
+) -> np.ndarray:
+    """
+    スコアマップをその場で Zスコアマップに変換する
+
+    (raw - mean) / std を減算と乗算の2回の走査で計算し、中間配列を作りません。
+    raw_score_map は上書きされます。
+
+    Args:
+        raw_score_map: 画像サイズに拡大したスコアマップ（float32、書き込み可能）
+        pixel_mean: ピクセルごとのスコア平均
+        pixel_inv_std: inverse_pixel_std() の戻り値
+
+    Returns:
+        Zスコアマップ（raw_score_map と同じ配列）
+    """
+    np.subtract(raw_score_map, pixel_mean, out=raw_score_map, casting="unsafe")
+    np.multiply(raw_score_map, pixel_inv_std, out=raw_score_map)
+    return raw_score_map
 
-def evaluate_z_score_map(z_map: np.ndarray, z_score_threshold: float) -> dict:
-    total = np.sum(z_map)
-    area = np.sum(z_map > z_score_threshold)
-    maxval = np.max(z_map)
-    mean = np.mean(z_map)
-    std = np.std(z_map)
-    minval = np.min(z_map)
-    percentile_95 = np.percentile(z_map, 95)
-    area_ratio = area / z_map.size
 
-    return {
+def upsample_score_maps(
+    score_maps: Union[np.ndarray, torch.Tensor],
+    image_size: Tuple[int, int],
+    mode: str = UPSAMPLE_BICUBIC,
+) -> np.ndarray:
+    """
+    スコアマップを画像サイズに拡大する
+
+    テンソルが置かれているデバイス上（GPU 使用時は GPU 上）でまとめて補間し、
+    CPU への転送は最後に1回だけ行います。
+
+    Args:
+        score_maps: スコアマップ（形状: [B, h, w]）
+        image_size: 拡大後のサイズ（幅, 高さ）
+        mode: 補間方式（UPSAMPLE_MODES のいずれか）
+
+    Returns:
+        拡大したスコアマップ（形状: [B, 高さ, 幅]、float32）
+    """
+    if isinstance(score_maps, np.ndarray):
+        score_maps = torch.from_numpy(np.ascontiguousarray(score_maps))
+    resized = F.interpolate(
+        score_maps.float().unsqueeze(1),
+        size=(image_size[1], image_size[0]),
+        mode=mode,
+        align_corners=False,
+    )
+    return resized.squeeze(1).cpu().numpy()  # type: ignore[no-any-return]
+
+
+def upsample_z_score_map(
+    score_map: Union[np.ndarray, torch.Tensor],
+    image_size: Tuple[int, int],
+    mode: str,
+    z_scale: torch.Tensor,
+    z_shift: torch.Tensor,
+    out: Optional[torch.Tensor] = None,
+) -> np.ndarray:
+    """
+    スコアマップを画像サイズに拡大し、そのまま Zスコアマップに変換する
+
+    拡大と標準化（z = raw * (1 / std) + (-mean / std)）をデバイス上で続けて行い、
+    CPU への転送は標準化後の1回だけにします。
+
+    Args:
+        score_map: スコアマップ（形状: [h, w]）
+        image_size: 拡大後のサイズ（幅, 高さ）
+        mode: 補間方式（UPSAMPLE_MODES のいずれか）
+        z_scale: 1 / pixel_std（形状: [高さ, 幅]、計算に使うデバイス上のテンソル）
+        z_shift: -pixel_mean / pixel_std（z_scale と同じ形状・デバイス）
+        out: 転送先の CPU テンソル（指定時は再確保せずに書き込み、その配列を返す）
+
+    Returns:
+        Zスコアマップ（形状: [高さ, 幅]、float32）
+    """
+    if isinstance(score_map, np.ndarray):
+        score_map = torch.from_numpy(np.ascontiguousarray(score_map))
+    resized = F.interpolate(
+        score_map.to(z_scale.device).float()[None, None],
+        size=(image_size[1], image_size[0]),
+        mode=mode,
+        align_corners=False,
+    )[0, 0]
+    z = torch.addcmul(z_shift, resized, z_scale)
+    if out is None:
+        return z.cpu().numpy()  # type: ignore[no-any-return]
+    out.copy_(z)
+    return out.numpy()  # type: ignore[no-any-return]
+
+
+def _reduce_numpy(z: np.ndarray, thr: float) -> Tuple[float, int, float, float, float]:
+    """NumPy で (合計, 閾値超え画素数, 最大, 最小, 二乗和) を求める（numba 未導入時）"""
+    total = float(z.sum(dtype=np.float64))
+    sumsq = float(np.einsum("i,i->", z, z, dtype=np.float64))
+    return total, int(np.count_nonzero(z > thr)), float(z.max()), float(z.min()), sumsq
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _reduce_numba(z, thr):  # pragma: no cover - numba でコンパイルされる
+        total = 0.0
+        sumsq = 0.0
+        area = 0
+        maxv = z[0]
+        minv = z[0]
+        for i in range(z.size):
+            v = z[i]
+            total += v
+            sumsq += v * v
+            if v > thr:
+                area += 1
+            if v > maxv:
+                maxv = v
+            if v < minv:
+                minv = v
+        return total, area, float(maxv), float(minv), sumsq
+
+    _reduce = _reduce_numba
+else:
+    _reduce = _reduce_numpy
+
+
+def _percentile_linear(z: np.ndarray, q: float) -> float:
+    """np.percentile（linear 補間）と同じ値を np.partition で求める（全体のソートを省く）"""
+    pos = q / 100.0 * (z.size - 1)
+    lo = int(pos)
+    hi = min(lo + 1, z.size - 1)
+    part = np.partition(z, (lo, hi))
+    return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+
+
+def evaluate_z_score_map(
+    z_map: np.ndarray, z_score_threshold: float, with_percentile: bool = True
+) -> dict:
+    """
+    Zスコアマップの統計情報を計算する。
+
+    合計・閾値超え画素数・最大・最小・二乗和を1回の走査でまとめて求め、
+    平均と標準偏差はそこから導出する（統計ごとに配列全体を走査しない）。
+
+    Args:
+        z_map (np.ndarray): Zスコアマップ。
+        z_score_threshold (float): 異常画素とみなすZスコアの閾値。
+        with_percentile (bool): percentile_95 を計算するか。
+            唯一追加の走査が必要な統計のため、判定と API 応答だけが目的なら False にする。
+
+    Returns:
+        dict: total, area, maxval, mean, std, minval, area_ratio
+        （with_percentile=True の場合は percentile_95 も含む）。
+    """
+    z = z_map.ravel()
+    n = z.size
+    total, area, maxval, minval, sumsq = _reduce(z, z_score_threshold)
+    mean = total / n
+
+    stats = {
         "total": total,
         "area": area,
         "maxval": maxval,
         "mean": mean,
-        "std": std,
+        "std": float(np.sqrt(max(sumsq / n - mean * mean, 0.0))),
         "minval": minval,
-        "percentile_95": percentile_95,
-        "area_ratio": area_ratio,
+        "area_ratio": area / n,
     }
+    if with_percentile:
+        stats["percentile_95"] = _percentile_linear(z, 95)
+    return stats
 
 
 def is_ok_z(
@@ -5,7 +5,7 @@
 型安全性を向上させ、IDEの補完機能を活用できるようにします。
 """
 
-from typing import TypedDict, Literal
+from typing import Dict, TypedDict, Literal, Union
 import numpy as np
 from numpy.typing import NDArray
 
@@ -98,6 +98,25 @@ class PredictionResult(TypedDict):
     image_id: ImageIds
 
 
+class JobResult(TypedDict, total=False):
+    """
+    推論ジョブの結果（GET /jobs/{job_id} の result）
+
+    detail_level="basic" では z_stats を area / maxval に絞り、thresholds を含みません。
+
+    Attributes:
+        label: 判定結果（"OK" または "NG"）
+        image_id: 保存された画像のID
+        z_stats: Z-score統計情報（detail_levelにより内容が変わる）
+        thresholds: 使用されたしきい値（full のみ）
+    """
+
+    label: LabelType
+    image_id: ImageIds
+    z_stats: Union[ZScoreStats, Dict[str, float]]
+    thresholds: Thresholds
+
+
 class APIResponse(TypedDict):
     """
     API エンドポイントの応答形式
@@ -106,7 +106,7 @@ class EnvGUIEditor:
             "API_WORKERS": {
                 "type": "int",
                 "label": "APIワーカー数",
-                "description": "並列実行するワーカープロセス数",
+                "description": "ワーカープロセス数（ジョブキューがプロセス内のため現在は 1 固定）",
                 "min": 1,
                 "max": 16,
                 "default": 1,
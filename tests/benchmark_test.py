@@ -23,16 +23,36 @@ def run_benchmark():
         print("サーバーが起動していません")
         return
 
+    # テスト画像の準備
+    try:
+        from src.config import env_loader
+
+        MODEL_NAME = env_loader.DEFAULT_MODEL_NAME
+        img_list_path = f"settings/models/{MODEL_NAME}/test_image/*.png"
+        img_list = glob.glob(img_list_path)
+    except Exception as e:
+        print(f"設定読み込みエラー: {e}")
+        return
+
+    if len(img_list) == 0:
+        print(f"テスト画像が見つかりません: {img_list_path}")
+        return
+
+    # モデルをロード（未ロードなら）
+    status_info = client.model_status(MODEL_NAME)
+    if status_info is None or status_info.get("status") != "loaded":
+        print(f"モデルをロード中: {MODEL_NAME}")
+        client.load_model(MODEL_NAME)
+        status_info = client.model_status(MODEL_NAME)
+
     # システム情報表示
     try:
-        system_response = client.get("/system_info")
-        gpu_response = client.get("/gpu_info")
-        status_response = client.get("/status")
+        system_info = client.fetch_system_info()
+        gpu_info = client.fetch_gpu_info()
 
         print("=== システム情報 ===")
 
-        if system_response.status_code == 200:
-            system_info = system_response.json()
+        if "error" not in system_info:
             print(f"プラットフォーム: {system_info.get('platform', 'N/A')}")
             print(f"CPU: {system_info.get('cpu_count', 'N/A')}コア")
             print(f"RAM: {system_info.get('memory_total', 'N/A')}")
@@ -40,16 +60,15 @@ def run_benchmark():
         else:
             print("システム情報の取得に失敗")
 
-        if gpu_response.status_code == 200:
-            gpu_info = gpu_response.json()
+        if "error" not in gpu_info:
             print(f"CUDA: {gpu_info.get('cuda_available', False)}")
             print(f"現在のデバイス: {gpu_info.get('current_device', 'N/A')}")
         else:
             print("GPU情報の取得に失敗")
 
-        if status_response.status_code == 200:
-            status_info = status_response.json()
-            print(f"モデル: {status_info.get('model', 'N/A')}")
+        if status_info is not None:
+            name = status_info.get("name", "N/A")
+            print(f"モデル: {name} ({status_info.get('status', 'N/A')})")
             print(f"キャッシュ画像数: {status_info.get('image_cache', 0)}")
         else:
             print("ステータス情報の取得に失敗")
@@ -59,21 +78,6 @@ def run_benchmark():
 
     print()
 
-    # テスト画像の準備
-    try:
-        from src.config import env_loader
-
-        MODEL_NAME = env_loader.DEFAULT_MODEL_NAME
-        img_list_path = f"settings/models/{MODEL_NAME}/test_image/*.png"
-        img_list = glob.glob(img_list_path)
-    except Exception as e:
-        print(f"設定読み込みエラー: {e}")
-        return
-
-    if len(img_list) == 0:
-        print(f"テスト画像が見つかりません: {img_list_path}")
-        return
-
     # ベンチマーク実行
     print("=== ベンチマーク開始 ===")
     print(f"テスト画像数: {len(img_list)}枚")
@@ -87,10 +91,12 @@ def run_benchmark():
             img = load_image_unicode_path(img_path)
 
             start_time = time.perf_counter()
-            response = client.predict(img)
+            response = client.predict(MODEL_NAME, img)
             end_time = time.perf_counter()
 
             process_time = end_time - start_time
+            if response is None:
+                raise RuntimeError("推論に失敗しました")
             times.append(process_time)
             results[response["label"]] += 1
 
@@ -140,9 +146,8 @@ def run_benchmark():
 
     # GPU メモリ情報（利用可能な場合のみ）
     try:
-        gpu_response = client.get("/gpu_info")
-        if gpu_response.status_code == 200:
-            gpu_info = gpu_response.json()
+        gpu_info = client.fetch_gpu_info()
+        if "error" not in gpu_info:
             if gpu_info.get("cuda_available", False):
                 memory_info = gpu_info.get("memory", {})
                 print(f"\nGPU メモリ: {memory_info}")
@@ -9,13 +9,65 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import glob
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import cv2
 import numpy as np
 
 from src.api.client.patchcore_api_client import PatchCoreApiClient
 from src.config import env_loader
-from src.ml_engines.PatchCore.utils.inference_utils import load_image_unicode_path
+
+# 同時に処理中にするリクエスト数（サーバーの同時処理能力に合わせて調整）
+MAX_WORKERS = 8
+# 1 回の HTTP リクエストでまとめて送る画像枚数
+BATCH_SIZE = 8
+# 画像ファイルの先読みに使うスレッド数
+LOADER_WORKERS = 4
+# 進行状況表示の更新間隔（枚）
+PROGRESS_INTERVAL = 10
+# 結果画像の表示間隔（秒）。間隔内に届いた結果は表示を省略して集計ループを止めない
+DISPLAY_INTERVAL = 0.1
+
+
+def show_frame(item: tuple) -> None:
+    """結果画像の合成と表示（HighGUI はメインスレッドで使う必要があるため、メインループから呼ぶ）"""
+    org, ovr, label, api_elapse, elapse, progress = item
+    ovr = cv2.resize(ovr, [400, 400])
+    org = cv2.resize(org, [400, 400])
+    img_display = cv2.hconcat([org, ovr])
+    color = (0, 255, 0) if label == "OK" else (0, 0, 255)
+
+    cv2.putText(img_display, label, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
+    cv2.putText(
+        img_display,
+        f"API: {api_elapse:.3f}s",
+        (10, 60),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.5,
+        (255, 255, 255),
+        1,
+    )
+    cv2.putText(
+        img_display,
+        f"Total: {elapse:.3f}s",
+        (10, 80),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.5,
+        (255, 255, 255),
+        1,
+    )
+    cv2.putText(
+        img_display,
+        progress,
+        (10, 390),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.5,
+        (255, 255, 255),
+        1,
+    )
+
+    cv2.imshow("frame", img_display)
+    cv2.waitKey(1)
 
 
 def main():
@@ -50,73 +102,130 @@ def main():
         raise ValueError(f"画像が0枚だよ:{img_list_path}")
 
     print(f"\n処理開始: {len(img_list)}枚の画像")
-    tmp = []
+    tmp = np.empty(len(img_list), dtype=np.float64)
+    n_done = 0
     ok_count = 0
     ng_count = 0
     ng_list = []
 
-    for i, img_path in enumerate(img_list):
+    def read_batch(paths):
+        """バッチ分の画像ファイルをバイト列で読み込む（先読みスレッドで実行）"""
+        # ファイルのバイト列をそのまま送信（デコード→PNG 再エンコードを省略）
+        imgs = []
+        for p in paths:
+            with open(p, "rb") as f:
+                imgs.append(f.read())
+        return imgs
+
+    def process_batch(paths, imgs_future):
+        """バッチ単位の推論（ワーカースレッドで実行）"""
         start = time.perf_counter()
-        img = load_image_unicode_path(img_path)
+        imgs = imgs_future.result()
 
-        # API呼び出し時間を測定
+        # API呼び出し時間を測定（バッチ全体で 1 回の POST、結果画像もポーリング応答に同梱）
         api_start = time.perf_counter()
-        response = client.predict(MODEL_NAME, img)
+        responses = client.predict_batch(MODEL_NAME, imgs, return_images=True)
         api_end = time.perf_counter()
 
-        if response is None:
-            print(f"\n推論失敗: {img_path}")
-            continue
-
-        if response["label"] != "OK":
-            ng_list.append(response["image_id"]["overlay"])
-
-        # 画像取得時間を測定
-        img_start = time.perf_counter()
-        ovr = client.fetch_image(MODEL_NAME, response["image_id"]["overlay"])
-        org = client.fetch_image(MODEL_NAME, response["image_id"]["original"])
-        img_end = time.perf_counter()
-
-        end = time.perf_counter()
-
-        # 結果カウント
-        if response["label"] == "OK":
-            ok_count += 1
-        else:
-            ng_count += 1
-
-        if ovr is not None and org is not None:
-            ovr = cv2.resize(ovr, [400, 400])
-            org = cv2.resize(org, [400, 400])
-            img_display = cv2.hconcat([org, ovr])
-            color = (0, 255, 0) if response["label"] == "OK" else (0, 0, 255)
-
-            cv2.putText(img_display, response["label"], (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
-            cv2.putText(img_display, f"API: {api_end-api_start:.3f}s", (10, 60),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(img_display, f"IMG: {img_end-img_start:.3f}s", (10, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(img_display, f"Total: {end-start:.3f}s", (10, 100),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(img_display, f"{i+1}/{len(img_list)}", (10, 390),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-
-            cv2.imshow("frame", img_display)
-            cv2.waitKey(1)
-
-        elapse = end - start
-        print(f"\r進行状況: {i+1}/{len(img_list)} | 時間: {elapse:.4f}s | OK: {ok_count} | NG: {ng_count}", end="")
-        tmp.append(elapse)
+        # バッチの所要時間を枚数で割った 1 枚あたりの時間
+        # （並行する他のバッチの待ち時間を含むため、単体の推論時間ではない）
+        n = len(paths)
+        timings = ((api_end - api_start) / n, (api_end - start) / n)
+
+        results = []
+        for img_path, response in zip(paths, responses):
+            if response is None:
+                results.append((img_path, None, None, None, (0.0, 0.0)))
+                continue
+            images = response.pop("images", {})
+            results.append(
+                (
+                    img_path,
+                    response,
+                    images.get("overlay"),
+                    images.get("original"),
+                    timings,
+                )
+            )
+        return results
+
+    batches = [
+        img_list[i : i + BATCH_SIZE] for i in range(0, len(img_list), BATCH_SIZE)
+    ]
+
+    # サーバー処理中にクライアントが待たないよう、複数バッチを並行に投げる
+    # 表示（cv2.imshow）は HighGUI の制約によりメインスレッドの集計ループで行い、
+    # DISPLAY_INTERVAL ごとに 1 枚だけ表示する
+    last_display = float("-inf")
+    # ディスク読み込みは先読み用スレッドで行い、推論リクエストと重ねる
+    run_start = time.perf_counter()
+    with (
+        ThreadPoolExecutor(max_workers=LOADER_WORKERS) as loader,
+        ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex,
+    ):
+        futures = [
+            ex.submit(process_batch, b, loader.submit(read_batch, b)) for b in batches
+        ]
+        completed = (r for future in as_completed(futures) for r in future.result())
+        for i, item in enumerate(completed):
+            img_path, response, ovr, org, timings = item
+            api_elapse, elapse = timings
+
+            if response is None:
+                print(f"\n推論失敗: {img_path}")
+                continue
+
+            if response["label"] != "OK":
+                ng_list.append(response["image_id"]["overlay"])
+
+            # 結果カウント
+            if response["label"] == "OK":
+                ok_count += 1
+            else:
+                ng_count += 1
+
+            now = time.perf_counter()
+            if (
+                ovr is not None
+                and org is not None
+                and now - last_display >= DISPLAY_INTERVAL
+            ):
+                last_display = now
+                show_frame(
+                    (
+                        org,
+                        ovr,
+                        response["label"],
+                        api_elapse,
+                        elapse,
+                        f"{i+1}/{len(img_list)}",
+                    )
+                )
+
+            tmp[n_done] = elapse
+            n_done += 1
+            if i % PROGRESS_INTERVAL == 0 or i + 1 == len(img_list):
+                sys.stdout.write(
+                    f"\r進行状況: {i+1}/{len(img_list)} | 時間: {elapse:.4f}s | "
+                    f"OK: {ok_count} | NG: {ng_count}"
+                )
+                sys.stdout.flush()
+
+    wall_time = time.perf_counter() - run_start
 
     print("\n\n=== 結果サマリー ===")
     print(f"総処理数: {len(img_list)}枚")
     print(f"OK: {ok_count}枚, NG: {ng_count}枚")
-    if tmp:
-        print(f"平均処理時間: {np.average(tmp):.4f}秒")
-        print(f"最大処理時間: {np.max(tmp):.4f}秒")
-        print(f"最小処理時間: {np.min(tmp):.4f}秒")
-        print(f"処理時間の標準偏差: {np.std(tmp):.4f}秒")
+    tmp = tmp[:n_done]
+    if n_done:
+        print(
+            f"スループット: {n_done / wall_time:.2f}枚/秒（総所要時間 {wall_time:.2f}秒）"
+        )
+        # 以下はバッチの所要時間 / 枚数（1 枚あたりの平均、並行バッチの待ち時間を含む）
+        print(f"1枚あたりの平均処理時間: {np.average(tmp):.4f}秒")
+        print(f"1枚あたりの最大処理時間: {np.max(tmp):.4f}秒")
+        print(f"1枚あたりの最小処理時間: {np.min(tmp):.4f}秒")
+        print(f"1枚あたりの処理時間の標準偏差: {np.std(tmp):.4f}秒")
         print(f"詳細: {np.round(tmp, 4).tolist()}")
 
     if len(ng_list) > 0:
@@ -0,0 +1,73 @@
+"""EncodedImageCache（エンコード済み画像の LRU キャッシュ）のテスト
+
+実行方法:
+    python -m pytest tests/test_encoded_image_cache.py
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.api.services.encoded_image_cache import EncodedImageCache  # noqa: E402
+
+
+def _image(value: int) -> np.ndarray:
+    return np.full((16, 16, 3), value, dtype=np.uint8)
+
+
+def test_encode_roundtrip_and_reuse() -> None:
+    cache = EncodedImageCache()
+    image = _image(128)
+    data = cache.encode("model", "ovr_1", image)
+
+    assert data.readonly
+    decoded = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    np.testing.assert_array_equal(decoded, image)
+    # 2回目はエンコードせずに同じオブジェクトを返す
+    assert cache.encode("model", "ovr_1", image) is data
+
+
+def test_keys_distinguish_format_and_params() -> None:
+    cache = EncodedImageCache()
+    image = _image(10)
+    png = cache.encode("model", "id", image)
+    jpeg = cache.encode("model", "id", image, ".jpg", (cv2.IMWRITE_JPEG_QUALITY, 80))
+    assert png is not jpeg
+    assert cache.get(cache.make_key("model", "id")) is png
+
+
+def test_evicts_least_recently_used_by_bytes() -> None:
+    probe = EncodedImageCache().encode("m", "probe", _image(0))
+    # 2件分だけ入る上限にする
+    cache = EncodedImageCache(max_bytes=probe.nbytes * 2)
+    cache.encode("m", "a", _image(0))
+    cache.encode("m", "b", _image(0))
+    cache.get(cache.make_key("m", "a"))  # a を最近使用にする
+    cache.encode("m", "c", _image(0))
+
+    assert cache.get(cache.make_key("m", "a")) is not None
+    assert cache.get(cache.make_key("m", "b")) is None
+    assert cache.get(cache.make_key("m", "c")) is not None
+
+
+def test_oversized_entry_is_not_cached() -> None:
+    cache = EncodedImageCache(max_bytes=1)
+    cache.encode("m", "a", _image(0))
+    assert cache.get(cache.make_key("m", "a")) is None
+
+
+def test_drop_model_and_clear() -> None:
+    cache = EncodedImageCache()
+    cache.encode("m1", "a", _image(0))
+    cache.encode("m2", "a", _image(0))
+
+    cache.drop_model("m1")
+    assert cache.get(cache.make_key("m1", "a")) is None
+    assert cache.get(cache.make_key("m2", "a")) is not None
+
+    cache.clear()
+    assert cache.get(cache.make_key("m2", "a")) is None
@@ -0,0 +1,44 @@
+"""EnvLoader._parse（.env の簡易パーサ）と python-dotenv の結果が一致するかのテスト
+
+実行方法:
+    python -m pytest tests/test_env_parse.py
+"""
+
+import io
+import os
+import sys
+
+import pytest
+from dotenv import dotenv_values
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config.env_loader import EnvLoader  # noqa: E402
+
+CASES = {
+    "simple": "APP_NAME=PatchCore\nAPI_PORT=8000\n",
+    "comments_and_blank_lines": "# comment\n\nA=1\n   # indented comment\nB=2\n",
+    "inline_comment": "A=1 # comment\nB=value\t# tab comment\nC=a#b\n",
+    "empty_value": "KEY=\nOTHER=x\n",
+    "spaces_around_equals": "A = 1\n  B=  2  \n",
+    "crlf": "A=1\r\nB=2 # c\r\nC=\r\n",
+    "export": "export A=1\nB=2\n",
+    "single_quoted": "A='x y # not a comment'\nB=2\n",
+    "double_quoted": 'A="a#b"\nB="line\\nbreak"\n',
+    "variable_expansion": "A=1\nB=${A}\n",
+    "key_without_value": "A=1\nFLAG\n",
+    "dotted_key": "a.b=1\n",
+    "list_values": "ALLOWED_ORIGINS=http://localhost:3000,http://localhost:8000\n",
+}
+
+
+@pytest.mark.parametrize("text", CASES.values(), ids=list(CASES))
+def test_parse_matches_dotenv(text: str) -> None:
+    expected = dict(dotenv_values(stream=io.StringIO(text)))
+    assert EnvLoader._parse(".env", text) == expected
+
+
+def test_parse_reads_file(tmp_path) -> None:
+    env_file = tmp_path / ".env"
+    env_file.write_bytes(b"A=1 # c\r\nB=\r\n")
+    assert EnvLoader._parse(str(env_file)) == {"A": "1", "B": ""}
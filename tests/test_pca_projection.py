@@ -0,0 +1,35 @@
+"""PcaProjection.transform と sklearn の PCA.transform の結果が一致するかのテスト
+
+実行方法:
+    python -m pytest tests/test_pca_projection.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+decomposition = pytest.importorskip("sklearn.decomposition")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ml_engines.PatchCore.utils.model_loader import PcaProjection  # noqa: E402
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.float16])
+def test_transform_matches_sklearn(dtype: type) -> None:
+    rng = np.random.default_rng(0)
+    train = rng.normal(size=(500, 64)).astype(np.float32)
+    pca = decomposition.PCA(n_components=0.9).fit(train)
+    projection = PcaProjection.from_pca(pca)
+
+    patches = rng.normal(size=(200, 64)).astype(dtype)
+    projected = projection.transform(patches)
+
+    assert projected.dtype == np.float32
+    assert projection.n_components_ == pca.n_components_
+    np.testing.assert_allclose(
+        projected, pca.transform(patches.astype(np.float32)), rtol=1e-4, atol=1e-4
+    )